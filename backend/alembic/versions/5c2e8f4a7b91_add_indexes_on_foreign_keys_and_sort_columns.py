@@ -0,0 +1,51 @@
+"""Add indexes on foreign keys and sort columns
+
+Revision ID: 5c2e8f4a7b91
+Revises: 293110691a06
+Create Date: 2026-10-18 19:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2e8f4a7b91"
+down_revision: Union[str, None] = "293110691a06"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "tickets": {
+        "ix_tickets_project_id_status_id": ["project_id", "status_id"],
+        "ix_tickets_creator_id": ["creator_id"],
+        "ix_tickets_status_id": ["status_id"],
+        "ix_tickets_category_id": ["category_id"],
+        "ix_tickets_level_id": ["level_id"],
+        "ix_tickets_creation_date_id": ["creation_date", "id"],
+    },
+    "comments": {
+        "ix_comments_ticket_id_creation_date": ["ticket_id", "creation_date"],
+        "ix_comments_creator_id": ["creator_id"],
+        "ix_comments_creation_date_id": ["creation_date", "id"],
+    },
+    "projects": {
+        "ix_projects_creator_id": ["creator_id"],
+        "ix_projects_creation_date_id": ["creation_date", "id"],
+    },
+}
+
+
+def upgrade() -> None:
+    # Databases created by metadata.create_all() already have them.
+    for table, indexes in INDEXES.items():
+        for name, columns in indexes.items():
+            op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for table, indexes in INDEXES.items():
+        for name in indexes:
+            op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,53 @@
+"""Add the full-text search index of tickets and comments
+
+Revision ID: 8d1f3b6c2e40
+Revises: 5c2e8f4a7b91
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d1f3b6c2e40"
+down_revision: Union[str, None] = "5c2e8f4a7b91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same statements as src.search, frozen at this revision.
+CREATE = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+        "title, body, tokenize = 'porter unicode61 remove_diacritics 2')",
+    ],
+    "postgresql": [
+        "CREATE TABLE IF NOT EXISTS search_index ("
+        "rowid BIGINT PRIMARY KEY, title TEXT, body TEXT NOT NULL, "
+        "document TSVECTOR GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', body), 'B')) STORED)",
+        "CREATE INDEX IF NOT EXISTS ix_search_index_document "
+        "ON search_index USING gin (document)",
+    ],
+}
+
+# Documents are keyed by id * 2 + kind: 0 for tickets, 1 for comments.
+BACKFILL = [
+    "DELETE FROM search_index",
+    "INSERT INTO search_index (rowid, title, body) "
+    "SELECT id * 2, title, description FROM tickets",
+    "INSERT INTO search_index (rowid, title, body) "
+    "SELECT id * 2 + 1, NULL, content FROM comments",
+]
+
+
+def upgrade() -> None:
+    for statement in CREATE[op.get_bind().dialect.name] + BACKFILL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS search_index")
@@ -0,0 +1,47 @@
+"""Cascade the deletes of users and projects to their tickets in the database
+
+Revision ID: a3c9d7e15b28
+Revises: 8d1f3b6c2e40
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+
+from typing import Optional, Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c9d7e15b28"
+down_revision: Union[str, None] = "8d1f3b6c2e40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The comments and projects foreign keys already had ON DELETE CASCADE.
+FOREIGN_KEYS = {"creator_id": "users", "project_id": "projects"}
+# SQLite foreign keys have no name: batch mode names them when reflecting.
+NAMING_CONVENTION = {
+    "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"
+}
+
+
+def replace_foreign_keys(ondelete: Optional[str]) -> None:
+    names = {
+        foreign_key["constrained_columns"][0]: foreign_key["name"]
+        for foreign_key in sa.inspect(op.get_bind()).get_foreign_keys("tickets")
+    }
+    # SQLite cannot alter a constraint: the table is copied into a new one.
+    with op.batch_alter_table("tickets", naming_convention=NAMING_CONVENTION) as batch:
+        for column, table in FOREIGN_KEYS.items():
+            name = names.get(column) or f"fk_tickets_{column}_{table}"
+            batch.drop_constraint(name, type_="foreignkey")
+            batch.create_foreign_key(name, table, [column], ["id"], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    replace_foreign_keys("CASCADE")
+
+
+def downgrade() -> None:
+    replace_foreign_keys(None)
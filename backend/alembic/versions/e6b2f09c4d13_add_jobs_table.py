@@ -0,0 +1,44 @@
+"""Add the jobs table of the background purges
+
+Revision ID: e6b2f09c4d13
+Revises: a3c9d7e15b28
+Create Date: 2026-10-18 23:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e6b2f09c4d13"
+down_revision: Union[str, None] = "a3c9d7e15b28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by metadata.create_all() already have it.
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("kind", sa.String(20), nullable=False),
+        sa.Column("target_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("done", sa.Integer(), nullable=False),
+        sa.Column("error", sa.String(500), nullable=True),
+        sa.Column("owner", sa.String(32), nullable=True),
+        sa.Column("lease_until", sa.DateTime(), nullable=True),
+        sa.Column("creation_date", sa.DateTime(), nullable=False),
+        sa.Column("update_date", sa.DateTime(), nullable=True),
+        if_not_exists=True,
+    )
+    op.create_index("ix_jobs_status", "jobs", ["status"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_status", table_name="jobs", if_exists=True)
+    op.drop_table("jobs", if_exists=True)
@@ -0,0 +1,130 @@
+"""Micro-benchmarks of the hot paths of a request, with pytest-benchmark.
+
+    pytest benchmarks/bench_micro.py --benchmark-autosave
+    pytest benchmarks/bench_micro.py --benchmark-compare \
+        --benchmark-compare-fail=mean:15%
+
+They need pytest-benchmark, in the dev dependencies. The file is not
+named test_*.py, so that the functional test suite does not collect it. The
+ORM objects are transient, built without a database, so the timings cover
+the Python side only: validation, serialization, query building and the
+bookkeeping done per request or per statement.
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+from faker import Faker
+from fastapi_pagination import Page, Params
+from sqlalchemy import select
+
+from src.cache import compute_etag
+from src.metrics import Metrics
+from src.models import Category, Comment, Level, Project, Status, Ticket, User
+from src.routers.filters import TicketFilterParams
+from src.routers.pagination import page_range
+from src.routers.utils import ModelResponse
+from src.schemas import TicketRead
+from src.search import SQLiteSearch
+
+PAGE_SIZE = 50
+
+
+@pytest.fixture(scope="module")
+def tickets() -> list[Ticket]:
+    """A page of tickets with their relationships loaded, as select_read does."""
+    fake = Faker()
+    Faker.seed(0)
+    rng = random.Random(0)
+    lookups = [
+        model(label=label)
+        for model, label in ((Status, "Open"), (Level, "High"), (Category, "Bug"))
+    ]
+    for id, lookup in enumerate(lookups, 1):
+        lookup.id = id
+    status, level, category = lookups
+
+    tickets = []
+    for id in range(1, PAGE_SIZE + 1):
+        user = User(
+            first_name=fake.first_name(),
+            last_name=fake.last_name(),
+            username=fake.user_name(),
+            email=fake.email(),
+            role="user",
+        )
+        user.id = id
+        project = Project(
+            label=fake.catch_phrase(), description=fake.sentence(), creator_id=id
+        )
+        project.id = id
+        project.creation_date = date(2024, 1, 1)
+        ticket = Ticket(
+            title=fake.sentence(nb_words=6),
+            description=fake.paragraph(),
+            creator_id=id,
+            project_id=id,
+            status_id=1,
+            category_id=1,
+            level_id=1,
+        )
+        ticket.id = id
+        ticket.creation_date = date(2024, 1, 1) + timedelta(days=rng.randrange(365))
+        ticket.creator, ticket.project = user, project
+        ticket.status, ticket.level, ticket.category = status, level, category
+        comment = Comment(content=fake.sentence(), creator_id=id, ticket_id=id)
+        comment.id = id
+        comment.creation_date = ticket.creation_date
+        ticket.comments = [comment]
+        tickets.append(ticket)
+    return tickets
+
+
+@pytest.fixture(scope="module")
+def page(tickets: list[Ticket]) -> Page[TicketRead]:
+    items = [TicketRead.model_validate(ticket) for ticket in tickets]
+    return Page[TicketRead].create(items, Params(page=1, size=PAGE_SIZE), total=10_000)
+
+
+def test_validate_tickets(benchmark, tickets: list[Ticket]):
+    items = benchmark(lambda: [TicketRead.model_validate(t) for t in tickets])
+    assert len(items) == PAGE_SIZE
+
+
+def test_render_page(benchmark, page: Page[TicketRead]):
+    body = benchmark(lambda: ModelResponse(page).body)
+    assert body.startswith(b'{"items":')
+
+
+def test_compute_etag(benchmark, page: Page[TicketRead]):
+    payload = page.items[0].model_dump(mode="json")
+    assert benchmark(compute_etag, payload).startswith('"')
+
+
+def test_filter_and_sort(benchmark):
+    filters = TicketFilterParams(
+        project_id=1,
+        status_id=2,
+        created_from=date(2024, 1, 1),
+        sort="-creation_date,title",
+    )
+    query = benchmark(lambda: filters.order_by(filters.filter(select(Ticket))))
+    assert "ORDER BY" in str(query)
+
+
+def test_search_query(benchmark):
+    search = SQLiteSearch()
+    query = benchmark(search.search, "login error on the dashboard", "ticket")
+    assert "search_index" in str(query)
+
+
+def test_page_range(benchmark):
+    assert benchmark(page_range, 500, 1000) == [1, 498, 499, 500, 501, 502, 1000]
+
+
+def test_observe_statement(benchmark):
+    metrics = Metrics()
+    statement = str(select(Ticket).filter(Ticket.id == 1))
+    benchmark(metrics.observe_statement, statement, 0.001)
+    assert len(metrics.statements) == 1
@@ -0,0 +1,87 @@
+"""Ticket insert throughput, one POST /tickets/ per ticket versus POST /tickets/bulk.
+
+    python -m benchmarks.bulk_insert --tickets 1000
+
+The database is a temporary SQLite file.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bulk_insert.db")
+
+import httpx  # noqa: E402
+
+from main import app  # noqa: E402
+from src.backend.config import ENGINE  # noqa: E402
+from src.models import Base  # noqa: E402
+
+
+async def seed(client: httpx.AsyncClient) -> dict:
+    user = await client.post(
+        "/users/",
+        json={
+            "first_name": "John",
+            "last_name": "Doe",
+            "username": "johndoe",
+            "email": "johndoe@example.com",
+            "role": "user",
+            "password": "SecurePass123",
+        },
+    )
+    project = await client.post(
+        "/projects/",
+        json={
+            "label": "Alpha",
+            "description": "Alpha",
+            "creator_id": user.json()["id"],
+        },
+    )
+    status = await client.post("/statuses/", json={"label": "Open"})
+    category = await client.post("/categories/", json={"label": "Bug"})
+    level = await client.post("/levels/", json={"label": "High"})
+    return {
+        "title": "Ticket",
+        "description": "Description",
+        "creator_id": user.json()["id"],
+        "project_id": project.json()["id"],
+        "status_id": status.json()["id"],
+        "category_id": category.json()["id"],
+        "level_id": level.json()["id"],
+    }
+
+
+async def main(tickets: int) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(transport=transport, base_url="http://bench") as client,
+    ):
+        ticket = await seed(client)
+
+        start = time.perf_counter()
+        for _ in range(tickets):
+            await client.post("/tickets/", json=ticket)
+        one_by_one = tickets / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        rep = await client.post("/tickets/bulk", json=[ticket] * tickets)
+        bulk = tickets / (time.perf_counter() - start)
+        assert rep.json()["succeeded"] == tickets
+
+    print(
+        f"{tickets} tickets: POST /tickets/ {one_by_one:.0f}/s, "
+        f"POST /tickets/bulk {bulk:.0f}/s, x{bulk / one_by_one:.0f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=1000)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(ENGINE)
+    asyncio.run(main(args.tickets))
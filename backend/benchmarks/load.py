@@ -0,0 +1,434 @@
+"""Load test of the whole API, reporting throughput and p50/p95/p99 per operation.
+
+    python -m benchmarks.load --workers 2 --concurrency 16 --output load.json
+    python -m benchmarks.load --baseline load.json   # exit 1 on a regression
+    python -m benchmarks.load --url http://staging:8000 --tickets 20000 ...
+
+Without --url, a temporary SQLite database is seeded by benchmarks.seed and
+served by uvicorn with --workers processes. With --url, the server must
+serve a database seeded with the same sizes.
+
+--concurrency virtual users send requests in a loop for --seconds, after a
+--warmup that is not measured. Each request is drawn from a weighted mix
+covering every router, mostly reads, as a ticket tracker sees. The writes
+update seeded rows, or delete the rows the user created itself.
+
+With --baseline, an operation regresses when its p95 grows, or its
+throughput falls, by more than --tolerance against the saved results.
+The client shares the machine with the server: compare runs of the same
+machine only.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import httpx
+
+from benchmarks.seed import PASSWORD, Dataset
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+WORDS = ["network", "policy", "report", "memory", "customer", "security", "deploy"]
+
+
+@dataclass
+class User:
+    """A virtual user: its client, its random generator and what it created."""
+
+    client: httpx.AsyncClient
+    rng: random.Random
+    dataset: Dataset
+    created: dict[str, list[int]] = field(default_factory=dict)
+
+    def pick(self, table: str) -> int:
+        return self.rng.randint(1, getattr(self.dataset, table))
+
+    async def create(self, path: str, data: dict) -> httpx.Response:
+        rep = await self.client.post(path, json=data)
+        if rep.status_code == 201:
+            self.created.setdefault(path, []).append(rep.json()["id"])
+        return rep
+
+    async def delete_created(self, path: str, data: dict) -> httpx.Response:
+        """Delete a row the user created, creating one first if needed."""
+        if not self.created.get(path):
+            rep = await self.create(path, data)
+            if rep.status_code != 201:
+                return rep
+        return await self.client.delete(f"{path}{self.created[path].pop()}")
+
+
+def user_data(user: User) -> dict:
+    n = user.rng.randrange(10**9)
+    return {
+        "first_name": "Load",
+        "last_name": "Test",
+        "username": f"load{n}",
+        "email": f"load{n}@example.com",
+        "role": "user",
+        "password": PASSWORD,
+    }
+
+
+def project_data(user: User) -> dict:
+    return {
+        "label": "Load test",
+        "description": "Created by the load test",
+        "creator_id": user.pick("users"),
+    }
+
+
+def ticket_data(user: User) -> dict:
+    return {
+        "title": "Load test",
+        "description": "Created by the load test",
+        "creator_id": user.pick("users"),
+        "project_id": user.pick("projects"),
+        "status_id": user.pick("statuses"),
+        "category_id": user.pick("categories"),
+        "level_id": user.pick("levels"),
+    }
+
+
+def comment_data(user: User) -> dict:
+    return {
+        "content": "Created by the load test",
+        "creator_id": user.pick("users"),
+        "ticket_id": user.pick("tickets"),
+    }
+
+
+@dataclass
+class Operation:
+    name: str
+    weight: int
+    send: Callable[[User], Awaitable[httpx.Response]]
+    # 404 is expected from the lists and searches that match nothing
+    expected: tuple[int, ...] = (200, 201)
+
+
+def lookup_operations(path: str, table: str) -> list[Operation]:
+    return [
+        Operation(f"GET {path}", 4, lambda u: u.client.get(path)),
+        Operation(
+            f"GET {path}{{id}}", 4, lambda u: u.client.get(f"{path}{u.pick(table)}")
+        ),
+        Operation(
+            f"POST+DELETE {path}",
+            1,
+            lambda u: u.delete_created(path, {"label": f"load{u.rng.random():.9f}"}),
+        ),
+    ]
+
+
+OPERATIONS = [
+    Operation("GET /", 1, lambda u: u.client.get("/")),
+    Operation("GET /metrics", 1, lambda u: u.client.get("/metrics")),
+    *lookup_operations("/statuses/", "statuses"),
+    *lookup_operations("/levels/", "levels"),
+    *lookup_operations("/categories/", "categories"),
+    # Users
+    Operation("GET /users/", 3, lambda u: u.client.get("/users/?size=20")),
+    Operation(
+        "GET /users/{id}", 6, lambda u: u.client.get(f"/users/{u.pick('users')}")
+    ),
+    Operation("GET /users/cursor", 2, lambda u: u.client.get("/users/cursor?size=20")),
+    Operation("POST /users/", 1, lambda u: u.create("/users/", user_data(u))),
+    Operation(
+        "PUT /users/{id}",
+        1,
+        lambda u: u.client.put(
+            f"/users/{u.pick('users')}", json={"first_name": "Updated"}
+        ),
+    ),
+    Operation(
+        "DELETE /users/{id}",
+        1,
+        lambda u: u.delete_created("/users/", user_data(u)),
+    ),
+    # Projects
+    Operation("GET /projects/", 3, lambda u: u.client.get("/projects/?size=20")),
+    Operation(
+        "GET /projects/{id}",
+        4,
+        lambda u: u.client.get(f"/projects/{u.pick('projects')}"),
+    ),
+    Operation(
+        "GET /projects/cursor", 2, lambda u: u.client.get("/projects/cursor?size=20")
+    ),
+    Operation("POST /projects/", 1, lambda u: u.create("/projects/", project_data(u))),
+    Operation(
+        "PUT /projects/{id}",
+        1,
+        lambda u: u.client.put(
+            f"/projects/{u.pick('projects')}", json={"description": "Updated"}
+        ),
+    ),
+    Operation(
+        "DELETE /projects/{id}",
+        1,
+        lambda u: u.delete_created("/projects/", project_data(u)),
+    ),
+    # Tickets
+    Operation("GET /tickets/", 8, lambda u: u.client.get("/tickets/?size=20")),
+    Operation(
+        "GET /tickets/?filters",
+        6,
+        lambda u: u.client.get(
+            f"/tickets/?project_id={u.pick('projects')}"
+            f"&status_id={u.pick('statuses')}&sort=-creation_date&size=20"
+        ),
+        expected=(200, 404),
+    ),
+    Operation(
+        "GET /tickets/{id}", 12, lambda u: u.client.get(f"/tickets/{u.pick('tickets')}")
+    ),
+    Operation(
+        "GET /tickets/{id}?fields",
+        4,
+        lambda u: u.client.get(f"/tickets/{u.pick('tickets')}?fields=id,title,status"),
+    ),
+    Operation(
+        "GET /tickets/cursor", 3, lambda u: u.client.get("/tickets/cursor?size=20")
+    ),
+    Operation("POST /tickets/", 3, lambda u: u.create("/tickets/", ticket_data(u))),
+    Operation(
+        "POST /tickets/bulk",
+        1,
+        lambda u: u.client.post("/tickets/bulk", json=[ticket_data(u)] * 20),
+    ),
+    Operation(
+        "PUT /tickets/{id}",
+        3,
+        lambda u: u.client.put(
+            f"/tickets/{u.pick('tickets')}", json={"status_id": u.pick("statuses")}
+        ),
+    ),
+    Operation(
+        "PATCH /tickets/bulk",
+        1,
+        lambda u: u.client.patch(
+            "/tickets/bulk",
+            json=[
+                {"id": u.pick("tickets"), "level_id": u.pick("levels")}
+                for _ in range(20)
+            ],
+        ),
+    ),
+    Operation(
+        "DELETE /tickets/{id}",
+        1,
+        lambda u: u.delete_created("/tickets/", ticket_data(u)),
+    ),
+    # Comments
+    Operation("GET /comments/", 4, lambda u: u.client.get("/comments/?size=20")),
+    Operation(
+        "GET /comments/{id}",
+        6,
+        lambda u: u.client.get(f"/comments/{u.pick('comments')}"),
+    ),
+    Operation(
+        "GET /comments/cursor", 2, lambda u: u.client.get("/comments/cursor?size=20")
+    ),
+    Operation("POST /comments/", 4, lambda u: u.create("/comments/", comment_data(u))),
+    Operation(
+        "PUT /comments/{id}",
+        2,
+        lambda u: u.client.put(
+            f"/comments/{u.pick('comments')}", json={"content": "Updated"}
+        ),
+    ),
+    Operation(
+        "DELETE /comments/{id}",
+        1,
+        lambda u: u.delete_created("/comments/", comment_data(u)),
+    ),
+    # Search
+    Operation(
+        "GET /search/",
+        4,
+        lambda u: u.client.get("/search/", params={"q": u.rng.choice(WORDS)}),
+        expected=(200, 404),
+    ),
+]
+
+
+@dataclass
+class Result:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, seconds: float) -> dict:
+        latencies = self.latencies or [0.0]
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        return {
+            "requests": len(self.latencies),
+            "errors": self.errors,
+            "throughput": len(self.latencies) / seconds,
+            "p50": quantiles[49],
+            "p95": quantiles[94],
+            "p99": quantiles[98],
+        }
+
+
+async def run(
+    url: str, dataset: Dataset, concurrency: int, seconds: float, warmup: float
+) -> dict:
+    results = {operation.name: Result() for operation in OPERATIONS}
+    weights = [operation.weight for operation in OPERATIONS]
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        start = time.perf_counter()
+        measured_from = start + warmup
+        deadline = measured_from + seconds
+
+        async def virtual_user(seed: int) -> None:
+            user = User(client, random.Random(seed), dataset)
+            while (now := time.perf_counter()) < deadline:
+                operation = user.rng.choices(OPERATIONS, weights)[0]
+                try:
+                    rep = await operation.send(user)
+                    ok = rep.status_code in operation.expected
+                except httpx.HTTPError:
+                    ok = False
+                if now < measured_from:
+                    continue
+                result = results[operation.name]
+                if ok:
+                    result.latencies.append((time.perf_counter() - now) * 1000)
+                else:
+                    result.errors += 1
+
+        await asyncio.gather(*(virtual_user(seed) for seed in range(concurrency)))
+
+    total = Result(
+        [latency for result in results.values() for latency in result.latencies],
+        sum(result.errors for result in results.values()),
+    )
+    return {
+        "operations": {
+            name: result.summary(seconds) for name, result in results.items()
+        },
+        "total": total.summary(seconds),
+    }
+
+
+def report(results: dict) -> None:
+    print(
+        f"{'operation':<28} {'requests':>8} {'errors':>6} {'req/s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    rows = [*results["operations"].items(), ("total", results["total"])]
+    for name, row in rows:
+        print(
+            f"{name:<28} {row['requests']:>8} {row['errors']:>6} "
+            f"{row['throughput']:>8.1f} {row['p50']:>8.1f} {row['p95']:>8.1f} "
+            f"{row['p99']:>8.1f}"
+        )
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Compare `results` with `baseline`, operation by operation."""
+    found = []
+    for name, row in [*results["operations"].items(), ("total", results["total"])]:
+        before = (
+            baseline["operations"].get(name) if name != "total" else baseline["total"]
+        )
+        if not before or not before["requests"]:
+            continue
+        if row["p95"] > before["p95"] * (1 + tolerance):
+            found.append(f"{name}: p95 {before['p95']:.1f} -> {row['p95']:.1f} ms")
+        if row["throughput"] < before["throughput"] * (1 - tolerance):
+            found.append(
+                f"{name}: throughput {before['throughput']:.1f} -> "
+                f"{row['throughput']:.1f} req/s"
+            )
+    return found
+
+
+def serve(workers: int, port: int, dataset: Dataset) -> subprocess.Popen:
+    """Seed a temporary database and serve it with uvicorn."""
+    directory = tempfile.mkdtemp()
+    env = os.environ | {
+        "DATABASE_URL": f"sqlite:///{directory}/load.db",
+        "LOG_DIR": f"{directory}/logs",
+        "LOG_LEVEL": "WARNING",
+        "PYTHONPATH": str(BACKEND_DIR),
+    }
+    subprocess.run(
+        [sys.executable, "-m", "benchmarks.seed"]
+        + [f"--{name}={value}" for name, value in asdict(dataset).items()],
+        env=env,
+        cwd=BACKEND_DIR,
+        check=True,
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", f"--port={port}"]
+        + [f"--workers={workers}", "--log-level=warning", "--no-access-log"],
+        env=env,
+        cwd=BACKEND_DIR,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/")
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("uvicorn did not start")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="A running server, instead of a local uvicorn")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=5)
+    parser.add_argument("--output", type=Path, help="Save the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Results to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    for name, default in asdict(Dataset()).items():
+        parser.add_argument(f"--{name}", type=int, default=default)
+    args = parser.parse_args()
+
+    dataset = Dataset(args.users, args.projects, args.tickets, args.comments)
+    server = None if args.url else serve(args.workers, args.port, dataset)
+    try:
+        results = asyncio.run(
+            run(
+                args.url or f"http://127.0.0.1:{args.port}",
+                dataset,
+                args.concurrency,
+                args.seconds,
+                args.warmup,
+            )
+        )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        found = regressions(
+            results, json.loads(args.baseline.read_text()), args.tolerance
+        )
+        for regression in found:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if found else 0)
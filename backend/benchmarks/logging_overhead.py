@@ -0,0 +1,152 @@
+"""Request throughput of the app with its logs off, synchronous, queued and in JSON.
+
+    python -m benchmarks.logging_overhead --concurrency 8 --seconds 10 [--reads-only]
+
+Each configuration runs in its own process, like a uvicorn worker, on a fresh
+SQLite file and log directory. Its tasks loop over a read mix (a comment, a
+page of tickets) and a write (a new comment), whose commit otherwise hides the
+cost of the logs. stderr is discarded, as a process manager piping it to a
+journal would do.
+
+- ``off``: LOG_LEVEL=CRITICAL, nothing is written;
+- ``sync``: every message, DEBUG included, written by the request itself,
+  as before the sinks were queued;
+- ``queued``: the defaults, INFO and above written by a background thread;
+- ``json``: the same, serialized to JSON.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+MODES = {
+    "off": {"LOG_LEVEL": "CRITICAL"},
+    "sync": {"LOG_LEVEL": "DEBUG", "LOG_ENQUEUE": "0"},
+    "queued": {},
+    "json": {"LOG_JSON": "1"},
+}
+
+
+def run(
+    mode: str, concurrency: int, seconds: float, reads_only: bool
+) -> tuple[list[float], int]:
+    directory = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{directory}/logging.db"
+    os.environ["LOG_DIR"] = f"{directory}/logs"
+    os.environ.update(MODES[mode])
+    sys.stderr = open(os.devnull, "w")
+
+    import httpx
+    from loguru import logger
+
+    from main import app
+    from src.backend.config import ENGINE
+    from src.models import Base
+
+    Base.metadata.create_all(ENGINE)
+
+    async def seed(client: httpx.AsyncClient) -> dict:
+        user = await client.post(
+            "/users/",
+            json={
+                "first_name": "John",
+                "last_name": "Doe",
+                "username": "johndoe",
+                "email": "johndoe@example.com",
+                "role": "user",
+                "password": "SecurePass123",
+            },
+        )
+        project = await client.post(
+            "/projects/",
+            json={"label": "Alpha", "description": "Alpha", "creator_id": 1},
+        )
+        for path in ("statuses", "categories", "levels"):
+            await client.post(f"/{path}/", json={"label": path})
+        ticket = await client.post(
+            "/tickets/",
+            json={
+                "title": "Ticket",
+                "description": "Description",
+                "creator_id": user.json()["id"],
+                "project_id": project.json()["id"],
+                "status_id": 1,
+                "category_id": 1,
+                "level_id": 1,
+            },
+        )
+        comment = {
+            "content": "Comment",
+            "creator_id": user.json()["id"],
+            "ticket_id": ticket.json()["id"],
+        }
+        await client.post("/comments/", json=comment)
+        return comment
+
+    async def main() -> tuple[list[float], int]:
+        latencies: list[float] = []
+        errors = 0
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with (
+            app.router.lifespan_context(app),
+            httpx.AsyncClient(
+                transport=transport, base_url="http://bench", timeout=None
+            ) as client,
+        ):
+            comment = await seed(client)
+            deadline = time.perf_counter() + seconds
+
+            async def worker() -> None:
+                nonlocal errors
+                requests = [
+                    lambda: client.get("/comments/1"),
+                    lambda: client.get("/tickets/?page=1&size=10"),
+                ]
+                if not reads_only:
+                    requests.append(lambda: client.post("/comments/", json=comment))
+                i = 0
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    rep = await requests[i % len(requests)]()
+                    i += 1
+                    if rep.is_success:
+                        latencies.append((time.perf_counter() - start) * 1000)
+                    else:
+                        errors += 1
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return latencies, errors
+
+    try:
+        return asyncio.run(main())
+    finally:
+        # Flush the queued messages and stop the writer threads
+        logger.remove()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--reads-only", action="store_true")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    for mode in MODES:
+        with context.Pool(1) as pool:
+            latencies, errors = pool.apply(
+                run, (mode, args.concurrency, args.seconds, args.reads_only)
+            )
+        p50, p99 = (
+            statistics.quantiles(latencies, n=100, method="inclusive")[i]
+            for i in (49, 98)
+        )
+        print(
+            f"{mode:<7} {len(latencies) / args.seconds:7.0f} requests/s  "
+            f"{errors:4} errors  p50 {p50:6.1f} ms  p99 {p99:6.1f} ms"
+        )
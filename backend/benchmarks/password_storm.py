@@ -0,0 +1,90 @@
+"""Latency of an unrelated endpoint during a storm of signups.
+
+Each signup hashes a password with bcrypt. The script sends `--signups`
+concurrent ``POST /users/`` while timing ``GET /`` in a loop, and reports
+the percentiles of the latter. Run it once with the hashes on the event
+loop and once in the thread pool:
+
+    PASSWORD_HASH_WORKERS=0 python -m benchmarks.password_storm
+    PASSWORD_HASH_WORKERS=4 python -m benchmarks.password_storm
+
+The cost factor is read from BCRYPT_ROUNDS (12 by default here), the
+database is a temporary SQLite file.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("BCRYPT_ROUNDS", "12")
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/password_storm.db"
+)
+
+import httpx  # noqa: E402
+
+from main import app  # noqa: E402
+from src.backend.config import ENGINE  # noqa: E402
+from src.models import Base  # noqa: E402
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event) -> list[float]:
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/")
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.005)
+    return latencies
+
+
+async def signup(client: httpx.AsyncClient, i: int) -> None:
+    await client.post(
+        "/users/",
+        json={
+            "first_name": "John",
+            "last_name": "Doe",
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "role": "user",
+            "password": "SecurePass123",
+        },
+    )
+
+
+async def main(signups: int) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(transport=transport, base_url="http://bench") as client,
+    ):
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe(client, stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(signup(client, i) for i in range(signups)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        latencies = sorted(await prober)
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    print(
+        f"workers={os.getenv('PASSWORD_HASH_WORKERS', 'default')} "
+        f"rounds={os.environ['BCRYPT_ROUNDS']} signups={signups} in {elapsed:.2f}s\n"
+        f"GET / over {len(latencies)} requests: "
+        f"p50={quantiles[49] * 1000:.1f}ms "
+        f"p95={quantiles[94] * 1000:.1f}ms "
+        f"p99={quantiles[98] * 1000:.1f}ms "
+        f"max={latencies[-1] * 1000:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--signups", type=int, default=40)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(ENGINE)
+    asyncio.run(main(args.signups))
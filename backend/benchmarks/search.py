@@ -0,0 +1,84 @@
+"""Latency of GET /search/ on a large corpus of tickets and comments.
+
+    python -m benchmarks.search --documents 1000000
+
+The search index of a temporary SQLite file is filled directly, half tickets
+and half comments, with fake sentences; each query is then sent --requests
+times, printing p50, p95 and p99 latencies.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/search.db")
+
+import httpx  # noqa: E402
+from faker import Faker  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from main import app  # noqa: E402
+from src.backend.config import ENGINE  # noqa: E402
+from src.models import Base  # noqa: E402
+from src.search import SEARCH  # noqa: E402
+
+QUERIES = ["memory", "government policy", "employee management test", "tradit", "zzzz"]
+
+
+def fill(documents: int, batch: int = 50_000) -> None:
+    fake = Faker()
+    Faker.seed(0)
+    sentences = [fake.sentence(nb_words=12) for _ in range(10_000)]
+    titles = [fake.sentence(nb_words=4) for _ in range(10_000)]
+    with ENGINE.begin() as conn:
+        for start in range(0, documents, batch):
+            conn.execute(
+                insert(SEARCH.table),
+                [
+                    {
+                        "rowid": key,
+                        "title": titles[key % len(titles)] if key % 2 == 0 else None,
+                        "body": sentences[(key * 7919) % len(sentences)],
+                    }
+                    for key in range(start, min(start + batch, documents))
+                ],
+            )
+
+
+async def main(requests: int) -> None:
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(transport=transport, base_url="http://bench") as client,
+    ):
+        for q in QUERIES:
+            latencies = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                rep = await client.get("/search/", params={"q": q, "size": 20})
+                latencies.append((time.perf_counter() - start) * 1000)
+            p50, p95, p99 = (
+                statistics.quantiles(latencies, n=100, method="inclusive")[i]
+                for i in (49, 94, 98)
+            )
+            total = rep.json().get("total", 0) if rep.status_code == 200 else 0
+            print(
+                f"q={q!r:<17} {total:>8} hits  "
+                f"p50 {p50:6.1f} ms  p95 {p95:6.1f} ms  p99 {p99:6.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=1_000_000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(ENGINE)
+    start = time.perf_counter()
+    fill(args.documents)
+    print(f"Indexed {args.documents} documents in {time.perf_counter() - start:.0f} s")
+    asyncio.run(main(args.requests))
@@ -0,0 +1,143 @@
+"""Fill a database with realistic fake data, for the benchmarks and load tests.
+
+    DATABASE_URL=sqlite:////tmp/load.db python -m benchmarks.seed --tickets 20000
+
+The tables of DATABASE_URL are created if needed; the rows are inserted in
+batches, then the tickets and comments are indexed for the search. Faker is
+seeded, so that two runs with the same sizes produce the same data. The
+rows get consecutive IDs from 1 in an empty database, which the load driver
+(benchmarks.load) relies on to pick existing resources.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+
+from faker import Faker
+from sqlalchemy import insert, select
+
+from src.backend.config import ASYNC_ENGINE, ASYNC_SESSION_LOCAL, ENGINE
+from src.models import Base, Category, Comment, Level, Project, Status, Ticket, User
+from src.passwords import hash_password
+from src.search import SEARCH
+
+LABELS = {
+    Status: ["Open", "In progress", "In review", "Blocked", "Closed"],
+    Level: ["Low", "Medium", "High", "Critical"],
+    Category: ["Bug", "Feature", "Improvement", "Support", "Documentation"],
+}
+PASSWORD = "SecurePass123"
+
+
+@dataclass
+class Dataset:
+    """Number of rows of each table."""
+
+    users: int = 200
+    projects: int = 50
+    tickets: int = 20_000
+    comments: int = 60_000
+
+    @property
+    def statuses(self) -> int:
+        return len(LABELS[Status])
+
+    @property
+    def levels(self) -> int:
+        return len(LABELS[Level])
+
+    @property
+    def categories(self) -> int:
+        return len(LABELS[Category])
+
+
+def _rows(dataset: Dataset, fake: Faker, rng: random.Random) -> dict[type, list]:
+    today = date.today()
+
+    def created() -> date:
+        return today - timedelta(days=rng.randrange(730))
+
+    # One hash for everyone: bcrypt would dominate the seeding time
+    password = hash_password(PASSWORD)
+    return {
+        **{
+            model: [{"label": label} for label in labels]
+            for model, labels in LABELS.items()
+        },
+        User: [
+            {
+                "first_name": fake.first_name(),
+                "last_name": fake.last_name(),
+                "username": f"{fake.user_name()}{i}",
+                "email": f"{i}.{fake.email()}",
+                "role": rng.choice(["user", "user", "user", "admin"]),
+                "password": password,
+            }
+            for i in range(dataset.users)
+        ],
+        Project: [
+            {
+                "label": fake.catch_phrase()[:100],
+                "description": fake.paragraph(nb_sentences=3)[:500],
+                "creator_id": rng.randint(1, dataset.users),
+                "creation_date": created(),
+            }
+            for _ in range(dataset.projects)
+        ],
+        Ticket: [
+            {
+                "title": fake.sentence(nb_words=6)[:100],
+                "description": fake.paragraph(nb_sentences=4)[:500],
+                "creator_id": rng.randint(1, dataset.users),
+                "project_id": rng.randint(1, dataset.projects),
+                "status_id": rng.randint(1, dataset.statuses),
+                "category_id": rng.randint(1, dataset.categories),
+                "level_id": rng.randint(1, dataset.levels),
+                "creation_date": created(),
+            }
+            for _ in range(dataset.tickets)
+        ],
+        Comment: [
+            {
+                "content": fake.paragraph(nb_sentences=2)[:500],
+                "creator_id": rng.randint(1, dataset.users),
+                "ticket_id": rng.randint(1, dataset.tickets),
+                "creation_date": created(),
+            }
+            for _ in range(dataset.comments)
+        ],
+    }
+
+
+async def seed(dataset: Dataset, seed: int = 0, batch: int = 5000) -> None:
+    """Create the tables and insert `dataset`, generated from `seed`."""
+    Base.metadata.create_all(ENGINE)
+    fake = Faker()
+    Faker.seed(seed)
+    rows = _rows(dataset, fake, random.Random(seed))
+
+    async with ASYNC_SESSION_LOCAL() as db:
+        for model, values in rows.items():
+            for start in range(0, len(values), batch):
+                await db.execute(insert(model.__table__), values[start : start + batch])
+        await SEARCH.index(db, Ticket, select(Ticket.id))
+        await SEARCH.index(db, Comment, select(Comment.id))
+        await db.commit()
+    # The pooled aiosqlite connections would keep the process alive
+    await ASYNC_ENGINE.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    for name, default in asdict(Dataset()).items():
+        parser.add_argument(f"--{name}", type=int, default=default)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    dataset = Dataset(args.users, args.projects, args.tickets, args.comments)
+    start = time.perf_counter()
+    asyncio.run(seed(dataset, args.seed))
+    print(f"Seeded {dataset} in {time.perf_counter() - start:.1f} s")
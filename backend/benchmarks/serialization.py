@@ -0,0 +1,131 @@
+"""Time to serialize a response of 10k TicketRead, by FastAPI and by ModelResponse.
+
+    python -m benchmarks.serialization --tickets 10000 --repeat 20
+
+The tickets are validated once, like the handlers do from the ORM objects,
+then returned by routes of a bare app:
+
+- ``default``: the models, validated and dumped again by FastAPI against the
+  response model, then encoded by ``json.dumps`` (JSONResponse);
+- ``orjson``: the same, encoded by orjson (ORJSONResponse), if installed;
+- ``model``: the models wrapped in a ModelResponse, serialized once by
+  pydantic-core.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date
+
+import httpx
+from faker import Faker
+from fastapi import FastAPI
+
+from src.routers.utils import ModelResponse
+from src.schemas import TicketRead
+
+CLASSES = ("/default", "/orjson", "/model")
+
+
+def fake_tickets(count: int) -> list[TicketRead]:
+    fake = Faker()
+    Faker.seed(0)
+    users = [
+        {
+            "id": i,
+            "first_name": fake.first_name(),
+            "last_name": fake.last_name(),
+            "username": fake.user_name(),
+            "email": fake.email(),
+            "role": "user",
+        }
+        for i in range(1, 51)
+    ]
+    projects = [
+        {
+            "id": i,
+            "label": fake.sentence(nb_words=2),
+            "description": fake.sentence(),
+            "creation_date": date(2024, 1, 1),
+        }
+        for i in range(1, 11)
+    ]
+    lookup = {"id": 1, "label": "Open"}
+    return [
+        TicketRead.model_validate(
+            {
+                "id": i,
+                "title": fake.sentence(nb_words=4),
+                "description": fake.paragraph(),
+                "creation_date": fake.date_this_decade(),
+                "status": lookup,
+                "level": lookup,
+                "category": lookup,
+                "creator": users[i % len(users)],
+                "project": projects[i % len(projects)],
+                "comments": [],
+            }
+        )
+        for i in range(count)
+    ]
+
+
+def make_app(tickets: list[TicketRead]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default", response_model=list[TicketRead])
+    async def default() -> list[TicketRead]:
+        return tickets
+
+    @app.get("/model", response_model=list[TicketRead])
+    async def model() -> ModelResponse:
+        return ModelResponse(tickets)
+
+    try:
+        from fastapi.responses import ORJSONResponse
+
+        import orjson  # noqa: F401
+    except ImportError:
+        pass
+    else:
+
+        @app.get(
+            "/orjson", response_model=list[TicketRead], response_class=ORJSONResponse
+        )
+        async def orjson_() -> list[TicketRead]:
+            return tickets
+
+    return app
+
+
+async def main(tickets: int, repeat: int) -> None:
+    app = make_app(fake_tickets(tickets))
+    paths = [route.path for route in app.routes if route.path in CLASSES]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        bodies = {}
+        for path in paths:
+            durations = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                rep = await client.get(path)
+                durations.append((time.perf_counter() - start) * 1000)
+            bodies[path] = rep.json()
+            print(
+                f"{path.strip('/'):<8} median {statistics.median(durations):7.1f} ms  "
+                f"min {min(durations):7.1f} ms  {len(rep.content) / 1e6:5.1f} MB"
+            )
+        # Every class must send the same document
+        assert all(body == bodies["/default"] for body in bodies.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.tickets, args.repeat))
@@ -0,0 +1,107 @@
+"""Latency of PUT /tickets/{id}: load then flush, against UPDATE ... RETURNING.
+
+    python -m benchmarks.update --tickets 20000 --requests 500
+
+A temporary SQLite database is seeded by benchmarks.seed, then random
+tickets get a new status through the app, in process:
+
+- ``select``: the former handler, mounted on a route of its own: a SELECT of
+  the ticket and its relationships, the attribute assignments and their
+  flush, then the same SELECT for the response;
+- ``returning``: the handler, whose single UPDATE ... RETURNING tells whether
+  the ticket exists and returns it, then a select IN per relationship;
+- ``rowcount``: the same, on an engine without UPDATE ... RETURNING: the
+  UPDATE, then a SELECT by primary key joining the relationships.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+PATHS = {"select": "/legacy/tickets", "returning": "/tickets", "rowcount": "/tickets"}
+
+
+async def main(tickets: int, requests: int) -> None:
+    import httpx
+    from fastapi import Request
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from benchmarks.seed import Dataset, seed
+    from main import app
+    from src.backend.config import ASYNC_ENGINE
+    from src.models import Ticket
+    from src.routers.utils import ModelResponse, select_read, validate
+    from src.schemas import TicketRead, TicketUpdate
+
+    @app.put("/legacy/tickets/{id}")
+    async def legacy(request: Request, id: int, data: TicketUpdate) -> ModelResponse:
+        db: AsyncSession = request.state.db
+        ticket = await db.scalar(
+            select_read(Ticket, TicketRead).filter(Ticket.id == id)
+        )
+        for key, value in data.model_dump(exclude_unset=True).items():
+            setattr(ticket, key, value)
+        await db.commit()
+        ticket = await db.scalar(
+            select_read(Ticket, TicketRead)
+            .filter(Ticket.id == id)
+            .execution_options(populate_existing=True)
+        )
+        return ModelResponse(await validate(db, TicketRead, ticket))
+
+    dataset = Dataset(users=50, projects=20, tickets=tickets, comments=tickets * 3)
+    await seed(dataset)
+
+    statements = 0
+
+    def count(*args) -> None:
+        nonlocal statements
+        statements += 1
+
+    event.listen(ASYNC_ENGINE.sync_engine, "before_cursor_execute", count)
+    rng = random.Random(0)
+    transport = httpx.ASGITransport(app=app)
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(transport=transport, base_url="http://bench") as client,
+    ):
+        for mode, path in PATHS.items():
+            ASYNC_ENGINE.dialect.update_returning = mode != "rowcount"
+            latencies = []
+            statements = 0
+            for _ in range(requests):
+                id = rng.randint(1, dataset.tickets)
+                start = time.perf_counter()
+                rep = await client.put(
+                    f"{path}/{id}",
+                    json={"status_id": rng.randint(1, dataset.statuses)},
+                )
+                latencies.append((time.perf_counter() - start) * 1000)
+                rep.raise_for_status()
+            p50, p95 = (
+                statistics.quantiles(latencies, n=100, method="inclusive")[i]
+                for i in (49, 94)
+            )
+            print(
+                f"{mode:<9}  p50 {p50:6.2f} ms  p95 {p95:6.2f} ms  "
+                f"{statements / requests:4.1f} statements/request"
+            )
+    await ASYNC_ENGINE.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{directory}/update.db"
+    os.environ["LOG_DIR"] = f"{directory}/logs"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    asyncio.run(main(args.tickets, args.requests))
@@ -0,0 +1,169 @@
+"""Write throughput of several workers sharing one SQLite file, with and without
+the connection PRAGMAs of src.backend.config.
+
+    python -m benchmarks.write_concurrency --workers 4 --concurrency 8 --seconds 10
+
+Each worker is a process running the app, like a uvicorn worker, whose tasks
+POST comments in a loop. The baseline leaves every SQLite default: rollback
+journal, synchronous=FULL, no mmap and the 5 s lock timeout of sqlite3.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+BASELINE = {
+    "SQLITE_JOURNAL_MODE": "",
+    "SQLITE_SYNCHRONOUS": "",
+    "SQLITE_BUSY_TIMEOUT": "",
+    "SQLITE_MMAP_SIZE": "",
+}
+
+
+def configure(url: str, baseline: bool) -> None:
+    """Set the environment read by src.backend.config, before importing it."""
+    os.environ["DATABASE_URL"] = url
+    for name, value in BASELINE.items():
+        if baseline:
+            os.environ[name] = value
+        else:
+            os.environ.pop(name, None)
+
+
+def seed(url: str, baseline: bool) -> dict:
+    configure(url, baseline)
+    import httpx
+
+    from main import app
+    from src.backend.config import ENGINE
+    from src.models import Base
+
+    Base.metadata.create_all(ENGINE)
+
+    async def post_all() -> dict:
+        transport = httpx.ASGITransport(app=app)
+        async with (
+            app.router.lifespan_context(app),
+            httpx.AsyncClient(transport=transport, base_url="http://bench") as client,
+        ):
+            user = (
+                await client.post(
+                    "/users/",
+                    json={
+                        "first_name": "John",
+                        "last_name": "Doe",
+                        "username": "johndoe",
+                        "email": "johndoe@example.com",
+                        "role": "user",
+                        "password": "SecurePass123",
+                    },
+                )
+            ).json()
+            project = await client.post(
+                "/projects/",
+                json={
+                    "label": "Alpha",
+                    "description": "Alpha",
+                    "creator_id": user["id"],
+                },
+            )
+            ids = {}
+            for path in ("statuses", "categories", "levels"):
+                rep = await client.post(f"/{path}/", json={"label": path})
+                ids[path] = rep.json()["id"]
+            ticket = await client.post(
+                "/tickets/",
+                json={
+                    "title": "Ticket",
+                    "description": "Description",
+                    "creator_id": user["id"],
+                    "project_id": project.json()["id"],
+                    "status_id": ids["statuses"],
+                    "category_id": ids["categories"],
+                    "level_id": ids["levels"],
+                },
+            )
+            return {
+                "content": "Comment",
+                "creator_id": user["id"],
+                "ticket_id": ticket.json()["id"],
+            }
+
+    return asyncio.run(post_all())
+
+
+def work(
+    url: str, baseline: bool, comment: dict, concurrency: int, seconds: float
+) -> tuple[list[float], int]:
+    configure(url, baseline)
+    import httpx
+
+    from main import app
+
+    async def run() -> tuple[list[float], int]:
+        latencies: list[float] = []
+        errors = 0
+        deadline = time.perf_counter() + seconds
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with (
+            app.router.lifespan_context(app),
+            httpx.AsyncClient(
+                transport=transport, base_url="http://bench", timeout=None
+            ) as client,
+        ):
+
+            async def writer() -> None:
+                nonlocal errors
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    rep = await client.post("/comments/", json=comment)
+                    if rep.status_code == 201:
+                        latencies.append((time.perf_counter() - start) * 1000)
+                    else:
+                        errors += 1
+
+            await asyncio.gather(*(writer() for _ in range(concurrency)))
+        return latencies, errors
+
+    return asyncio.run(run())
+
+
+def measure(args: argparse.Namespace, baseline: bool) -> None:
+    url = f"sqlite:///{tempfile.mkdtemp()}/write_concurrency.db"
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(args.workers) as pool:
+        comment = pool.apply(seed, (url, baseline))
+        results = pool.starmap(
+            work,
+            [(url, baseline, comment, args.concurrency, args.seconds)] * args.workers,
+        )
+
+    latencies = [latency for worker, _ in results for latency in worker]
+    errors = sum(errors for _, errors in results)
+    p50, p99 = (
+        statistics.quantiles(latencies, n=100, method="inclusive")[i] for i in (49, 98)
+    )
+    print(
+        f"{'baseline' if baseline else 'tuned':<8} "
+        f"{len(latencies) / args.seconds:7.0f} writes/s  {errors:5} errors  "
+        f"p50 {p50:7.1f} ms  p99 {p99:7.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    print(
+        f"{args.workers} workers x {args.concurrency} concurrent writers, "
+        f"{args.seconds:.0f} s"
+    )
+    measure(args, baseline=True)
+    measure(args, baseline=False)
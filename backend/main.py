@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi_pagination import add_pagination, set_page, set_params
 from fastapi_pagination.default import Params
@@ -9,16 +11,22 @@ from sqlalchemy.orm.exc import StaleDataError
 
 from src.routers import (
     home,
+    job,
     register,
     category,
     comment,
     project,
+    search,
     status,
     ticket,
     user,
     level,
+    metrics,
 )
-from src.middlewares import DBSessionMiddleware
+from src.backend.config import ASYNC_ENGINE, ASYNC_REPLICA_ENGINE
+from src.jobs import JOBS
+from src.middlewares import DBSessionMiddleware, MetricsMiddleware
+from src.routers.utils import ModelResponse
 from src.exceptions import NotFoundException
 from src.handlers import (
     integrity_error_handler,
@@ -32,14 +40,28 @@ from src.handlers import (
 
 # mypy: disable-error-code=arg-type
 
-app = FastAPI(title="TiK")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await JOBS.resume()
+    yield
+    # Interrupted jobs are resumed by the next start
+    await JOBS.stop()
+    # The pooled aiosqlite connections each hold a thread, which would
+    # otherwise keep the process alive.
+    await ASYNC_ENGINE.dispose()
+    if ASYNC_REPLICA_ENGINE is not None:
+        await ASYNC_REPLICA_ENGINE.dispose()
+
+
+app = FastAPI(title="TiK", lifespan=lifespan, default_response_class=ModelResponse)
 
 set_page(Page)
 set_params(Params(page=1, size=50))
-add_pagination(app)
 
 # Middleware
 app.add_middleware(DBSessionMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 # Gestion des erreurs
 app.add_exception_handler(IntegrityError, integrity_error_handler)
@@ -52,14 +74,19 @@ app.add_exception_handler(NotFoundException, not_found_exception_handler)
 # Inclusion des routes
 app.include_router(register.router)
 app.include_router(home.router)
+app.include_router(job.router)
 app.include_router(category.router)
 app.include_router(comment.router)
 app.include_router(level.router)
+app.include_router(metrics.router)
 app.include_router(status.router)
 app.include_router(project.router)
+app.include_router(search.router)
 app.include_router(ticket.router)
 app.include_router(user.router)
 
+add_pagination(app)
+
 
 # def main():
 
@@ -4,11 +4,65 @@ Attributes:
     BASE_DIR (Path): The base directory of the project, resolved to the third parent directory of this file.
     DEBUG (bool): Flag to enable or disable debug mode.
     TEST (bool): Flag to indicate if the application is in test mode.
-    SQLALCHEMY_DATABASE_URL (str): The database URL for SQLAlchemy, using SQLite. Points to 'tests/test.db' if TEST is True, otherwise 'database.db'.
-    ENGINE (Engine): The SQLAlchemy engine created with the database URL.
-    SESSION_LOCAL (sessionmaker): The SQLAlchemy session factory.
-    LOG_DIR (Path): The directory where log files will be stored.
-    LOG_APP (Logger): Logger for application logs with INFO level.
+    SQLALCHEMY_DATABASE_URL (str): The database URL for SQLAlchemy, read from the DATABASE_URL environment variable.
+                                   Defaults to SQLite, pointing to 'tests/test.db' if TEST is True, otherwise 'database.db'.
+    ASYNC_SQLALCHEMY_DATABASE_URL (str): The same database URL using the asyncio driver of its dialect
+                                         (aiosqlite for SQLite, asyncpg for PostgreSQL).
+    REPLICA_DATABASE_URL (str | None): URL of a read replica of the database, read from REPLICA_DATABASE_URL.
+                                       The reads of GET requests are sent to it when it is set.
+    READ_YOUR_WRITES_SECONDS (float): How long the requests of a client that has just written keep
+                                      reading from the primary, read from READ_YOUR_WRITES_SECONDS.
+                                      It should exceed the replication lag.
+    DB_POOL_SIZE (int): Connections kept open by each engine, read from DB_POOL_SIZE.
+    DB_MAX_OVERFLOW (int): Connections opened beyond DB_POOL_SIZE under load, read from DB_MAX_OVERFLOW.
+    DB_POOL_RECYCLE (int): Age in seconds after which a connection is replaced, read from DB_POOL_RECYCLE.
+                           -1 never replaces them.
+    DB_POOL_TIMEOUT (float): Seconds to wait for a free connection, read from DB_POOL_TIMEOUT.
+    SQLITE_PRAGMAS (dict[str, str]): PRAGMAs run on every new SQLite connection, read from
+                                     SQLITE_JOURNAL_MODE (WAL), SQLITE_SYNCHRONOUS (NORMAL),
+                                     SQLITE_BUSY_TIMEOUT (in ms, 5000), SQLITE_MMAP_SIZE
+                                     (in bytes, 256 MiB) and SQLITE_FOREIGN_KEYS (ON). An empty
+                                     value leaves the SQLite default.
+    ENGINE (Engine): The SQLAlchemy engine created with the database URL by create_db_engine.
+                     Used by migrations, scripts and tests.
+    SESSION_LOCAL (sessionmaker): The SQLAlchemy session factory bound to ENGINE.
+    ASYNC_ENGINE (AsyncEngine): The SQLAlchemy asyncio engine used by the API, created by create_db_engine.
+    ASYNC_REPLICA_ENGINE (AsyncEngine | None): The asyncio engine of REPLICA_DATABASE_URL, if set.
+    ASYNC_SESSION_LOCAL (async_sessionmaker): The AsyncSession factory bound to ASYNC_ENGINE, whose sessions
+                                              are RoutingSession.
+    BULK_MAX_ITEMS (int): Maximum number of items of a bulk request, read from BULK_MAX_ITEMS.
+    PURGE_BATCH_SIZE (int): Rows deleted per transaction by the background purges, read from
+                            PURGE_BATCH_SIZE.
+    JOB_LEASE (float): Seconds a worker holds a job without recording its progress, read from
+                       JOB_LEASE. Past it, the job is resumed by another worker.
+    BCRYPT_ROUNDS (int): Cost factor of the password hashes, read from BCRYPT_ROUNDS.
+                         Defaults to 12, or to the minimum, 4, if TEST is True.
+    PASSWORD_HASH_WORKERS (int): Number of threads hashing passwords, read from PASSWORD_HASH_WORKERS.
+                                 0 hashes on the event loop.
+    LOOKUP_CACHE_TTL (float): Lifetime in seconds of the cached lookup tables, read from LOOKUP_CACHE_TTL.
+    LOOKUP_CACHE_SIZE (int): Maximum number of lookup tables cached, read from LOOKUP_CACHE_SIZE.
+    RESPONSE_CACHE_URL (str | None): Redis URL of the shared response cache, read from RESPONSE_CACHE_URL.
+                                     The responses are cached in process when it is not set.
+    RESPONSE_CACHE_TTL (int): Lifetime in seconds of a cached response, read from RESPONSE_CACHE_TTL.
+    RESPONSE_CACHE_SIZE (int): Maximum number of responses cached in process, read from RESPONSE_CACHE_SIZE.
+    AUTH_CACHE_SIZE (int): Maximum number of access tokens whose user is cached, read from AUTH_CACHE_SIZE.
+    AUTH_CACHE_TTL (float): Lifetime in seconds of a cached user, read from AUTH_CACHE_TTL. Bounds how long
+                            a worker authenticates a user updated or deleted through another one.
+    PAGINATION_TOTALS (str): How the lists count their total, read from PAGINATION_TOTALS:
+                             "exact" (a COUNT per request), "cached" (a COUNT per query
+                             and PAGINATION_TOTALS_TTL) or "estimated" (from the planner).
+    PAGINATION_TOTALS_TTL (float): Lifetime in seconds of a cached total, read from PAGINATION_TOTALS_TTL.
+    PAGINATION_TOTALS_SIZE (int): Maximum number of totals cached, read from PAGINATION_TOTALS_SIZE.
+    LOG_DIR (Path): The directory where log files will be stored, read from LOG_DIR.
+                    Defaults to the logs directory of the project.
+    LOG_LEVEL (str): Minimum level of the console and of LOG_APP, read from LOG_LEVEL. Defaults to
+                     INFO, which drops the DEBUG messages of the request handlers before they
+                     are formatted.
+    LOG_ENQUEUE (bool): Whether the sinks write from a background thread, read from LOG_ENQUEUE.
+                        The request only puts the message on a queue; the file writes and
+                        rotation checks happen off the event loop.
+    LOG_JSON (bool): Whether the sinks write one JSON object per message, read from LOG_JSON.
+    LOG_APP (GatedLogger): Logger for application logs with LOG_LEVEL level.
                     Handles general application logs, including informational and warning messages.
     LOG_ERROR (Logger): Logger for error logs with ERROR level.
                         Handles error logs, including error and critical messages.
@@ -17,6 +71,10 @@ Attributes:
     LOG_DEBUG (Logger): Logger for debug logs with DEBUG level.
                         Handles debug logs, including detailed debug information.
 Functions:
+    create_db_engine(url: str) -> Engine | AsyncEngine:
+        Creates an engine with the pool settings, and the SQLite PRAGMAs, above.
+    to_async_url(url: str) -> str:
+        Returns the same database URL with the asyncio driver of its dialect.
     create_log(file: str, level: str) -> Logger:
         Creates and configures a logger for a specific file and log level.
     log_exceptions(exc_type, exc_value, tb):
@@ -29,8 +87,15 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 from loguru import logger
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from fastapi.security import OAuth2PasswordBearer
 
 load_dotenv()
@@ -47,14 +112,170 @@ DEBUG = True
 TEST = True
 
 # Database configuration
-SQLALCHEMY_DATABASE_URL = (
-    f"sqlite:///{BASE_DIR}/{'tests/test.db' if TEST else 'database.db'}"
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+SQLALCHEMY_DATABASE_URL = os.getenv(
+    "DATABASE_URL",
+    f"sqlite:///{BASE_DIR}/{'tests/test.db' if TEST else 'database.db'}",
 )
-ENGINE = create_engine(SQLALCHEMY_DATABASE_URL, echo=False)
+
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    async_url = parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    return async_url.render_as_string(hide_password=False)
+
+
+ASYNC_SQLALCHEMY_DATABASE_URL = to_async_url(SQLALCHEMY_DATABASE_URL)
+
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL")
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+
+# WAL lets readers run alongside the writer, and synchronous=NORMAL is safe
+# with it (a power loss may only roll back the last commits). busy_timeout
+# makes a writer wait for the lock instead of failing with "database is
+# locked". SQLite ignores the foreign keys, and their ON DELETE CASCADE,
+# unless they are turned on for each connection.
+SQLITE_PRAGMAS = {
+    name: value
+    for name, value in {
+        "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT", "5000"),
+        "mmap_size": os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+        "foreign_keys": os.getenv("SQLITE_FOREIGN_KEYS", "ON"),
+    }.items()
+    if value
+}
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+    cursor.close()
+
+
+def create_db_engine(url: str):
+    """Create the engine of `url`, an AsyncEngine if its driver is asyncio.
+
+    Engines keep a pool of DB_POOL_SIZE connections, plus DB_MAX_OVERFLOW;
+    server connections are checked before use and replaced after
+    DB_POOL_RECYCLE seconds. SQLite connections get SQLITE_PRAGMAS as they
+    are opened.
+    """
+    parsed = make_url(url)
+    is_sqlite = parsed.get_backend_name() == "sqlite"
+    is_async = parsed.get_dialect().is_async
+    options: dict = {"echo": False}
+    if not is_sqlite or parsed.database not in (None, "", ":memory:"):
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+        )
+    if not is_sqlite:
+        options.update(pool_recycle=DB_POOL_RECYCLE, pool_pre_ping=True)
+    elif is_async and "pool_size" in options:
+        # aiosqlite defaults to no pool: a connection, and a thread, per session.
+        options["poolclass"] = AsyncAdaptedQueuePool
+
+    engine = (create_async_engine if is_async else create_engine)(url, **options)
+    if is_sqlite:
+        sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        event.listen(sync_engine, "connect", set_sqlite_pragmas)
+    return engine
+
+
+ENGINE = create_db_engine(SQLALCHEMY_DATABASE_URL)
 SESSION_LOCAL = sessionmaker(autocommit=False, autoflush=False, bind=ENGINE)
 
+ASYNC_ENGINE = create_db_engine(ASYNC_SQLALCHEMY_DATABASE_URL)
+ASYNC_REPLICA_ENGINE = (
+    create_db_engine(to_async_url(REPLICA_DATABASE_URL))
+    if REPLICA_DATABASE_URL
+    else None
+)
+
+
+class RoutingSession(Session):
+    """Session reading from the replica when its ``info["replica"]`` is set.
+
+    Only SELECT statements outside of a flush go to ASYNC_REPLICA_ENGINE:
+    writes, and the reads of a flush, always go to the primary. Sessions
+    record in ``info["committed"]`` that they have committed, for the
+    read-your-writes stickiness of DBSessionMiddleware.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            ASYNC_REPLICA_ENGINE is not None
+            and self.info.get("replica")
+            and not self._flushing
+            and clause is not None
+            and clause.is_select
+        ):
+            return ASYNC_REPLICA_ENGINE.sync_engine
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+def read_from_primary(db: AsyncSession) -> None:
+    """Send the next reads of `db` to the primary, even for a GET request.
+
+    For the reads that outlive the request in a cache: read from a lagging
+    replica, they would cache again the rows a write has just invalidated,
+    for the whole TTL.
+    """
+    db.info["replica"] = False
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_commit(session: Session) -> None:
+    session.info["committed"] = True
+
+
+ASYNC_SESSION_LOCAL = async_sessionmaker(
+    ASYNC_ENGINE,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", 5000))
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", 1000))
+JOB_LEASE = float(os.getenv("JOB_LEASE", 60))
+
+# Password hashing configuration
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 4 if TEST else 12))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+
+# Cache configuration
+LOOKUP_CACHE_TTL = float(os.getenv("LOOKUP_CACHE_TTL", 300))
+LOOKUP_CACHE_SIZE = int(os.getenv("LOOKUP_CACHE_SIZE", 16))
+RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL")
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 60))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 1024))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", 4096))
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", 30))
+
+# Pagination configuration
+PAGINATION_TOTALS = os.getenv("PAGINATION_TOTALS", "exact")
+PAGINATION_TOTALS_TTL = float(os.getenv("PAGINATION_TOTALS_TTL", 30))
+PAGINATION_TOTALS_SIZE = int(os.getenv("PAGINATION_TOTALS_SIZE", 256))
+
 
 # Log configuration
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_ENQUEUE = os.getenv("LOG_ENQUEUE", "1") == "1"
+LOG_JSON = os.getenv("LOG_JSON", "0") == "1"
+
+
 def create_log(filename, level):
     log_file = LOG_DIR / filename
 
@@ -69,21 +290,57 @@ def create_log(filename, level):
         rotation="500 KB",
         retention="5 days",
         filter=lambda record: name in record["extra"],
+        enqueue=LOG_ENQUEUE,
+        serialize=LOG_JSON,
     )
     return log
 
 
-LOG_DIR = BASE_DIR / "logs"
+class GatedLogger:
+    """Bound logger dropping the messages below `level` before loguru sees them.
+
+    Loguru formats a message as soon as one of its sinks takes the level,
+    and debug.log takes DEBUG: without the gate, the DEBUG lines of the
+    request handlers would be formatted on every request.
+    """
+
+    LEVELS = ("trace", "debug", "info", "success", "warning", "error", "critical")
+
+    def __init__(self, log, level: str) -> None:
+        self._log = log
+        for name in self.LEVELS:
+            if logger.level(name.upper()).no < logger.level(level).no:
+                setattr(self, name, _discard)
+
+    def __getattr__(self, name: str):
+        return getattr(self._log, name)
+
+
+def _discard(*args, **kwargs) -> None:
+    pass
+
+
+# The default sink of loguru writes every message, DEBUG included, to stderr.
+# Only that one is replaced: the sinks added by the importers are left alone.
+try:
+    logger.remove(0)
+except ValueError:
+    pass
+logger.add(sys.stderr, level=LOG_LEVEL, enqueue=LOG_ENQUEUE, serialize=LOG_JSON)
+
+LOG_DIR = Path(os.getenv("LOG_DIR", BASE_DIR / "logs"))
 LOG_DIR.mkdir(exist_ok=True)
-LOG_APP = create_log("app.log", "INFO")
+LOG_APP = GatedLogger(create_log("app.log", LOG_LEVEL), LOG_LEVEL)
 LOG_ERROR = create_log("errors.log", "ERROR")
 LOG_ACCESS = create_log("access.log", "INFO")
 LOG_DEBUG = create_log("debug.log", "DEBUG")
 
 
 def log_exceptions(exc_type, exc_value, tb):
-    logger.exception(
-        "An unhandled exception was raised", exc_info=(exc_type, exc_value, tb)
+    # Passed to opt(), not as exc_info, which would end up in the extra dict
+    # that the queued sinks pickle
+    logger.opt(exception=(exc_type, exc_value, tb)).error(
+        "An unhandled exception was raised"
     )
 
 
@@ -0,0 +1,480 @@
+"""Caches shared by the routers.
+
+Attributes:
+    LOOKUPS (LookupCache): In-process cache of the statuses, levels and
+                           categories tables.
+    RESPONSES (ResponseCache): Cache of the GET responses of tickets, projects
+                               and users, shared by the workers when
+                               RESPONSE_CACHE_URL is set.
+    PRINCIPALS (PrincipalCache): In-process cache of the users authenticated
+                                 by each access token.
+"""
+
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Iterable, TypeVar, cast
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+from redis.asyncio import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapper, object_mapper
+
+from src.backend.config import (
+    AUTH_CACHE_SIZE,
+    AUTH_CACHE_TTL,
+    LOOKUP_CACHE_SIZE,
+    LOOKUP_CACHE_TTL,
+    RESPONSE_CACHE_SIZE,
+    RESPONSE_CACHE_TTL,
+    RESPONSE_CACHE_URL,
+    read_from_primary,
+)
+from src.models import Category, Level, Status
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def compute_etag(payload: Any) -> str:
+    """Return a strong ETag for a JSON-serializable payload."""
+    dumped = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return f'"{hashlib.sha1(dumped.encode()).hexdigest()}"'
+
+
+@dataclass
+class LookupTable:
+    """Detached rows of a lookup table, indexed by primary key."""
+
+    rows: dict[int, object]
+    expires_at: float
+    etag: str = field(init=False)
+    _columns: dict[int, dict[str, Any]] = field(init=False, repr=False)
+    _reads: dict[type, list] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._columns = {
+            id: {
+                attr.key: getattr(row, attr.key)
+                for attr in object_mapper(row).column_attrs
+            }
+            for id, row in self.rows.items()
+        }
+        self.etag = compute_etag(list(self._columns.values()))
+
+    def etag_of(self, id: int) -> str:
+        """Return the ETag of a single row."""
+        return compute_etag(self._columns[id])
+
+    def read(self, schema: type[T]) -> list[T]:
+        """Return the rows validated against `schema`, validating them once."""
+        if schema not in self._reads:
+            self._reads[schema] = [
+                schema.model_validate(row) for row in self.rows.values()
+            ]
+        return self._reads[schema]
+
+
+class _Resolved:
+    """Attribute proxy serving some relationships of an ORM object from memory."""
+
+    __slots__ = ("_item", "_overrides")
+
+    def __init__(self, item: object, overrides: dict[str, object]) -> None:
+        self._item = item
+        self._overrides = overrides
+
+    def __getattr__(self, name: str) -> Any:
+        if name in self._overrides:
+            return self._overrides[name]
+        return getattr(self._item, name)
+
+
+@lru_cache(maxsize=None)
+def _foreign_keys(mapper: Mapper, names: tuple[str, ...]) -> tuple[tuple, ...]:
+    relationships = mapper.relationships
+    return tuple(
+        (
+            name,
+            next(iter(relationships[name].local_columns)).key,
+            relationships[name].mapper.class_,
+        )
+        for name in names
+    )
+
+
+class LookupCache:
+    """TTL/LRU cache of small, rarely written tables.
+
+    Each table is loaded whole and kept as detached rows for `ttl` seconds,
+    at most `maxsize` tables at a time. The routers writing to a table call
+    :meth:`invalidate`, which expires it without dropping the rows: requests
+    already in flight keep resolving from them, the next :meth:`get` reloads.
+
+    Parameters
+    ----------
+    models : Iterable[type]
+        The mapped classes :meth:`warm` loads.
+    ttl : float
+        Lifetime of a loaded table, in seconds.
+    maxsize : int
+        Maximum number of tables kept, the least recently used is evicted.
+    """
+
+    def __init__(self, models: Iterable[type], ttl: float, maxsize: int) -> None:
+        self.models = tuple(models)
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._tables: OrderedDict[type, LookupTable] = OrderedDict()
+
+    async def get(self, db: AsyncSession, model: type[Any]) -> LookupTable:
+        """Return the table of `model`, loading it if absent or expired.
+
+        The table is loaded from the primary, as are the next reads of `db`.
+        """
+        table = self._tables.get(model)
+        if table is None or table.expires_at <= time.monotonic():
+            read_from_primary(db)
+            rows = (await db.scalars(select(model).order_by(model.id))).all()
+            for row in rows:
+                db.expunge(row)
+            table = LookupTable(
+                {row.id: row for row in rows}, time.monotonic() + self.ttl
+            )
+            self._tables[model] = table
+        self._tables.move_to_end(model)
+        while len(self._tables) > self.maxsize:
+            self._tables.popitem(last=False)
+        return table
+
+    async def warm(self, db: AsyncSession) -> None:
+        """Load every table that is absent or expired."""
+        for model in self.models:
+            await self.get(db, model)
+
+    def peek(self, model: type, id: int) -> object | None:
+        """Return the cached row of `model` with this `id`, without any I/O."""
+        table = self._tables.get(model)
+        return None if table is None else table.rows.get(id)
+
+    def resolve(self, item: object, names: tuple[str, ...]) -> object:
+        """Serve the many-to-one relationships `names` of `item` from the cache.
+
+        Relationships already loaded, or whose row is not cached, are left to
+        the ORM; the others are looked up by foreign key. Returns `item`
+        itself, or a proxy to be validated in its place.
+        """
+        state = vars(item)
+        overrides = {}
+        for name, foreign_key, model in _foreign_keys(object_mapper(item), names):
+            if name in state or foreign_key not in state:
+                continue
+            row = self.peek(model, state[foreign_key])
+            if row is not None:
+                overrides[name] = row
+        return _Resolved(item, overrides) if overrides else item
+
+    def invalidate(self, model: type) -> None:
+        """Expire the table of `model`, after a write to it."""
+        if model in self._tables:
+            self._tables[model].expires_at = 0.0
+
+    def clear(self) -> None:
+        """Drop every table."""
+        self._tables.clear()
+
+
+LOOKUPS = LookupCache(
+    (Status, Level, Category), ttl=LOOKUP_CACHE_TTL, maxsize=LOOKUP_CACHE_SIZE
+)
+
+
+class ResponseBackend(ABC):
+    """Storage of the response cache.
+
+    Every entry is stored with tags naming the resources it contains, so that
+    a write to a resource invalidates all the responses embedding it.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """Return the body stored under `key`, if any."""
+
+    @abstractmethod
+    async def set(self, key: str, body: bytes, tags: Iterable[str], ttl: int) -> None:
+        """Store `body` under `key` for `ttl` seconds, tagged with `tags`."""
+
+    @abstractmethod
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        """Delete every entry tagged with one of `tags`."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Delete every entry."""
+
+
+class MemoryBackend(ResponseBackend):
+    """In-process backend, an LRU of at most `maxsize` entries.
+
+    Each worker has its own copy: use :class:`RedisBackend` to share the
+    cache, and its invalidations, between several workers.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, bytes, frozenset[str]]] = (
+            OrderedDict()
+        )
+        self._tags: dict[str, set[str]] = {}
+
+    def _discard(self, key: str) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag, set())
+            keys.discard(key)
+            if not keys:
+                self._tags.pop(tag, None)
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, body: bytes, tags: Iterable[str], ttl: int) -> None:
+        if key in self._entries:
+            self._discard(key)
+        self._entries[key] = (time.monotonic() + ttl, body, frozenset(tags))
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            self._discard(next(iter(self._entries)))
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                self._discard(key)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+
+
+class RedisBackend(ResponseBackend):
+    """Backend speaking the Redis protocol, shared by every worker.
+
+    Bodies are plain keys expiring after their TTL; each tag is a set of the
+    keys it labels, whose TTL is reset by every new entry, so it outlives
+    all of them.
+
+    Parameters
+    ----------
+    client : Redis
+        An asyncio Redis client (or a compatible one, such as fakeredis).
+    prefix : str
+        Prefix of all the keys written, so that :meth:`clear` leaves the rest
+        of the database alone.
+    """
+
+    def __init__(self, client: Redis, prefix: str = "tik:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "tik:") -> "RedisBackend":
+        return cls(Redis.from_url(url), prefix)
+
+    async def get(self, key: str) -> bytes | None:
+        # The client does not decode responses: the body is read back as bytes
+        body = await self.client.get(f"{self.prefix}response:{key}")
+        return cast(bytes | None, body)
+
+    async def set(self, key: str, body: bytes, tags: Iterable[str], ttl: int) -> None:
+        key = f"{self.prefix}response:{key}"
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(key, body, ex=ttl)
+            for tag in tags:
+                pipe.sadd(f"{self.prefix}tag:{tag}", key)
+                pipe.expire(f"{self.prefix}tag:{tag}", ttl)
+            await pipe.execute()
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        tag_keys = [f"{self.prefix}tag:{tag}" for tag in tags]
+        if not tag_keys:
+            return
+        keys = await self.client.sunion(tag_keys)
+        await self.client.delete(*keys, *tag_keys)
+
+    async def clear(self) -> None:
+        keys = [key async for key in self.client.scan_iter(match=f"{self.prefix}*")]
+        if keys:
+            await self.client.delete(*keys)
+
+
+def resource_tags(content: BaseModel) -> set[str]:
+    """Return the tags of the resources serialized in `content`.
+
+    A resource is any nested model with an ``id``; its tag is its kind, taken
+    from the schema name (``TicketReadLight`` gives ``ticket``), and its id.
+    """
+    tags = set()
+    pending = [content]
+    while pending:
+        model = pending.pop()
+        kind = type(model).__name__.removesuffix("Projection")
+        kind = kind.removesuffix("Light").removesuffix("Read").lower()
+        id = getattr(model, "id", None)
+        if id is not None:
+            tags.add(f"{kind}:{id}")
+        for value in vars(model).values():
+            if isinstance(value, BaseModel):
+                pending.append(value)
+            elif isinstance(value, list):
+                pending.extend(item for item in value if isinstance(item, BaseModel))
+    return tags
+
+
+class ResponseCache:
+    """Cache of JSON responses keyed by path and query string.
+
+    Routes look a request up with :meth:`fetch` before touching the database,
+    and hand their result to :meth:`store`. The routes writing a resource
+    call :meth:`invalidate` with its tag, ``"<kind>:<id>"``.
+
+    Parameters
+    ----------
+    backend : ResponseBackend
+        Where the responses are stored.
+    ttl : int
+        Lifetime of a cached response, in seconds.
+    """
+
+    def __init__(self, backend: ResponseBackend, ttl: int) -> None:
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def key(request: Request) -> str:
+        """Return the cache key of a request, its path and sorted query."""
+        query = urlencode(sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}"
+
+    async def fetch(self, request: Request) -> Response | None:
+        """Return the cached response to `request`, if any.
+
+        On a miss, the next reads of the request session go to the primary:
+        the response the route stores must not come from a lagging replica.
+        """
+        body = await self.backend.get(self.key(request))
+        if body is None:
+            read_from_primary(request.state.db)
+            return None
+        return Response(body, media_type="application/json", headers={"X-Cache": "HIT"})
+
+    async def store(self, request: Request, content: BaseModel) -> Response:
+        """Cache `content`, a validated Read schema, and return it as JSON.
+
+        The response bypasses the route's response model: `content` has
+        already been validated, possibly against a projection of it.
+        """
+        body = content.model_dump_json().encode()
+        await self.backend.set(
+            self.key(request), body, resource_tags(content), self.ttl
+        )
+        return Response(
+            body, media_type="application/json", headers={"X-Cache": "MISS"}
+        )
+
+    async def invalidate(self, *tags: str) -> None:
+        """Delete the cached responses embedding one of the resources `tags`."""
+        await self.backend.invalidate(tags)
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+
+RESPONSES = ResponseCache(
+    (
+        RedisBackend.from_url(RESPONSE_CACHE_URL)
+        if RESPONSE_CACHE_URL
+        else MemoryBackend(RESPONSE_CACHE_SIZE)
+    ),
+    ttl=RESPONSE_CACHE_TTL,
+)
+
+
+class PrincipalCache:
+    """LRU of the users authenticated by each access token, for a while.
+
+    An entry lives `ttl` seconds, or less if its token expires first: past
+    the ``exp`` claim, the token is rejected by the JWT decoding anyway. The
+    routers writing to a user call :meth:`invalidate`, which drops the
+    entries of all its tokens.
+
+    Each worker has its own copy, and only sees its own invalidations: a
+    user updated or deleted through another worker is still authenticated
+    here for at most `ttl` seconds.
+
+    Parameters
+    ----------
+    ttl : float
+        Lifetime of an entry, in seconds.
+    maxsize : int
+        Maximum number of tokens kept, the least recently used is evicted.
+    """
+
+    def __init__(self, ttl: float, maxsize: int) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+        self._tokens: dict[int, set[str]] = {}
+
+    def _discard(self, token: str) -> None:
+        _, user_id, _ = self._entries.pop(token)
+        tokens = self._tokens.get(user_id, set())
+        tokens.discard(token)
+        if not tokens:
+            self._tokens.pop(user_id, None)
+
+    def get(self, token: str) -> Any | None:
+        """Return the principal of `token`, if cached and not expired."""
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            self._discard(token)
+            return None
+        self._entries.move_to_end(token)
+        return entry[2]
+
+    def set(self, token: str, user_id: int, principal: Any, expires_at: float) -> None:
+        """Cache `principal`, the user `user_id`, until the epoch `expires_at`."""
+        if token in self._entries:
+            self._discard(token)
+        expires_at = min(expires_at, time.time() + self.ttl)
+        self._entries[token] = (expires_at, user_id, principal)
+        self._tokens.setdefault(user_id, set()).add(token)
+        while len(self._entries) > self.maxsize:
+            self._discard(next(iter(self._entries)))
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop the tokens of the user `user_id`, after a write to it."""
+        for token in list(self._tokens.get(user_id, ())):
+            self._discard(token)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tokens.clear()
+
+
+PRINCIPALS = PrincipalCache(AUTH_CACHE_TTL, AUTH_CACHE_SIZE)
@@ -13,3 +13,18 @@ class CredentialsException(HTTPException):
             detail=detail,
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+class InvalidCursorException(HTTPException):
+    def __init__(self, detail: str = "Invalid pagination cursor"):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+class UnknownFieldException(HTTPException):
+    def __init__(self, detail: str = "Unknown field"):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+class InvalidSearchQueryException(HTTPException):
+    def __init__(self, detail: str = "Invalid search query"):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
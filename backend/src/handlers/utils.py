@@ -28,8 +28,10 @@ async def handle_error(
     Exception
         If DEBUG is True, the original exception is re-raised.
     """
-    request.state.db.rollback()
-    LOG_ERROR.error(f"{error_type} error: {exc}")
+    db = request.scope.get("state", {}).get("db")
+    if db is not None:
+        await db.rollback()
+    LOG_ERROR.error("{} error: {}", error_type, exc)
 
     if DEBUG:
         raise
@@ -0,0 +1,304 @@
+"""Background jobs of the app, persisted in the jobs table.
+
+A DELETE of a project or a user owning many rows would hold the write lock
+of the database for the whole cascade, and outlive the HTTP timeout. With
+``?background=true``, the routes submit a purge job instead: the rows owned
+by the project or user are deleted PURGE_BATCH_SIZE at a time, each batch in
+a short transaction of its own, then the project or user itself.
+
+The jobs are recorded in the database before they start, and their progress
+after every batch. The worker running a job holds a lease on it, renewed
+with each batch and released when the app stops: a job interrupted by a
+restart, or whose worker died, is claimed by :meth:`JobRunner.resume` in
+the first worker to find it unleased, and run there only. Each batch deletes
+the rows still there, so running one again is harmless.
+
+Attributes:
+    JOBS (JobRunner): The job runner of the app.
+    PURGES (dict[str, Purge]): The purge of each job kind.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+from uuid import uuid4
+
+from sqlalchemy import Select, delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.config import (
+    ASYNC_SESSION_LOCAL,
+    JOB_LEASE,
+    LOG_APP,
+    LOG_ERROR,
+    PURGE_BATCH_SIZE,
+)
+from src.cache import PRINCIPALS, RESPONSES
+from src.models import Comment, Job, Project, Ticket, User
+from src.search import SEARCH
+
+
+@dataclass(frozen=True)
+class Purge:
+    """Delete a row after the rows depending on it, a batch at a time.
+
+    Attributes
+    ----------
+    model : type[Any]
+        The model of the row deleted last.
+    steps : Callable[[int], list[tuple[type[Any], Select]]]
+        Given the id of the row, the model and the select of the ids of each
+        group of dependent rows, in the order they are deleted.
+    """
+
+    model: type[Any]
+    steps: Callable[[int], list[tuple[type[Any], Select]]]
+
+    @property
+    def cache_key(self) -> str:
+        return self.model.__name__.lower()
+
+    async def dependent_tags(self, db: AsyncSession, id: int) -> list[str]:
+        """Return the cache tags of the rows depending on the row `id`.
+
+        The synchronous deletes collect them before the database cascades
+        the rows away, to invalidate the responses embedding them after.
+        """
+        tags: list[str] = []
+        for model, ids in self.steps(id):
+            kind = model.__name__.lower()
+            tags.extend(f"{kind}:{row}" for row in await db.scalars(ids))
+        return tags
+
+
+def _project_rows(id: int) -> list[tuple[type[Any], Select]]:
+    tickets = select(Ticket.id).filter(Ticket.project_id == id)
+    return [
+        (Comment, select(Comment.id).filter(Comment.ticket_id.in_(tickets))),
+        (Ticket, tickets),
+    ]
+
+
+def _user_rows(id: int) -> list[tuple[type[Any], Select]]:
+    projects = select(Project.id).filter(Project.creator_id == id)
+    tickets = select(Ticket.id).filter(
+        (Ticket.creator_id == id) | Ticket.project_id.in_(projects)
+    )
+    return [
+        (
+            Comment,
+            select(Comment.id).filter(
+                (Comment.creator_id == id) | Comment.ticket_id.in_(tickets)
+            ),
+        ),
+        (Ticket, tickets),
+        (Project, projects),
+    ]
+
+
+PURGES = {
+    "delete_project": Purge(Project, _project_rows),
+    "delete_user": Purge(User, _user_rows),
+}
+# The models whose rows have documents in the search index
+INDEXED = (Ticket, Comment)
+UNFINISHED = ("pending", "running")
+
+
+class LeaseLost(Exception):
+    """The lease of a job expired, and another worker claimed it."""
+
+
+def _now() -> datetime:
+    # The DateTime columns are naive, in UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class JobRunner:
+    """Run the jobs as tasks of the event loop, one batch at a time.
+
+    Parameters
+    ----------
+    batch_size : int
+        Number of rows deleted per transaction.
+    lease : float
+        Seconds this worker holds a job without recording its progress.
+    """
+
+    def __init__(
+        self, batch_size: int = PURGE_BATCH_SIZE, lease: float = JOB_LEASE
+    ) -> None:
+        self.batch_size = batch_size
+        self.lease = lease
+        # Tells the jobs leased by this worker from those of the others
+        self.owner = uuid4().hex
+        self._tasks: dict[int, asyncio.Task] = {}
+        self._watcher: Optional[asyncio.Task] = None
+
+    async def submit(self, db: AsyncSession, kind: str, target_id: int) -> Job:
+        """Record a job of `kind` on the row `target_id`, commit, and start it."""
+        job = Job(
+            kind=kind,
+            target_id=target_id,
+            owner=self.owner,
+            lease_until=_now() + timedelta(seconds=self.lease),
+        )
+        db.add(job)
+        await db.commit()
+        self.start(job.id)
+        return job
+
+    def start(self, id: int) -> None:
+        """Run the job `id`, which this worker must hold the lease of."""
+        task = asyncio.create_task(self.run(id))
+        # The event loop only keeps weak references to its tasks
+        self._tasks[id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(id, None))
+
+    async def resume(self) -> None:
+        """Start the unfinished jobs no worker holds, then watch for more.
+
+        A job is claimed by a single UPDATE, which only matches it while it
+        has no lease or an expired one: of the workers finding it, only one
+        runs it. The jobs leased by other workers are checked again every
+        `lease` seconds, in case their worker died.
+        """
+        await self._claim()
+        self._watcher = asyncio.create_task(self._watch())
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease)
+            try:
+                await self._claim()
+            except Exception as exc:
+                LOG_ERROR.error("Resuming the jobs failed: {}", exc)
+
+    async def _claim(self) -> None:
+        async with ASYNC_SESSION_LOCAL() as db:
+            ids = await db.scalars(
+                select(Job.id).filter(
+                    Job.status.in_(UNFINISHED), Job.id.not_in(list(self._tasks))
+                )
+            )
+            for id in list(ids):
+                now = _now()
+                result = await db.execute(
+                    update(Job)
+                    .filter(
+                        Job.id == id,
+                        Job.status.in_(UNFINISHED),
+                        or_(Job.lease_until.is_(None), Job.lease_until < now),
+                    )
+                    .values(
+                        owner=self.owner,
+                        lease_until=now + timedelta(seconds=self.lease),
+                    )
+                )
+                await db.commit()
+                if result.rowcount == 1:
+                    LOG_APP.info("Resuming job {}", id)
+                    self.start(id)
+
+    async def wait(self) -> None:
+        """Wait for the jobs started to finish."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def stop(self) -> None:
+        """Cancel the jobs started, and release them to the next worker."""
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+        ids = list(self._tasks)
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        if ids:
+            async with ASYNC_SESSION_LOCAL() as db:
+                await db.execute(
+                    update(Job)
+                    .filter(Job.id.in_(ids), Job.owner == self.owner)
+                    .values(owner=None, lease_until=None)
+                )
+                await db.commit()
+
+    async def run(self, id: int) -> None:
+        """Run the job `id`, recording its progress, or its failure."""
+        try:
+            async with ASYNC_SESSION_LOCAL() as db:
+                job = await db.get_one(Job, id)
+                purge = PURGES[job.kind]
+                target_id = job.target_id
+                steps = purge.steps(target_id)
+                if job.status == "pending":
+                    total = 1
+                    for _, ids in steps:
+                        count = select(func.count()).select_from(ids.subquery())
+                        total += await db.scalar(count) or 0
+                    await self._progress(db, id, 0, total=total, status="running")
+                    await db.commit()
+
+            for model, ids in steps:
+                while await self._delete_batch(id, model, ids):
+                    # Let the requests waiting for the database in
+                    await asyncio.sleep(0)
+
+            async with ASYNC_SESSION_LOCAL() as db:
+                await db.execute(
+                    delete(purge.model).filter(purge.model.id == target_id)
+                )
+                await self._progress(db, id, 1, status="done")
+                await db.commit()
+            await RESPONSES.invalidate(f"{purge.cache_key}:{target_id}")
+            if purge.model is User:
+                PRINCIPALS.invalidate(target_id)
+            LOG_APP.info("Job {} done: {} {} deleted", id, purge.cache_key, target_id)
+        except LeaseLost:
+            LOG_APP.info("Job {} was claimed by another worker", id)
+        except Exception as exc:
+            LOG_ERROR.error("Job {} failed: {}", id, exc)
+            async with ASYNC_SESSION_LOCAL() as db:
+                try:
+                    await self._progress(
+                        db, id, 0, status="failed", error=str(exc)[:500]
+                    )
+                except LeaseLost:
+                    return
+                await db.commit()
+
+    async def _delete_batch(self, id: int, model: type[Any], ids: Select) -> int:
+        async with ASYNC_SESSION_LOCAL() as db:
+            batch = list(await db.scalars(ids.limit(self.batch_size)))
+            if batch:
+                if model in INDEXED:
+                    await SEARCH.remove(db, model, batch)
+                await db.execute(delete(model).filter(model.id.in_(batch)))
+                await self._progress(db, id, len(batch))
+                await db.commit()
+                # The responses embedding the rows, those of the parent included
+                kind = model.__name__.lower()
+                await RESPONSES.invalidate(*(f"{kind}:{row}" for row in batch))
+            return len(batch)
+
+    async def _progress(self, db: AsyncSession, id: int, done: int, **values) -> None:
+        """Record the progress of the job `id`, and renew the lease on it.
+
+        Raises LeaseLost, before the transaction is committed, if another
+        worker claimed the job.
+        """
+        result = await db.execute(
+            update(Job)
+            .filter(Job.id == id, Job.owner == self.owner)
+            .values(
+                done=Job.done + done,
+                lease_until=_now() + timedelta(seconds=self.lease),
+                **values,
+            )
+        )
+        if result.rowcount != 1:
+            raise LeaseLost(id)
+
+
+JOBS = JobRunner()
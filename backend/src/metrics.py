@@ -0,0 +1,223 @@
+"""Request and SQL metrics, exposed in the Prometheus text format.
+
+The metrics are kept in process: with several workers, each one exposes its
+own, as the Prometheus client libraries do without a multiprocess directory.
+
+Attributes:
+    METRICS (Metrics): The metrics of the app, fed by the cursor events of the
+                       engines and by :class:`src.middlewares.MetricsMiddleware`.
+    LATENCY_BUCKETS (tuple[float, ...]): Upper bounds, in seconds, of the
+                                         request latency histogram.
+    QUERY_BUCKETS (tuple[float, ...]): Upper bounds of the histogram of the
+                                       number of queries per request.
+    SLOWEST_STATEMENTS (int): Number of statements exposed, the slowest first.
+"""
+
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterator
+
+from sqlalchemy import Engine, event
+
+from src.backend.config import ASYNC_ENGINE, ASYNC_REPLICA_ENGINE, ENGINE
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SLOWEST_STATEMENTS = 10
+# Distinct statements tracked; beyond, the fastest is forgotten
+MAX_STATEMENTS = 500
+
+
+@dataclass
+class RequestTimings:
+    """Time spent by the current request in the database and in serialization."""
+
+    db: float = 0.0
+    queries: int = 0
+    serialize: float = 0.0
+
+    def header(self, total: float) -> str:
+        """Return the ``Server-Timing`` header value, durations in milliseconds."""
+        return (
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries", '
+            f"serialize;dur={self.serialize * 1000:.1f}, "
+            f"total;dur={total * 1000:.1f}"
+        )
+
+
+TIMINGS: ContextVar[RequestTimings | None] = ContextVar("timings", default=None)
+
+
+@contextmanager
+def measure_serialization() -> Iterator[None]:
+    """Add the time spent in the block to the serialization of the request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = TIMINGS.get()
+        if timings is not None:
+            timings.serialize += time.perf_counter() - start
+
+
+@lru_cache(maxsize=MAX_STATEMENTS)
+def _normalize(statement: str) -> str:
+    return re.sub(r"\s+", " ", statement).strip()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    return ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)
+    )
+
+
+class Histogram:
+    """Cumulative histogram of observations, per combination of label values."""
+
+    def __init__(
+        self, name: str, help: str, labels: tuple[str, ...], buckets: tuple[float, ...]
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, values: tuple, amount: float) -> None:
+        # Counts per bucket, then +Inf (the count) and the sum
+        series = self._series.setdefault(values, [0] * (len(self.buckets) + 1) + [0.0])
+        for i, bound in enumerate(self.buckets):
+            if amount <= bound:
+                series[i] += 1
+        series[-2] += 1
+        series[-1] += amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for values, series in sorted(self._series.items()):
+            labels = _labels(self.labels, values)
+            for bound, count in zip((*self.buckets, "+Inf"), series):
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{self.name}_sum{{{labels}}} {series[-1]}")
+            lines.append(f"{self.name}_count{{{labels}}} {series[-2]}")
+        return lines
+
+    def clear(self) -> None:
+        self._series.clear()
+
+
+@dataclass
+class StatementStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+
+class Metrics:
+    """Latency and query count of the requests per route, and the slowest SQL.
+
+    Parameters
+    ----------
+    slowest : int
+        Number of statements exposed, ordered by their maximum duration.
+    """
+
+    def __init__(self, slowest: int = SLOWEST_STATEMENTS) -> None:
+        self.slowest = slowest
+        self.requests = Histogram(
+            "tik_request_duration_seconds",
+            "Duration of the HTTP requests.",
+            ("method", "route", "status"),
+            LATENCY_BUCKETS,
+        )
+        self.queries = Histogram(
+            "tik_request_queries",
+            "Number of SQL statements run by the HTTP requests.",
+            ("method", "route"),
+            QUERY_BUCKETS,
+        )
+        self.statements: dict[str, StatementStats] = {}
+
+    def instrument(self, engine: Engine) -> None:
+        """Time the statements that `engine` sends to the database."""
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(self, conn, cursor, statement, *args) -> None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, *args) -> None:
+        duration = time.perf_counter() - conn.info["query_start"].pop()
+        self.observe_statement(statement, duration)
+        timings = TIMINGS.get()
+        if timings is not None:
+            timings.db += duration
+            timings.queries += 1
+
+    def _handle_error(self, context) -> None:
+        if context.connection is not None and context.connection.info.get(
+            "query_start"
+        ):
+            context.connection.info["query_start"].pop()
+
+    def observe_statement(self, statement: str, duration: float) -> None:
+        statement = _normalize(statement)
+        stats = self.statements.get(statement)
+        if stats is None:
+            if len(self.statements) >= MAX_STATEMENTS:
+                fastest = min(self.statements, key=lambda s: self.statements[s].max)
+                del self.statements[fastest]
+            stats = self.statements[statement] = StatementStats()
+        stats.count += 1
+        stats.total += duration
+        stats.max = max(stats.max, duration)
+
+    def observe_request(
+        self, method: str, route: str, status: int, duration: float, queries: int
+    ) -> None:
+        self.requests.observe((method, route, status), duration)
+        self.queries.observe((method, route), queries)
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        name = "tik_db_statement_duration_seconds"
+        lines = [
+            *self.requests.render(),
+            *self.queries.render(),
+            f"# HELP {name} Duration of the slowest SQL statements.",
+            f"# TYPE {name} summary",
+        ]
+        slowest = sorted(self.statements.items(), key=lambda item: -item[1].max)
+        for statement, stats in slowest[: self.slowest]:
+            labels = _labels(("statement",), (statement,))
+            lines.append(f"{name}_sum{{{labels}}} {stats.total}")
+            lines.append(f"{name}_count{{{labels}}} {stats.count}")
+        lines.append(
+            f"# HELP {name}_max Maximum duration of the slowest SQL statements."
+        )
+        lines.append(f"# TYPE {name}_max gauge")
+        for statement, stats in slowest[: self.slowest]:
+            labels = _labels(("statement",), (statement,))
+            lines.append(f"{name}_max{{{labels}}} {stats.max}")
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        self.requests.clear()
+        self.queries.clear()
+        self.statements.clear()
+
+
+METRICS = Metrics()
+METRICS.instrument(ENGINE)
+METRICS.instrument(ASYNC_ENGINE.sync_engine)
+if ASYNC_REPLICA_ENGINE is not None:
+    METRICS.instrument(ASYNC_REPLICA_ENGINE.sync_engine)
@@ -1,14 +1,127 @@
-from fastapi import Request
-from src.backend.config import SESSION_LOCAL
-from starlette.middleware.base import BaseHTTPMiddleware
+import time
 
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.backend.config import ASYNC_SESSION_LOCAL, READ_YOUR_WRITES_SECONDS
+from src.metrics import METRICS, TIMINGS, Metrics, RequestTimings
+
+# Set on the responses to a write, so that the client's next reads go to the
+# primary until the replica has caught up.
+PRIMARY_COOKIE = "tik_primary"
+READ_ONLY_METHODS = {"GET", "HEAD"}
+
+
+class LazySessionState(dict):
+    """Request state that opens the database session on first access.
+
+    Starlette's ``request.state`` reads its attributes from ``scope["state"]``,
+    so ``request.state.db`` ends up in ``__missing__`` the first time a
+    handler asks for it. Requests that never touch the database (home page,
+    docs, 404s) never open a session.
+
+    The session reads from the replica if `replica` is set, see
+    :class:`src.backend.config.RoutingSession`.
+    """
+
+    def __init__(self, *args, replica: bool = False, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+
+    def __missing__(self, key: str) -> AsyncSession:
+        if key != "db":
+            raise KeyError(key)
+        db = self["db"] = ASYNC_SESSION_LOCAL(info={"replica": self.replica})
+        return db
+
+
+class DBSessionMiddleware:
+    """Open a session per request, reading from the replica for GET requests.
+
+    A request that commits gets a cookie keeping the client on the primary
+    for READ_YOUR_WRITES_SECONDS, so that it reads its own writes even if
+    the replica lags behind. The reads filling a cache shared by the next
+    requests go to the primary, see :func:`src.backend.config.read_from_primary`.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        replica = (
+            scope["method"] in READ_ONLY_METHODS
+            and PRIMARY_COOKIE not in HTTPConnection(scope).cookies
+        )
+        state = scope["state"] = LazySessionState(
+            scope.get("state", {}), replica=replica
+        )
+
+        async def send_with_cookie(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and "db" in state
+                and state["db"].info.get("committed")
+            ):
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{PRIMARY_COOKIE}=1; Max-Age={READ_YOUR_WRITES_SECONDS:.0f}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            if "db" in state:
+                await state["db"].close()
+
+
+class MetricsMiddleware:
+    """Record the latency and query count of each request, per route.
+
+    The responses get a ``Server-Timing`` header with the time spent in the
+    database, in serialization and in total, up to the start of the response.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: Metrics = METRICS) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = TIMINGS.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append(
+                    "server-timing", timings.header(time.perf_counter() - start)
+                )
+            await send(message)
 
-class DBSessionMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        db = SESSION_LOCAL()
-        request.state.db = db
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_with_timing)
         finally:
-            db.close()
-        return response
+            TIMINGS.reset(token)
+            # The path template, not the path, keeps one series per route
+            route = scope.get("route")
+            self.metrics.observe_request(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status,
+                time.perf_counter() - start,
+                timings.queries,
+            )
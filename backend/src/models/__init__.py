@@ -4,6 +4,7 @@ from ._project import Project
 from ._user import User
 from ._comment import Comment
 from ._category import Category
+from ._job import Job
 from ._level import Level
 from ._status import Status
 from ._ticket import Ticket
@@ -16,6 +17,7 @@ __all__ = [
     "User",
     "Comment",
     "Category",
+    "Job",
     "Level",
     "Status",
 ]
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, Date, ForeignKey, func
+from sqlalchemy import Index, Integer, String, Date, ForeignKey, func
 
 from src.models import Base
 
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_ticket_id_creation_date", "ticket_id", "creation_date"),
+        Index("ix_comments_creator_id", "creator_id"),
+        Index("ix_comments_creation_date_id", "creation_date", "id"),
+    )
+    # The INSERT returns the creation date, instead of a SELECT after it
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True, init=False
@@ -29,5 +36,5 @@ class Comment(Base):
     )
 
     update_date: Mapped[Date | None] = mapped_column(
-        Date, insert_default=None, onupdate=func.current_date(), init=False
+        Date, default=None, onupdate=func.current_date(), init=False
     )
@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models._base import Base
+
+
+class Job(Base):
+    """A background job, kept in the database so that it survives a restart."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_status", "status"),)
+    # The creation date is returned by the INSERT, for the 202 response
+    __mapper_args__ = {"eager_defaults": True}
+
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True, init=False
+    )
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+    target_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    # pending, running, done or failed
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    done: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[Optional[str]] = mapped_column(String(500), default=None)
+    # The worker running the job, until the lease expires unless it renews it
+    owner: Mapped[Optional[str]] = mapped_column(String(32), default=None)
+    lease_until: Mapped[Optional[datetime]] = mapped_column(DateTime, default=None)
+    creation_date: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, insert_default=func.current_timestamp(), init=False
+    )
+    update_date: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, default=None, onupdate=func.current_timestamp(), init=False
+    )
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey, Integer, String, Date, func
+from sqlalchemy import ForeignKey, Index, Integer, String, Date, func
 
 from src.models import Base
 
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_creator_id", "creator_id"),
+        Index("ix_projects_creation_date_id", "creation_date", "id"),
+    )
+    # The INSERT returns the creation date, instead of a SELECT after it
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True, init=False
@@ -23,6 +29,8 @@ class Project(Base):
     tickets: Mapped[list[Ticket]] = relationship(
         back_populates="project",
         cascade="all, delete-orphan",
+        passive_deletes=True,
+        default_factory=list,
         init=False,
     )
 
@@ -30,5 +38,5 @@ class Project(Base):
         Date, nullable=False, insert_default=func.current_date(), init=False
     )
     update_date: Mapped[Date | None] = mapped_column(
-        Date, insert_default=None, onupdate=func.current_date(), init=False
+        Date, default=None, onupdate=func.current_date(), init=False
     )
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey, Integer, String, Date, func
+from sqlalchemy import ForeignKey, Index, Integer, String, Date, func
 
 from src.models import Base
 
 
 class Ticket(Base):
     __tablename__ = "tickets"
+    __table_args__ = (
+        Index("ix_tickets_project_id_status_id", "project_id", "status_id"),
+        Index("ix_tickets_creator_id", "creator_id"),
+        Index("ix_tickets_status_id", "status_id"),
+        Index("ix_tickets_category_id", "category_id"),
+        Index("ix_tickets_level_id", "level_id"),
+        Index("ix_tickets_creation_date_id", "creation_date", "id"),
+    )
+    # The INSERT returns the creation date, instead of a SELECT after it
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True, init=False
@@ -18,13 +28,19 @@ class Ticket(Base):
     comments: Mapped[list[Comment]] = relationship(
         back_populates="ticket",
         cascade="all, delete-orphan",
+        passive_deletes=True,
+        default_factory=list,
         init=False,
     )
 
-    creator_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    creator_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
     creator: Mapped[User] = relationship(back_populates="tickets", init=False)
 
-    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
     project: Mapped[Project] = relationship(back_populates="tickets", init=False)
 
     status_id: Mapped[int] = mapped_column(ForeignKey("statuses.id"), nullable=False)
@@ -43,5 +59,5 @@ class Ticket(Base):
     )
 
     update_date: Mapped[Date | None] = mapped_column(
-        Date, insert_default=None, onupdate=func.current_date(), init=False
+        Date, default=None, onupdate=func.current_date(), init=False
     )
@@ -1,11 +1,16 @@
 from __future__ import annotations
 from dataclasses import InitVar
 
-import bcrypt
 from sqlalchemy import Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models import Base
+from src.passwords import (
+    check_password,
+    check_password_async,
+    hash_password,
+    hash_password_async,
+)
 
 
 class User(Base):
@@ -24,21 +29,37 @@ class User(Base):
     )
 
     tickets: Mapped[list[Ticket]] = relationship(
-        "Ticket", back_populates="creator", cascade="all, delete-orphan", init=False
+        "Ticket",
+        back_populates="creator",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        default_factory=list,
+        init=False,
     )
 
     comments: Mapped[list[Comment]] = relationship(
-        "Comment", back_populates="creator", cascade="all, delete-orphan", init=False
+        "Comment",
+        back_populates="creator",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        default_factory=list,
+        init=False,
     )
 
     projects: Mapped[list[Project]] = relationship(
-        "Project", back_populates="creator", cascade="all, delete-orphan", init=False
+        "Project",
+        back_populates="creator",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        default_factory=list,
+        init=False,
     )
 
     plain_password: InitVar[str] = None
 
-    def __post_init__(self, plain_password: str):
-        self._password = self._set_password(plain_password)
+    def __post_init__(self, plain_password: str | None):
+        if plain_password is not None:
+            self._set_password(plain_password)
 
     @property
     def password(self) -> bytes:
@@ -51,14 +72,24 @@ class User(Base):
     def _set_password(self, plain_password: str):
         """Hash and store the password.
 
+        This blocks for the whole hash: handlers use :meth:`set_password`.
+
         Parameters
         ----------
         plain_password : str
             The plain text password to be hashed and stored.
         """
-        salt = bcrypt.gensalt()
-        password: bytes = plain_password.encode("utf-8")
-        self._password = bcrypt.hashpw(password, salt)
+        self._password = hash_password(plain_password)
+
+    async def set_password(self, plain_password: str):
+        """Hash and store the password, off the event loop.
+
+        Parameters
+        ----------
+        plain_password : str
+            The plain text password to be hashed and stored.
+        """
+        self._password = await hash_password_async(plain_password)
 
     def verify_password(self, plain_password: str) -> bool:
         """Check if the provided password matches the stored hash.
@@ -75,4 +106,21 @@ class User(Base):
         """
         if self._password is None:
             return False
-        return bcrypt.checkpw(plain_password.encode("utf-8"), self._password)
+        return check_password(plain_password, self._password)
+
+    async def verify_password_async(self, plain_password: str) -> bool:
+        """Check the password like :meth:`verify_password`, off the event loop.
+
+        Parameters
+        ----------
+        plain_password : str
+            The plain text password to be verified.
+
+        Returns
+        -------
+        bool
+            True if the provided password matches the stored hash, False otherwise.
+        """
+        if self._password is None:
+            return False
+        return await check_password_async(plain_password, self._password)
@@ -0,0 +1,55 @@
+"""Password hashing, run off the event loop.
+
+bcrypt is deliberately slow (about 250 ms per hash at cost 12). Called from
+a handler, it would block the event loop and every other request with it,
+so the async functions below run it in a dedicated thread pool, whose size
+bounds the number of hashes computed at once. bcrypt releases the GIL while
+hashing, so the threads do run in parallel.
+
+Attributes:
+    PASSWORD_EXECUTOR (ThreadPoolExecutor | None): The pool running bcrypt, None when
+                                                   PASSWORD_HASH_WORKERS is 0, in which
+                                                   case bcrypt runs inline.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from src.backend.config import BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS
+
+PASSWORD_EXECUTOR = (
+    ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+    if PASSWORD_HASH_WORKERS
+    else None
+)
+
+
+def hash_password(plain_password: str) -> bytes:
+    """Hash a password with a fresh salt of cost `BCRYPT_ROUNDS`."""
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    return bcrypt.hashpw(plain_password.encode("utf-8"), salt)
+
+
+def check_password(plain_password: str, hashed_password: bytes) -> bool:
+    """Check a password against its hash."""
+    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password)
+
+
+async def hash_password_async(plain_password: str) -> bytes:
+    """Hash a password in `PASSWORD_EXECUTOR`, see :func:`hash_password`."""
+    if PASSWORD_EXECUTOR is None:
+        return hash_password(plain_password)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(PASSWORD_EXECUTOR, hash_password, plain_password)
+
+
+async def check_password_async(plain_password: str, hashed_password: bytes) -> bool:
+    """Check a password in `PASSWORD_EXECUTOR`, see :func:`check_password`."""
+    if PASSWORD_EXECUTOR is None:
+        return check_password(plain_password, hashed_password)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        PASSWORD_EXECUTOR, check_password, plain_password, hashed_password
+    )
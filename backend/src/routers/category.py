@@ -1,10 +1,13 @@
 from typing import Annotated
-from fastapi import APIRouter, Body, Path, Query, Request, status
+from fastapi import APIRouter, Body, Path, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
+from src.cache import LOOKUPS, RESPONSES
 from src.models import Category
 from src.backend.config import LOG_APP
-from src.routers.utils import raise_not_found_if_absent
+from src.routers.utils import not_modified, raise_not_found_if_absent, update_by_id
 from src.schemas import CategoryCreate, CategoryRead, CategoryUpdate
 
 router = APIRouter(prefix="/categories", tags=["Categories"])
@@ -14,45 +17,60 @@ router = APIRouter(prefix="/categories", tags=["Categories"])
 async def create(
     request: Request, data: Annotated[CategoryCreate, Body()]
 ) -> CategoryRead:
-    LOG_APP.info(f"Attempting to create a category: {data.label}")
-    db = request.state.db
+    LOG_APP.debug("Attempting to create a category: {}", data.label)
+    db: AsyncSession = request.state.db
     category = Category(label=data.label)
 
     db.add(category)
-    db.commit()
-    db.refresh(category)
+    await db.commit()
+    LOOKUPS.invalidate(Category)
     category_read = CategoryRead.model_validate(category)
     LOG_APP.info(
-        f"Category created successfully: {category_read.id} - {category_read.label}"
+        "Category created successfully: {} - {}", category_read.id, category_read.label
     )
     return category_read
 
 
 @router.get("/{id}", response_model=CategoryRead)
-async def get(request: Request, id: Annotated[int, Path()]) -> CategoryRead:
-    LOG_APP.info(f"Attempting to get a category: {id}")
-    db = request.state.db
-    category = db.query(Category).filter(Category.id == id).first()
+async def get(
+    request: Request, response: Response, id: Annotated[int, Path()]
+) -> CategoryRead | Response:
+    LOG_APP.debug("Attempting to get a category: {}", id)
+    db: AsyncSession = request.state.db
+    categories = await LOOKUPS.get(db, Category)
+    category = categories.rows.get(id)
 
     raise_not_found_if_absent(category, f"Category with ID {id} not found")
 
+    if (cached := not_modified(request, response, categories.etag_of(id))) is not None:
+        LOG_APP.debug("Category not modified: {}", id)
+        return cached
+
     category_read = CategoryRead.model_validate(category)
-    LOG_APP.info(
-        f"Category retrieved successfully: {category_read.id} - {category_read.label}"
+    LOG_APP.debug(
+        "Category retrieved successfully: {} - {}",
+        category_read.id,
+        category_read.label,
     )
     return category_read
 
 
 @router.get("/", response_model=list[CategoryRead])
-async def get_all(request: Request) -> list[CategoryRead]:
-    LOG_APP.info("Attempting to get all categories")
-    db = request.state.db
-    categories = db.query(Category).all()
+async def get_all(
+    request: Request, response: Response
+) -> list[CategoryRead] | Response:
+    LOG_APP.debug("Attempting to get all categories")
+    db: AsyncSession = request.state.db
+    categories = await LOOKUPS.get(db, Category)
+
+    raise_not_found_if_absent(categories.rows, "No categories found")
 
-    raise_not_found_if_absent(categories, "No categories found")
+    if (cached := not_modified(request, response, categories.etag)) is not None:
+        LOG_APP.debug("Categories not modified")
+        return cached
 
-    categories_read = [CategoryRead.model_validate(category) for category in categories]
-    LOG_APP.info(f"Retrieved {len(categories_read)} categories from the database.")
+    categories_read = categories.read(CategoryRead)
+    LOG_APP.debug("Retrieved {} categories from the cache.", len(categories_read))
     return categories_read
 
 
@@ -62,24 +80,26 @@ async def update(
     id: Annotated[int, Path(ge=0)],
     data: Annotated[CategoryUpdate, Body()],
 ) -> CategoryRead:
-    LOG_APP.info(f"Attempting to update a category: {id}")
-    db = request.state.db
-    category = db.query(Category).filter(Category.id == id).first()
-
-    raise_not_found_if_absent(category, f"Category with ID {id} not found")
-
+    LOG_APP.debug("Attempting to update a category: {}", id)
+    db: AsyncSession = request.state.db
     update_data = data.model_dump(exclude_unset=True)
     if not update_data:
-        LOG_APP.info(f"No update data provided for category: {id}")
+        category = await db.scalar(select(Category).filter(Category.id == id))
+        raise_not_found_if_absent(category, f"Category with ID {id} not found")
+        LOG_APP.info("No update data provided for category: {}", id)
         return CategoryRead.model_validate(category)
 
-    category.label = data.label
-    db.commit()
-    db.refresh(category)
+    category = await update_by_id(db, Category, id, update_data)
+
+    raise_not_found_if_absent(category, f"Category with ID {id} not found")
+
+    await db.commit()
+    LOOKUPS.invalidate(Category)
+    await RESPONSES.invalidate(f"category:{id}")
 
     category_read = CategoryRead.model_validate(category)
     LOG_APP.info(
-        f"Category updated  successfully: {category_read.id} - {category_read.label}"
+        "Category updated  successfully: {} - {}", category_read.id, category_read.label
     )
     return category_read
 
@@ -89,14 +109,16 @@ async def delete(
     request: Request,
     id: Annotated[int, Path()],
 ) -> CategoryRead:
-    LOG_APP.info(f"Attempting to delete a category: {id}")
-    db = request.state.db
-    category = db.query(Category).filter(Category.id == id).first()
+    LOG_APP.debug("Attempting to delete a category: {}", id)
+    db: AsyncSession = request.state.db
+    category = await db.scalar(select(Category).filter(Category.id == id))
 
     raise_not_found_if_absent(category, f"Category with ID {id} not found")
 
-    db.delete(category)
-    db.commit()
+    await db.delete(category)
+    await db.commit()
+    LOOKUPS.invalidate(Category)
+    await RESPONSES.invalidate(f"category:{id}")
 
-    LOG_APP.info(f"Category with ID {id} deleted successfully")
-    return category
+    LOG_APP.info("Category with ID {} deleted successfully", id)
+    return CategoryRead.model_validate(category)
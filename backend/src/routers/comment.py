@@ -1,23 +1,43 @@
 from fastapi import Depends
-from sqlalchemy.orm import Session
-from fastapi_pagination import Params
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi_pagination import Params, set_page
 from fastapi import APIRouter, Request, status
 from fastapi_pagination.links import Page
-from fastapi_pagination.ext.sqlalchemy import paginate
 from sqlalchemy.future import select
 
 from src.models import Comment
 from src.backend.config import LOG_APP
-from src.routers.utils import raise_not_found_if_absent
-from src.schemas import CommentCreate, CommentRead, CommentUpdate
+from src.cache import LOOKUPS, RESPONSES
+from src.search import SEARCH
+from src.routers.pagination import (
+    CursorPage,
+    CursorParams,
+    paginate_by_cursor,
+    paginate_with_total,
+)
+from src.routers.projection import ProjectionParams
+from src.routers.utils import (
+    ModelResponse,
+    raise_not_found_if_absent,
+    select_read,
+    update_by_id,
+    validate,
+    validate_all,
+)
+from src.schemas import (
+    CommentCreate,
+    CommentRead,
+    CommentReadLight,
+    CommentUpdate,
+)
 
 router = APIRouter(prefix="/comments", tags=["Comments"])
 
 
 @router.post("/", response_model=CommentRead, status_code=status.HTTP_201_CREATED)
-async def create(request: Request, data: CommentCreate) -> CommentRead:
-    LOG_APP.info("Attempting to create a comment")
-    db: Session = request.state.db
+async def create(request: Request, data: CommentCreate) -> ModelResponse:
+    LOG_APP.debug("Attempting to create a comment")
+    db: AsyncSession = request.state.db
 
     comment = Comment(
         content=data.content,
@@ -25,80 +45,128 @@ async def create(request: Request, data: CommentCreate) -> CommentRead:
         ticket_id=data.ticket_id,
     )
     db.add(comment)
-    db.commit()
-    db.refresh(comment)
-
-    comment_read = CommentRead.model_validate(comment)
-    LOG_APP.info(f"Comment created successfully: {comment_read.id}")
-    return comment_read
+    await db.flush()
+    await SEARCH.index(db, Comment, [comment.id])
+    await db.commit()
+    await RESPONSES.invalidate(
+        f"ticket:{comment.ticket_id}", f"user:{comment.creator_id}"
+    )
 
+    comment_read = await validate(db, CommentRead, comment)
+    LOG_APP.info("Comment created successfully: {}", comment_read.id)
+    return ModelResponse(comment_read, status_code=status.HTTP_201_CREATED)
+
+
+# GET /comments/cursor?size=10&after=<next_cursor>
+# Declared before "/{id}" so that "cursor" is not parsed as an ID.
+@router.get("/cursor", response_model=CursorPage[CommentRead])
+async def get_all_by_cursor(
+    request: Request, params: CursorParams = Depends()
+) -> ModelResponse:
+    LOG_APP.debug("Attempting to get comments with cursor pagination")
+    db: AsyncSession = request.state.db
+
+    comments, next_cursor, previous_cursor = await paginate_by_cursor(
+        db,
+        select_read(Comment, CommentRead),
+        (Comment.creation_date, Comment.id),
+        params,
+    )
 
-@router.get("/{id}", response_model=CommentRead)
-async def get(request: Request, id: int) -> CommentRead:
-    LOG_APP.info(f"Attempting to get a comment: {id}")
-    db: Session = request.state.db
+    raise_not_found_if_absent(comments, "No comments found")
 
-    comment = db.query(Comment).filter(Comment.id == id).first()
-    raise_not_found_if_absent(comment, f"Comment with ID {id} not found")
+    comments_read = await validate_all(db, CommentRead, comments)
+    LOG_APP.debug("Retrieved {} comments with cursor pagination.", len(comments_read))
 
-    comment_read = CommentRead.model_validate(comment)
-    LOG_APP.info(f"Comment retrieved successfully: {comment_read.id}")
-    return comment_read
+    return ModelResponse(
+        CursorPage[CommentRead](
+            items=comments_read,
+            size=params.size,
+            next_cursor=next_cursor,
+            previous_cursor=previous_cursor,
+        )
+    )
 
 
-# GET /comments/?page=1&size=10
-@router.get("/", response_model=Page[CommentRead])
-async def get_all(request: Request, params: Params = Depends()) -> Page[CommentRead]:
-    LOG_APP.info("Attempting to get comments with pagination")
-    db: Session = request.state.db
+@router.get("/{id}", response_model=CommentRead)
+async def get(
+    request: Request, id: int, projection: ProjectionParams = Depends()
+) -> ModelResponse:
+    LOG_APP.debug("Attempting to get a comment: {}", id)
+    db: AsyncSession = request.state.db
+    query, schema = projection.select(Comment, CommentRead, CommentReadLight)
+    comment = await db.scalar(query.filter(Comment.id == id))
 
-    comments = paginate(db, select(Comment))
+    raise_not_found_if_absent(comment, f"Comment with ID {id} not found")
 
-    raise_not_found_if_absent(comments.items, "No comments found")
+    comment_read = await validate(db, schema, comment)
+    LOG_APP.debug("Comment retrieved successfully: {}", id)
+    return projection.response(comment_read)
 
-    comments_read = [CommentRead.model_validate(comment) for comment in comments.items]
-    LOG_APP.info(
-        f"Retrieved {len(comments_read)} comments from the database with pagination."
-    )
 
-    return Page[CommentRead].create(
-        items=comments_read, params=comments.params, total=comments.total
-    )
+# GET /comments/?page=1&size=10&fields=id,content
+@router.get("/", response_model=Page[CommentRead])
+async def get_all(
+    request: Request,
+    params: Params = Depends(),
+    projection: ProjectionParams = Depends(),
+) -> ModelResponse:
+    LOG_APP.debug("Attempting to get comments with pagination")
+    db: AsyncSession = request.state.db
+    query, schema = projection.select(Comment, CommentRead, CommentReadLight)
+
+    await LOOKUPS.warm(db)
+    with set_page(Page[schema]):  # type: ignore[valid-type]
+        comments_read = await paginate_with_total(
+            db,
+            query.order_by(Comment.creation_date, Comment.id),
+            params,
+            transformer=lambda items: [schema.model_validate(item) for item in items],
+        )
+
+    raise_not_found_if_absent(comments_read.items, "No comments found")
+    LOG_APP.debug("Retrieved {} comments with pagination.", len(comments_read.items))
+
+    return projection.response(comments_read)
 
 
 @router.put("/{id}", response_model=CommentRead)
-async def update(request: Request, id: int, data: CommentUpdate) -> CommentRead:
-    LOG_APP.info(f"Attempting to update a comment: {id}")
-    db: Session = request.state.db
-    comment = db.query(Comment).filter(Comment.id == id).first()
-
-    raise_not_found_if_absent(comment, f"Comment with ID {id} not found")
-
+async def update(request: Request, id: int, data: CommentUpdate) -> ModelResponse:
+    LOG_APP.debug("Attempting to update a comment: {}", id)
+    db: AsyncSession = request.state.db
     update_data = data.model_dump(exclude_unset=True)
 
     if not update_data:
-        LOG_APP.info(f"No update data provided for comment: {id}")
-        return CommentRead.model_validate(comment)
+        comment = await db.scalar(
+            select_read(Comment, CommentRead).filter(Comment.id == id)
+        )
+        raise_not_found_if_absent(comment, f"Comment with ID {id} not found")
+        LOG_APP.info("No update data provided for comment: {}", id)
+        return ModelResponse(await validate(db, CommentRead, comment))
 
-    for key, value in update_data.items():
-        setattr(comment, key, value)
+    comment = await update_by_id(db, Comment, id, update_data, CommentRead)
 
-    db.commit()
-    db.refresh(comment)
+    raise_not_found_if_absent(comment, f"Comment with ID {id} not found")
 
-    comment_read = CommentRead.model_validate(comment)
-    LOG_APP.info(f"Comment updated successfully: {comment_read.id}")
-    return comment_read
+    if "content" in update_data:
+        await SEARCH.index(db, Comment, [id])
+    await db.commit()
+    await RESPONSES.invalidate(f"comment:{id}")
+    comment_read = await validate(db, CommentRead, comment)
+    LOG_APP.info("Comment updated successfully: {}", comment_read.id)
+    return ModelResponse(comment_read)
 
 
 @router.delete("/{id}")
 async def delete(request: Request, id: int) -> None:
-    LOG_APP.info(f"Attempting to delete a comment: {id}")
-    db: Session = request.state.db
-    comment = db.query(Comment).filter(Comment.id == id).first()
+    LOG_APP.debug("Attempting to delete a comment: {}", id)
+    db: AsyncSession = request.state.db
+    comment = await db.scalar(select(Comment).filter(Comment.id == id))
 
     raise_not_found_if_absent(comment, f"Comment with ID {id} not found")
 
-    db.delete(comment)
-    db.commit()
-    LOG_APP.info(f"Comment with ID {id} deleted successfully")
+    await SEARCH.remove(db, Comment, [id])
+    await db.delete(comment)
+    await db.commit()
+    await RESPONSES.invalidate(f"comment:{id}")
+    LOG_APP.info("Comment with ID {} deleted successfully", id)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import ClassVar, Optional
+
+from fastapi import Query
+from pydantic import BaseModel
+from sqlalchemy import Select
+
+from src.exceptions import UnknownFieldException
+from src.models import Ticket
+
+
+class TicketFilterParams(BaseModel):
+    project_id: Optional[int] = Query(None)
+    status_id: Optional[int] = Query(None)
+    level_id: Optional[int] = Query(None)
+    category_id: Optional[int] = Query(None)
+    creator_id: Optional[int] = Query(None)
+    created_from: Optional[date] = Query(
+        None, description="Only tickets created on or after this date"
+    )
+    created_to: Optional[date] = Query(
+        None, description="Only tickets created on or before this date"
+    )
+    sort: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to sort by, prefixed with - for "
+        "descending order, e.g. -creation_date,title",
+    )
+
+    KEYS: ClassVar[tuple[str, ...]] = (
+        "project_id",
+        "status_id",
+        "level_id",
+        "category_id",
+        "creator_id",
+    )
+    SORTABLE: ClassVar[tuple[str, ...]] = (
+        "id",
+        "title",
+        "creation_date",
+        "update_date",
+    )
+
+    def filter(self, query: Select) -> Select:
+        """Add the WHERE clauses of the filters that are set to `query`.
+
+        Each foreign key filter is served by an index of the tickets table,
+        project_id and status_id together by their composite index.
+        """
+        for key in self.KEYS:
+            if (value := getattr(self, key)) is not None:
+                query = query.filter(getattr(Ticket, key) == value)
+        if self.created_from is not None:
+            query = query.filter(Ticket.creation_date >= self.created_from)
+        if self.created_to is not None:
+            query = query.filter(Ticket.creation_date <= self.created_to)
+        return query
+
+    def order_by(self, query: Select) -> Select:
+        """Add the ORDER BY clause requested by `sort` to `query`.
+
+        Ties are broken by id, in the direction of the last field, so that
+        pages are stable and a sort on creation date follows its index.
+        Without `sort`, or if it names no field, tickets are ordered by
+        creation date.
+
+        Raises
+        ------
+        UnknownFieldException
+            If a sort field is not one of `SORTABLE`.
+        """
+        keys = [key.strip() for key in (self.sort or "").split(",") if key.strip()]
+        if not keys:
+            return query.order_by(Ticket.creation_date, Ticket.id)
+
+        unknown = [key for key in keys if key.removeprefix("-") not in self.SORTABLE]
+        if unknown:
+            raise UnknownFieldException(f"Unknown sort fields: {', '.join(unknown)}")
+
+        columns = [
+            getattr(Ticket, key[1:]).desc()
+            if key.startswith("-")
+            else getattr(Ticket, key)
+            for key in keys
+        ]
+        if not {"id", "-id"} & set(keys):
+            columns.append(Ticket.id.desc() if keys[-1][0] == "-" else Ticket.id)
+        return query.order_by(*columns)
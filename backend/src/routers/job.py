@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.config import LOG_APP
+from src.models import Job
+from src.routers.utils import ModelResponse, raise_not_found_if_absent
+from src.schemas import JobRead
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+# GET /jobs/1, polled after DELETE /projects/1?background=true
+@router.get("/{id}", response_model=JobRead)
+async def get(request: Request, id: int) -> ModelResponse:
+    LOG_APP.debug("Attempting to get a job: {}", id)
+    db: AsyncSession = request.state.db
+    job = await db.get(Job, id)
+
+    raise_not_found_if_absent(job, f"Job with ID {id} not found")
+
+    return ModelResponse(JobRead.model_validate(job))
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Request, status
+from fastapi import APIRouter, Request, Response, status
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache import LOOKUPS, RESPONSES
 from src.models import Level
 from src.backend.config import LOG_APP
 from src.exceptions import NotFoundException
-from src.routers.utils import raise_not_found_if_absent
+from src.routers.utils import not_modified, raise_not_found_if_absent, update_by_id
 from src.schemas import LevelCreate, LevelRead, LevelUpdate
 
 
@@ -12,80 +16,95 @@ router = APIRouter(prefix="/levels", tags=["Levels"])
 
 @router.post("/", response_model=LevelRead, status_code=status.HTTP_201_CREATED)
 async def create(request: Request, data: LevelCreate) -> LevelRead:
-    LOG_APP.info(f"Attempting to create a level: {data.label}")
-    db = request.state.db
+    LOG_APP.debug("Attempting to create a level: {}", data.label)
+    db: AsyncSession = request.state.db
 
     level = Level(label=data.label)
     db.add(level)
-    db.commit()
-    db.refresh(level)
+    await db.commit()
+    LOOKUPS.invalidate(Level)
 
     level_read = LevelRead.model_validate(level)
-    LOG_APP.info(f"Level created successfully: {level_read.id} - {level_read.label}")
+    LOG_APP.info("Level created successfully: {} - {}", level_read.id, level_read.label)
     return level_read
 
 
 @router.get("/{id}", response_model=LevelRead)
-async def get(request: Request, id: int) -> LevelRead:
-    LOG_APP.info(f"Attempting to get a level: {id}")
-    db = request.state.db
-    level = db.query(Level).filter(Level.id == id).first()
+async def get(request: Request, response: Response, id: int) -> LevelRead | Response:
+    LOG_APP.debug("Attempting to get a level: {}", id)
+    db: AsyncSession = request.state.db
+    levels = await LOOKUPS.get(db, Level)
+    level = levels.rows.get(id)
 
     raise_not_found_if_absent(level, f"Level with ID {id} not found")
 
+    if (cached := not_modified(request, response, levels.etag_of(id))) is not None:
+        LOG_APP.debug("Level not modified: {}", id)
+        return cached
+
     level_read = LevelRead.model_validate(level)
-    LOG_APP.info(f"Level retrieved successfully: {level_read.id} - {level_read.label}")
+    LOG_APP.debug(
+        "Level retrieved successfully: {} - {}", level_read.id, level_read.label
+    )
     return level_read
 
 
 @router.get("/", response_model=list[LevelRead])
-async def get_all(request: Request) -> list[LevelRead]:
-    LOG_APP.info("Attempting to get all levels")
-    db = request.state.db
-    levels = db.query(Level).all()
+async def get_all(request: Request, response: Response) -> list[LevelRead] | Response:
+    LOG_APP.debug("Attempting to get all levels")
+    db: AsyncSession = request.state.db
+    levels = await LOOKUPS.get(db, Level)
 
-    if not levels:
+    if not levels.rows:
         LOG_APP.warning("No levels found in the database.")
         raise NotFoundException("No levels found")
 
-    raise_not_found_if_absent(levels, "No levels found")
+    if (cached := not_modified(request, response, levels.etag)) is not None:
+        LOG_APP.debug("Levels not modified")
+        return cached
 
-    levels_read = [LevelRead.model_validate(level) for level in levels]
-    LOG_APP.info(f"Retrieved {len(levels_read)} levels from the database.")
+    levels_read = levels.read(LevelRead)
+    LOG_APP.debug("Retrieved {} levels from the cache.", len(levels_read))
     return levels_read
 
 
 @router.put("/{id}", response_model=LevelRead)
 async def update(request: Request, id: int, data: LevelUpdate) -> LevelRead:
-    LOG_APP.info(f"Attempting to update a level: {id}")
-    db = request.state.db
-    level = db.query(Level).filter(Level.id == id).first()
-
-    raise_not_found_if_absent(level, f"Level with ID {id} not found")
-
+    LOG_APP.debug("Attempting to update a level: {}", id)
+    db: AsyncSession = request.state.db
     update_data = data.model_dump(exclude_unset=True)
     if not update_data:
-        LOG_APP.info(f"No update data provided for level: {id}")
+        level = await db.scalar(select(Level).filter(Level.id == id))
+        raise_not_found_if_absent(level, f"Level with ID {id} not found")
+        LOG_APP.info("No update data provided for level: {}", id)
         return LevelRead.model_validate(level)
 
-    level.label = data.label
-    db.commit()
-    db.refresh(level)
+    level = await update_by_id(db, Level, id, update_data)
+
+    raise_not_found_if_absent(level, f"Level with ID {id} not found")
+
+    await db.commit()
+    LOOKUPS.invalidate(Level)
+    await RESPONSES.invalidate(f"level:{id}")
 
     level_read = LevelRead.model_validate(level)
-    LOG_APP.info(f"Level updated  successfully: {level_read.id} - {level_read.label}")
+    LOG_APP.info(
+        "Level updated  successfully: {} - {}", level_read.id, level_read.label
+    )
     return level_read
 
 
 @router.delete("/{id}")
 async def delete(request: Request, id: int) -> None:
-    LOG_APP.info(f"Attempting to delete a level: {id}")
-    db = request.state.db
-    level = db.query(Level).filter(Level.id == id).first()
+    LOG_APP.debug("Attempting to delete a level: {}", id)
+    db: AsyncSession = request.state.db
+    level = await db.scalar(select(Level).filter(Level.id == id))
 
     raise_not_found_if_absent(level, f"Level with ID {id} not found")
 
-    db.delete(level)
-    db.commit()
+    await db.delete(level)
+    await db.commit()
+    LOOKUPS.invalidate(Level)
+    await RESPONSES.invalidate(f"level:{id}")
 
-    LOG_APP.info(f"Level with ID {id} deleted successfully")
+    LOG_APP.info("Level with ID {} deleted successfully", id)
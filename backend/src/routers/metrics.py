@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from src.metrics import METRICS
+
+router = APIRouter(tags=["Metrics"])
+
+
+# GET /metrics, scraped by Prometheus
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        METRICS.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
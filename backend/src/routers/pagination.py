@@ -1,11 +1,49 @@
 from __future__ import annotations
 
-from typing import Any, Generic, TypeVar, List, Optional, Sequence
-from fastapi_pagination import Params
+import json
+import time
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Generic, TypeVar, List, Optional, Sequence
+
+from fastapi import Query
+from fastapi_pagination import Params, create_page
 from fastapi_pagination.bases import AbstractPage, AbstractParams
+from fastapi_pagination.ext.sqlalchemy import (
+    create_count_query,
+    create_paginate_query,
+    paginate,
+)
+from pydantic import BaseModel
+from sqlalchemy import Select, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.util import greenlet_spawn
+
+from src.backend.config import (
+    PAGINATION_TOTALS,
+    PAGINATION_TOTALS_SIZE,
+    PAGINATION_TOTALS_TTL,
+)
+from src.exceptions import InvalidCursorException
 
 T = TypeVar("T")
 
+# Pages listed on each side of the current one in PageResponse.page_range
+PAGE_RANGE_WIDTH = 2
+
+
+def page_range(page: int, num_pages: int, width: int = PAGE_RANGE_WIDTH) -> list[int]:
+    """Return the page numbers to link to from `page`, in a bounded list.
+
+    The first and last pages, and `width` pages on each side of the current
+    one: ``[1, 48, 49, 50, 51, 52, 100]`` for page 50 of 100. A gap between
+    two numbers stands for the pages left out.
+    """
+    window = range(max(1, page - width), min(num_pages, page + width) + 1)
+    return sorted({1, *window, num_pages}) if num_pages else []
+
 
 class PageResponse(AbstractPage[T], Generic[T]):
     total: int
@@ -37,7 +75,6 @@ class PageResponse(AbstractPage[T], Generic[T]):
         page = params.page
         page_size = params.size
         num_pages = (total // page_size) + (1 if total % page_size > 0 else 0)
-        page_range = list(range(1, num_pages + 1))
 
         base_url = kwargs.get("base_url", "")
         first_page = str(base_url.include_query_params(page=1, size=page_size))
@@ -58,10 +95,228 @@ class PageResponse(AbstractPage[T], Generic[T]):
             page=page,
             page_size=page_size,
             num_pages=num_pages,
-            page_range=page_range,
+            page_range=page_range(page, num_pages),
             items=list(items),
             first_page=first_page,
             previous_page=previous_page,
             next_page=next_page,
             last_page=last_page,
         )
+
+
+class TotalCounter:
+    """Count the rows of the lists, in one of three ways:
+
+    - ``exact``: a ``COUNT(*)`` per request;
+    - ``cached``: a ``COUNT(*)`` per distinct query, reused for `ttl` seconds,
+      so that paging through a list costs one count, not one per page;
+    - ``estimated``: the planner's row estimate on PostgreSQL, ``max(id)``
+      for an unfiltered list on SQLite, or else a cached count.
+
+    Parameters
+    ----------
+    strategy : str
+        One of ``STRATEGIES``.
+    ttl : float
+        Lifetime of a cached total, in seconds.
+    maxsize : int
+        Maximum number of totals cached.
+    """
+
+    STRATEGIES = ("exact", "cached", "estimated")
+
+    def __init__(self, strategy: str, ttl: float, maxsize: int) -> None:
+        if strategy not in self.STRATEGIES:
+            raise ValueError(
+                f"Unknown totals strategy {strategy!r}, use one of {self.STRATEGIES}"
+            )
+        self.strategy = strategy
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._totals: OrderedDict[tuple, tuple[float, int]] = OrderedDict()
+
+    async def count(self, db: AsyncSession, query: Select) -> Optional[int]:
+        """Return the total of `query`, or None to let the page count it."""
+        if self.strategy == "exact":
+            return None
+        if self.strategy == "estimated":
+            total = await self._estimate(db, query)
+            if total is not None:
+                return total
+        return await self._cached(db, query)
+
+    async def _cached(self, db: AsyncSession, query: Select) -> int:
+        compiled = query.compile(dialect=db.bind.dialect)
+        key = (compiled.string, tuple(sorted(compiled.params.items())))
+        entry = self._totals.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._totals.move_to_end(key)
+            return entry[1]
+
+        total = await db.scalar(create_count_query(query)) or 0
+        self._totals[key] = (time.monotonic() + self.ttl, total)
+        self._totals.move_to_end(key)
+        while len(self._totals) > self.maxsize:
+            self._totals.popitem(last=False)
+        return total
+
+    async def _estimate(self, db: AsyncSession, query: Select) -> Optional[int]:
+        if db.bind.dialect.name == "postgresql":
+            sql = query.compile(
+                dialect=db.bind.dialect, compile_kwargs={"literal_binds": True}
+            )
+            plan = await db.scalar(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+            # asyncpg returns the plan as text, psycopg parses it
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+
+        entity = query.column_descriptions[0]["entity"]
+        if query.whereclause is not None or entity is None:
+            return None
+        # Ids are never reused: only the deleted rows make it an estimate.
+        return await db.scalar(select(func.max(entity.id))) or 0
+
+    def clear(self) -> None:
+        self._totals.clear()
+
+
+TOTALS = TotalCounter(
+    PAGINATION_TOTALS, ttl=PAGINATION_TOTALS_TTL, maxsize=PAGINATION_TOTALS_SIZE
+)
+
+
+async def paginate_with_total(
+    db: AsyncSession,
+    query: Select,
+    params: Params,
+    transformer: Callable[[Sequence[Any]], Sequence[Any]],
+    totals: TotalCounter = TOTALS,
+) -> Any:
+    """Paginate `query` like fastapi_pagination, counting it with `totals`.
+
+    Returns the page class set by ``set_page``.
+    """
+    total = await totals.count(db, query)
+    if total is None:
+        return await paginate(db, query, params, transformer=transformer)
+
+    result = await db.execute(create_paginate_query(query, params))
+    if len(query.column_descriptions) == 1:
+        items = result.unique().scalars().all()
+    else:
+        items = result.all()
+    # In a greenlet, like fastapi_pagination, so that lazy loads still work
+    items = await greenlet_spawn(transformer, items)
+    return create_page(items, total=total, params=params)
+
+
+class CursorParams(BaseModel):
+    size: int = Query(50, ge=1, le=100, description="Page size")
+    after: Optional[str] = Query(None, description="Cursor of the previous page")
+    before: Optional[str] = Query(None, description="Cursor of the next page")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    size: int
+    next_cursor: Optional[str]
+    previous_cursor: Optional[str]
+
+
+def encode_cursor(item: object, keyset: Sequence[InstrumentedAttribute]) -> str:
+    """Encode the keyset values of an item into an opaque cursor.
+
+    Parameters
+    ----------
+    item : object
+        The ORM object the cursor points to.
+    keyset : Sequence[InstrumentedAttribute]
+        The columns the list is ordered by, the last one being unique.
+
+    Returns
+    -------
+    str
+        A URL-safe token.
+    """
+    values = [getattr(item, column.key) for column in keyset]
+    raw = json.dumps(values, default=date.isoformat, separators=(",", ":"))
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, keyset: Sequence[InstrumentedAttribute]) -> list[Any]:
+    """Decode a cursor produced by `encode_cursor`.
+
+    Raises
+    ------
+    InvalidCursorException
+        If the cursor is malformed or does not match the keyset.
+    """
+    try:
+        values = json.loads(urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(keyset):
+            raise ValueError(cursor)
+        return [
+            date.fromisoformat(value)
+            if column.type.python_type is date
+            else column.type.python_type(value)
+            for column, value in zip(keyset, values)
+        ]
+    except (TypeError, ValueError):
+        raise InvalidCursorException(f"Invalid pagination cursor: {cursor}")
+
+
+async def paginate_by_cursor(
+    db: AsyncSession,
+    query: Select,
+    keyset: Sequence[InstrumentedAttribute],
+    params: CursorParams,
+) -> tuple[list[Any], Optional[str], Optional[str]]:
+    """Fetch one page of `query` with keyset pagination.
+
+    Rows are ordered by `keyset` and the page boundary is expressed as a
+    ``WHERE (keyset) > (cursor)`` clause, so neither a ``COUNT(*)`` nor an
+    ``OFFSET`` scan is needed and every page costs the same.
+
+    Parameters
+    ----------
+    db : AsyncSession
+        The session used to run the query.
+    query : Select
+        The select statement to paginate.
+    keyset : Sequence[InstrumentedAttribute]
+        The columns to order by, the last one being unique.
+    params : CursorParams
+        The page size and the optional ``after``/``before`` cursor.
+
+    Returns
+    -------
+    tuple[list[Any], Optional[str], Optional[str]]
+        The items of the page, the next cursor and the previous cursor.
+    """
+    if params.after and params.before:
+        raise InvalidCursorException("Only one of 'after' and 'before' can be given")
+
+    key = tuple_(*keyset)
+    if params.before:
+        query = query.filter(key < tuple_(*decode_cursor(params.before, keyset)))
+        query = query.order_by(*(column.desc() for column in keyset))
+    else:
+        if params.after:
+            query = query.filter(key > tuple_(*decode_cursor(params.after, keyset)))
+        query = query.order_by(*keyset)
+
+    items = list((await db.scalars(query.limit(params.size + 1))).all())
+    has_more = len(items) > params.size
+    items = items[: params.size]
+    if params.before:
+        items.reverse()
+
+    if not items:
+        return items, None, None
+
+    has_next = has_more if not params.before else True
+    has_previous = bool(params.after) if not params.before else has_more
+    next_cursor = encode_cursor(items[-1], keyset) if has_next else None
+    previous_cursor = encode_cursor(items[0], keyset) if has_previous else None
+    return items, next_cursor, previous_cursor
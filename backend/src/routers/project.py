@@ -1,94 +1,205 @@
-from fastapi import APIRouter, Request, status
-from sqlalchemy.orm import Session
-
-from src.models import Project
+from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi.responses import StreamingResponse
+from fastapi_pagination import Params, set_page
+from fastapi_pagination.links import Page
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import Project, Ticket
 from src.backend.config import LOG_APP
-from src.routers.utils import raise_not_found_if_absent
-from src.schemas import ProjectCreate, ProjectRead, ProjectUpdate
+from src.cache import LOOKUPS, RESPONSES
+from src.jobs import JOBS, PURGES
+from src.search import SEARCH
+from src.routers.pagination import (
+    CursorPage,
+    CursorParams,
+    paginate_by_cursor,
+    paginate_with_total,
+)
+from src.routers.projection import ProjectionParams
+from src.routers.utils import (
+    ModelResponse,
+    raise_not_found_if_absent,
+    select_read,
+    stream_ndjson,
+    update_by_id,
+    validate,
+    validate_all,
+)
+from src.schemas import (
+    JobRead,
+    ProjectCreate,
+    ProjectRead,
+    ProjectReadLight,
+    ProjectUpdate,
+)
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 
 @router.post("/", response_model=ProjectRead, status_code=status.HTTP_201_CREATED)
-async def create(request: Request, data: ProjectCreate) -> ProjectRead:
-    LOG_APP.info("Attempting to create a project")
-    db: Session = request.state.db
+async def create(request: Request, data: ProjectCreate) -> ModelResponse:
+    LOG_APP.debug("Attempting to create a project")
+    db: AsyncSession = request.state.db
 
     project = Project(**data.model_dump())
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await RESPONSES.invalidate(f"user:{project.creator_id}")
 
-    project_read = ProjectRead.model_validate(project)
+    project_read = await validate(db, ProjectRead, project)
     LOG_APP.info(
-        f"Project created successfully: {project_read.id} - {project_read.label}"
+        "Project created successfully: {} - {}", project_read.id, project_read.label
+    )
+    return ModelResponse(project_read, status_code=status.HTTP_201_CREATED)
+
+
+# GET /projects/cursor?size=10&after=<next_cursor>
+# Declared before "/{id}" so that "cursor" is not parsed as an ID.
+@router.get("/cursor", response_model=CursorPage[ProjectRead])
+async def get_all_by_cursor(
+    request: Request, params: CursorParams = Depends()
+) -> ModelResponse:
+    LOG_APP.debug("Attempting to get projects with cursor pagination")
+    db: AsyncSession = request.state.db
+
+    projects, next_cursor, previous_cursor = await paginate_by_cursor(
+        db,
+        select_read(Project, ProjectRead),
+        (Project.creation_date, Project.id),
+        params,
     )
-    return project_read
 
+    raise_not_found_if_absent(projects, "No projects found")
 
-@router.get("/{id}", response_model=ProjectRead)
-async def get(request: Request, id: int) -> ProjectRead:
-    LOG_APP.info(f"Attempting to get a project: {id}")
-    db: Session = request.state.db
-    project = db.query(Project).filter(Project.id == id).first()
+    projects_read = await validate_all(db, ProjectRead, projects)
+    LOG_APP.debug("Retrieved {} projects with cursor pagination.", len(projects_read))
 
-    raise_not_found_if_absent(project, f"Project with ID {id} not found")
+    return ModelResponse(
+        CursorPage[ProjectRead](
+            items=projects_read,
+            size=params.size,
+            next_cursor=next_cursor,
+            previous_cursor=previous_cursor,
+        )
+    )
 
-    project_read = ProjectRead.model_validate(project)
-    LOG_APP.info(
-        f"Project retrieved successfully: {project_read.id} - {project_read.label}"
+
+# GET /projects/export -> one ProjectRead per line (NDJSON), streamed in chunks
+@router.get("/export", response_class=StreamingResponse)
+async def export(request: Request) -> StreamingResponse:
+    LOG_APP.debug("Attempting to export all projects")
+    db: AsyncSession = request.state.db
+
+    return StreamingResponse(
+        stream_ndjson(
+            db, select_read(Project, ProjectRead).order_by(Project.id), ProjectRead
+        ),
+        media_type="application/x-ndjson",
     )
-    return project_read
 
 
-@router.get("/", response_model=list[ProjectRead])
-async def get_all(request: Request) -> list[ProjectRead]:
-    LOG_APP.info("Attempting to get all projects")
-    db: Session = request.state.db
-    projects = db.query(Project).all()
+@router.get("/{id}", response_model=ProjectRead)
+async def get(
+    request: Request, id: int, projection: ProjectionParams = Depends()
+) -> ProjectRead | Response:
+    LOG_APP.debug("Attempting to get a project: {}", id)
+    if (cached := await RESPONSES.fetch(request)) is not None:
+        LOG_APP.debug("Project retrieved from the cache: {}", id)
+        return cached
+
+    db: AsyncSession = request.state.db
+    query, schema = projection.select(Project, ProjectRead, ProjectReadLight)
+    project = await db.scalar(query.filter(Project.id == id))
 
-    raise_not_found_if_absent(projects, "No projects found")
+    raise_not_found_if_absent(project, f"Project with ID {id} not found")
 
-    projects_read = [ProjectRead.model_validate(project) for project in projects]
-    LOG_APP.info(f"Retrieved {len(projects_read)} projects from the database.")
-    return projects_read
+    project_read = await validate(db, schema, project)
+    LOG_APP.debug("Project retrieved successfully: {}", id)
+    return await RESPONSES.store(request, project_read)
 
 
-@router.put("/{id}", response_model=ProjectRead)
-async def update(request: Request, id: int, data: ProjectUpdate) -> ProjectRead:
-    LOG_APP.info(f"Attempting to update a project: {id}")
-    db: Session = request.state.db
-    project = db.query(Project).filter(Project.id == id).first()
+# GET /projects/?page=1&size=10&fields=id,label
+@router.get("/", response_model=Page[ProjectRead])
+async def get_all(
+    request: Request,
+    params: Params = Depends(),
+    projection: ProjectionParams = Depends(),
+) -> ModelResponse:
+    LOG_APP.debug("Attempting to get projects with pagination")
+    db: AsyncSession = request.state.db
+    query, schema = projection.select(Project, ProjectRead, ProjectReadLight)
 
-    raise_not_found_if_absent(project, f"Project with ID {id} not found")
+    await LOOKUPS.warm(db)
+    with set_page(Page[schema]):  # type: ignore[valid-type]
+        projects_read = await paginate_with_total(
+            db,
+            query.order_by(Project.creation_date, Project.id),
+            params,
+            transformer=lambda items: [schema.model_validate(item) for item in items],
+        )
+
+    raise_not_found_if_absent(projects_read.items, "No projects found")
+    LOG_APP.debug("Retrieved {} projects with pagination.", len(projects_read.items))
+
+    return projection.response(projects_read)
 
+
+@router.put("/{id}", response_model=ProjectRead)
+async def update(request: Request, id: int, data: ProjectUpdate) -> ModelResponse:
+    LOG_APP.debug("Attempting to update a project: {}", id)
+    db: AsyncSession = request.state.db
     update_data = data.model_dump(exclude_unset=True)
 
     if not update_data:
-        LOG_APP.info(f"No update data provided for project: {id}")
-        return ProjectRead.model_validate(project)
+        project = await db.scalar(
+            select_read(Project, ProjectRead).filter(Project.id == id)
+        )
+        raise_not_found_if_absent(project, f"Project with ID {id} not found")
+        LOG_APP.info("No update data provided for project: {}", id)
+        return ModelResponse(await validate(db, ProjectRead, project))
 
-    for key, value in update_data.items():
-        setattr(project, key, value)
+    project = await update_by_id(db, Project, id, update_data, ProjectRead)
 
-    db.commit()
-    db.refresh(project)
+    raise_not_found_if_absent(project, f"Project with ID {id} not found")
 
-    project_read = ProjectRead.model_validate(project)
+    await db.commit()
+    await RESPONSES.invalidate(f"project:{id}")
+    project_read = await validate(db, ProjectRead, project)
     LOG_APP.info(
-        f"Project updated successfully: {project_read.id} - {project_read.label}"
+        "Project updated successfully: {} - {}", project_read.id, project_read.label
     )
-    return project_read
-
-
-@router.delete("/{id}")
-async def delete(request: Request, id: int) -> None:
-    LOG_APP.info(f"Attempting to delete a project: {id}")
-    db: Session = request.state.db
-    project = db.query(Project).filter(Project.id == id).first()
+    return ModelResponse(project_read)
+
+
+# DELETE /projects/1?background=true -> 202 and the job deleting the project
+@router.delete(
+    "/{id}",
+    response_model=None,
+    responses={status.HTTP_202_ACCEPTED: {"model": JobRead}},
+)
+async def delete(
+    request: Request, id: int, background: bool = False
+) -> ModelResponse | None:
+    LOG_APP.debug("Attempting to delete a project: {}", id)
+    db: AsyncSession = request.state.db
+    project = await db.scalar(select(Project).filter(Project.id == id))
 
     raise_not_found_if_absent(project, f"Project with ID {id} not found")
 
-    db.delete(project)
-    db.commit()
-    LOG_APP.info(f"Project with ID {id} deleted successfully")
+    if background:
+        job = await JOBS.submit(db, "delete_project", id)
+        LOG_APP.info("Project with ID {} queued for deletion: job {}", id, job.id)
+        return ModelResponse(
+            JobRead.model_validate(job),
+            status_code=status.HTTP_202_ACCEPTED,
+            headers={"Location": f"/jobs/{job.id}"},
+        )
+
+    await SEARCH.remove_tickets(db, select(Ticket.id).filter(Ticket.project_id == id))
+    tags = await PURGES["delete_project"].dependent_tags(db, id)
+    await db.delete(project)
+    await db.commit()
+    await RESPONSES.invalidate(f"project:{id}", *tags)
+    LOG_APP.info("Project with ID {} deleted successfully", id)
+    return None
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Query
+from pydantic import BaseModel, ConfigDict, create_model, model_validator
+from sqlalchemy import Select
+
+from src.exceptions import UnknownFieldException
+from src.routers.utils import ModelResponse, select_read
+
+
+class ProjectionParams(BaseModel):
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return, e.g. id,title,status"
+    )
+    expand: bool = Query(
+        True, description="Serialize nested relationships (false: light schema)"
+    )
+
+    def select(
+        self, model: type, schema: type[BaseModel], light_schema: type[BaseModel]
+    ) -> tuple[Select, type[BaseModel]]:
+        """Build the query and the schema matching the requested projection.
+
+        Parameters
+        ----------
+        model : type
+            The ORM model to select.
+        schema : type[BaseModel]
+            The full Read schema, used when `expand` is true.
+        light_schema : type[BaseModel]
+            The Read schema without nested relationships.
+
+        Returns
+        -------
+        tuple[Select, type[BaseModel]]
+            A select that only loads the requested columns and relationships,
+            and the schema to validate its rows with.
+
+        Raises
+        ------
+        UnknownFieldException
+            If a requested field is not part of the schema, or if `fields`
+            names none.
+        """
+        base = schema if self.expand else light_schema
+        if self.fields is None:
+            return select_read(model, base), base
+
+        fields = [name.strip() for name in self.fields.split(",") if name.strip()]
+        if not fields:
+            raise UnknownFieldException("No fields requested")
+        unknown = [name for name in fields if name not in base.model_fields]
+        if unknown:
+            raise UnknownFieldException(f"Unknown fields: {', '.join(unknown)}")
+
+        return select_read(model, base, fields), _project(base, frozenset(fields))
+
+    def response(self, content: BaseModel) -> ModelResponse:
+        """Return `content` as is, bypassing the response model.
+
+        A projected `content` does not match the response model, and a full
+        one was already validated by the handler.
+        """
+        return ModelResponse(content)
+
+
+@lru_cache(maxsize=256)
+def _project(schema: type[BaseModel], fields: frozenset[str]) -> type[BaseModel]:
+    """Create (once) a copy of `schema` restricted to `fields`.
+
+    The model validators of `schema`, such as the lookup resolution of
+    tickets, are carried over.
+    """
+    definitions: dict[str, Any] = {
+        name: (field.annotation, field)
+        for name, field in schema.model_fields.items()
+        if name in fields
+    }
+    validators: dict[str, Any] = {}
+    for name, decorator in schema.__pydantic_decorators__.model_validators.items():
+        # Bound to `schema`: the function is bound anew to the projection
+        function: Any = classmethod(getattr(decorator.func, "__func__"))
+        validators[name] = model_validator(mode=decorator.info.mode)(function)
+    return create_model(
+        f"{schema.__name__}Projection",
+        __config__=ConfigDict(from_attributes=True),
+        __validators__=validators,
+        **definitions,
+    )
@@ -2,26 +2,33 @@ from datetime import datetime, timedelta, timezone
 from email.mime.text import MIMEText
 import smtplib
 
-from jose import ExpiredSignatureError, JWTError, jwt
-from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, status
+from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 
+from src.cache import PRINCIPALS
 from src.models import User
-from src.schemas import UserCreate
+from src.schemas import UserCreate, UserReadLight
 from src.schemas.token import TokenData
 from src.exceptions import CredentialsException
-from src.backend.config import ALGORITHM, OAUTH2_SCHEME, SECRET_KEY, SessionLocal
+from src.backend.config import (
+    ALGORITHM,
+    OAUTH2_SCHEME,
+    SECRET_KEY,
+    read_from_primary,
+)
 
 router = APIRouter(prefix="/register", tags=["Register"])
 
 
-def get_user(db: Session, username: str) -> User | None:
-    return db.query(User).filter(User.username == username).first()
+async def get_user(db: AsyncSession, username: str) -> User | None:
+    return await db.scalar(select(User).filter(User.username == username))
 
 
-def authenticate_user(db: Session, username: str, password: str):
-    user = get_user(db, username)
-    return user if user and user.verify_password(password) else None
+async def authenticate_user(db: AsyncSession, username: str, password: str):
+    user = await get_user(db, username)
+    return user if user and await user.verify_password_async(password) else None
 
 
 def create_access_token(data: dict, expires_delta: timedelta = timedelta(minutes=15)):
@@ -41,27 +48,33 @@ def send_reset_password_email(email: str, token: str):
     #     server.send_message(msg)
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 async def get_current_user(
-    token: str = Depends(OAUTH2_SCHEME), db: Session = Depends(get_db)
-):
+    request: Request, token: str = Depends(OAUTH2_SCHEME)
+) -> UserReadLight:
+    """Return the user authenticated by the bearer `token`.
+
+    The user is cached until the token expires, see
+    :class:`src.cache.PrincipalCache`: the requests after the first one of a
+    token neither decode it nor open a database session. The user is read
+    from the primary, as it outlives the request in the cache.
+    """
+    if (principal := PRINCIPALS.get(token)) is not None:
+        return principal
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
             raise CredentialsException
         token_data = TokenData(username=username)
-    except JWTError | ExpiredSignatureError:
+    except JWTError:
         raise CredentialsException
 
-    user = get_user(db, username=token_data.username)
+    db: AsyncSession = request.state.db
+    read_from_primary(db)
+    user = await get_user(db, username=token_data.username)
     if user is None:
         raise CredentialsException
-    return user
+    principal = UserReadLight.model_validate(user)
+    if "exp" in payload:
+        PRINCIPALS.set(token, user.id, principal, payload["exp"])
+    return principal
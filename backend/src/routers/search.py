@@ -0,0 +1,44 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi_pagination import Params
+from fastapi_pagination.links import Page
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.config import LOG_APP
+from src.routers.pagination import paginate_with_total
+from src.routers.utils import ModelResponse, raise_not_found_if_absent
+from src.schemas import SearchHit
+from src.search import SEARCH, decode_key
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+def to_hit(row) -> SearchHit:
+    kind, id = decode_key(row.rowid)
+    return SearchHit(
+        kind=kind, id=id, score=row.score, title=row.title, snippet=row.snippet
+    )
+
+
+# GET /search/?q=login+error&kind=ticket&page=1&size=10
+@router.get("/", response_model=Page[SearchHit])
+async def search(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find"),
+    kind: Optional[Literal["ticket", "comment"]] = Query(None),
+    params: Params = Depends(),
+) -> ModelResponse:
+    LOG_APP.debug("Attempting to search: {}", q)
+    db: AsyncSession = request.state.db
+
+    hits = await paginate_with_total(
+        db,
+        SEARCH.search(q, kind),
+        params,
+        transformer=lambda rows: [to_hit(row) for row in rows],
+    )
+
+    raise_not_found_if_absent(hits.items, f"No results for: {q}")
+    LOG_APP.debug("Found {} results for: {}", hits.total, q)
+    return ModelResponse(hits)
@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Request, status
+from fastapi import APIRouter, Request, Response, status
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache import LOOKUPS, RESPONSES
 from src.models import Status
-from src.routers.utils import raise_not_found_if_absent
+from src.routers.utils import not_modified, raise_not_found_if_absent, update_by_id
 from src.backend.config import LOG_APP
 from src.schemas import StatusCreate, StatusRead, StatusUpdate
 
@@ -10,80 +14,99 @@ router = APIRouter(prefix="/statuses", tags=["Statuses"])
 
 @router.post("/", response_model=StatusRead, status_code=status.HTTP_201_CREATED)
 async def create_status(request: Request, data: StatusCreate) -> StatusRead:
-    LOG_APP.info(f"Attempting to create a status: {data.label}")
-    db = request.state.db
+    LOG_APP.debug("Attempting to create a status: {}", data.label)
+    db: AsyncSession = request.state.db
     status = Status(label=data.label)
 
     db.add(status)
-    db.commit()
-    db.refresh(status)
+    await db.commit()
+    LOOKUPS.invalidate(Status)
 
-    LOG_APP.info(f"Attempting to create a status: {data.label}")
+    LOG_APP.debug("Attempting to create a status: {}", data.label)
     status_read = StatusRead.model_validate(status)
-    LOG_APP.info(f"Status created successfully: {status_read.id} - {status_read.label}")
+    LOG_APP.info(
+        "Status created successfully: {} - {}", status_read.id, status_read.label
+    )
     return status_read
 
 
 @router.get("/{id}", response_model=StatusRead)
-async def get_status(request: Request, id: int) -> StatusRead:
-    LOG_APP.info(f"Attempting to get a status: {id}")
-    db = request.state.db
-    status = db.query(Status).filter(Status.id == id).first()
+async def get_status(
+    request: Request, response: Response, id: int
+) -> StatusRead | Response:
+    LOG_APP.debug("Attempting to get a status: {}", id)
+    db: AsyncSession = request.state.db
+    statuses = await LOOKUPS.get(db, Status)
+    status = statuses.rows.get(id)
 
     raise_not_found_if_absent(status, f"Status with ID {id} not found")
 
+    if (cached := not_modified(request, response, statuses.etag_of(id))) is not None:
+        LOG_APP.debug("Status not modified: {}", id)
+        return cached
+
     status_read = StatusRead.model_validate(status)
-    LOG_APP.info(
-        f"Status retrieved successfully: {status_read.id} - {status_read.label}"
+    LOG_APP.debug(
+        "Status retrieved successfully: {} - {}", status_read.id, status_read.label
     )
     return status_read
 
 
 @router.get("/", response_model=list[StatusRead])
-async def get_statuses(request: Request) -> list[StatusRead]:
-    LOG_APP.info("Attempting to get all statuses")
-    db = request.state.db
-    statuses = db.query(Status).all()
+async def get_statuses(
+    request: Request, response: Response
+) -> list[StatusRead] | Response:
+    LOG_APP.debug("Attempting to get all statuses")
+    db: AsyncSession = request.state.db
+    statuses = await LOOKUPS.get(db, Status)
+
+    raise_not_found_if_absent(statuses.rows, "No statuses found")
 
-    raise_not_found_if_absent(statuses, "No statuses found")
+    if (cached := not_modified(request, response, statuses.etag)) is not None:
+        LOG_APP.debug("Statuses not modified")
+        return cached
 
-    statuses_read = [StatusRead.model_validate(status) for status in statuses]
-    LOG_APP.info(f"Retrieved {len(statuses_read)} statuses from the database.")
+    statuses_read = statuses.read(StatusRead)
+    LOG_APP.debug("Retrieved {} statuses from the cache.", len(statuses_read))
     return statuses_read
 
 
 @router.put("/{id}", response_model=StatusRead)
 async def update_status(request: Request, id: int, data: StatusUpdate) -> StatusRead:
-    LOG_APP.info(f"Attempting to update a status: {id}")
-    db = request.state.db
-    status = db.query(Status).filter(Status.id == id).first()
-
-    raise_not_found_if_absent(status, f"Status with ID {id} not found")
-
+    LOG_APP.debug("Attempting to update a status: {}", id)
+    db: AsyncSession = request.state.db
     update_data = data.model_dump(exclude_unset=True)
     if not update_data:
-        LOG_APP.info(f"No update data provided for status: {id}")
+        status = await db.scalar(select(Status).filter(Status.id == id))
+        raise_not_found_if_absent(status, f"Status with ID {id} not found")
+        LOG_APP.info("No update data provided for status: {}", id)
         return StatusRead.model_validate(status)
 
-    status.label = data.label
-    db.commit()
-    db.refresh(status)
+    status = await update_by_id(db, Status, id, update_data)
+
+    raise_not_found_if_absent(status, f"Status with ID {id} not found")
+
+    await db.commit()
+    LOOKUPS.invalidate(Status)
+    await RESPONSES.invalidate(f"status:{id}")
 
     status_read = StatusRead.model_validate(status)
     LOG_APP.info(
-        f"Status updated  successfully: {status_read.id} - {status_read.label}"
+        "Status updated  successfully: {} - {}", status_read.id, status_read.label
     )
     return status_read
 
 
 @router.delete("/{id}")
 async def delete_status(request: Request, id: int) -> None:
-    LOG_APP.info(f"Attempting to delete a status: {id}")
-    db = request.state.db
-    status = db.query(Status).filter(Status.id == id).first()
+    LOG_APP.debug("Attempting to delete a status: {}", id)
+    db: AsyncSession = request.state.db
+    status = await db.scalar(select(Status).filter(Status.id == id))
 
     raise_not_found_if_absent(status, f"Status with ID {id} not found")
 
-    db.delete(status)
-    db.commit()
-    LOG_APP.info(f"Status with ID {id} deleted successfully")
+    await db.delete(status)
+    await db.commit()
+    LOOKUPS.invalidate(Status)
+    await RESPONSES.invalidate(f"status:{id}")
+    LOG_APP.info("Status with ID {} deleted successfully", id)
@@ -1,17 +1,60 @@
-from fastapi import APIRouter, Request, status
-from sqlalchemy.orm import Session
-from src.models import Ticket
-from src.backend.config import LOG_APP
-from src.routers.utils import raise_not_found_if_absent
-from src.schemas._ticket import TicketCreate, TicketRead, TicketUpdate
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Body, Depends, Request, Response, status
+from fastapi.responses import StreamingResponse
+from fastapi_pagination import Params, set_page
+from fastapi_pagination.links import Page
+from sqlalchemy import insert, select
+from sqlalchemy import update as sql_update
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models import Category, Level, Project, Status, Ticket, User
+from src.backend.config import BULK_MAX_ITEMS, LOG_APP
+from src.cache import LOOKUPS, RESPONSES
+from src.routers.filters import TicketFilterParams
+from src.routers.pagination import (
+    CursorPage,
+    CursorParams,
+    paginate_by_cursor,
+    paginate_with_total,
+)
+from src.routers.projection import ProjectionParams
+from src.search import SEARCH
+from src.routers.utils import (
+    ModelResponse,
+    find_missing_references,
+    raise_not_found_if_absent,
+    select_read,
+    stream_ndjson,
+    update_by_id,
+    validate,
+    validate_all,
+)
+from src.schemas import BulkItemResult, BulkResult
+from src.schemas._ticket import (
+    TicketBulkUpdate,
+    TicketCreate,
+    TicketRead,
+    TicketReadLight,
+    TicketUpdate,
+)
 
 router = APIRouter(prefix="/tickets", tags=["Tickets"])
 
+REFERENCES: dict[str, type[Any]] = {
+    "creator_id": User,
+    "project_id": Project,
+    "status_id": Status,
+    "category_id": Category,
+    "level_id": Level,
+}
+# The fields copied into the search index
+SEARCHED_FIELDS = {"title", "description"}
+
 
 @router.post("/", response_model=TicketRead, status_code=status.HTTP_201_CREATED)
-async def create(request: Request, data: TicketCreate) -> TicketRead:
-    LOG_APP.info(f"Attempting to create a ticket {data.title}")
-    db: Session = request.state.db
+async def create(request: Request, data: TicketCreate) -> ModelResponse:
+    LOG_APP.debug("Attempting to create a ticket {}", data.title)
+    db: AsyncSession = request.state.db
 
     ticket = Ticket(
         title=data.title,
@@ -23,76 +66,248 @@ async def create(request: Request, data: TicketCreate) -> TicketRead:
         level_id=data.level_id,
     )
     db.add(ticket)
-    db.commit()
-    db.refresh(ticket)
+    await db.flush()
+    await SEARCH.index(db, Ticket, [ticket.id])
+    await db.commit()
+    await RESPONSES.invalidate(
+        f"project:{ticket.project_id}", f"user:{ticket.creator_id}"
+    )
+
+    ticket_read = await validate(db, TicketRead, ticket)
+    LOG_APP.info(
+        "Ticket created successfully: {} - {}", ticket_read.id, ticket_read.title
+    )
+    return ModelResponse(ticket_read, status_code=status.HTTP_201_CREATED)
 
-    ticket_read = TicketRead.model_validate(ticket)
-    LOG_APP.info(f"Ticket created successfully: {ticket_read.id} - {ticket_read.title}")
-    return ticket_read
 
+@router.post("/bulk", response_model=BulkResult, status_code=status.HTTP_201_CREATED)
+async def create_bulk(
+    request: Request,
+    data: Annotated[list[TicketCreate], Body(min_length=1, max_length=BULK_MAX_ITEMS)],
+) -> ModelResponse:
+    """Create many tickets with multi-row INSERT ... RETURNING, in one transaction.
 
-@router.get("/{id}", response_model=TicketRead)
-async def get(request: Request, id: int) -> TicketRead:
-    LOG_APP.info(f"Attempting to get a ticket: {id}")
-    db: Session = request.state.db
-    ticket = db.query(Ticket).filter(Ticket.id == id).first()
+    Items referencing a missing row are reported, and skipped, individually.
+    """
+    LOG_APP.debug("Attempting to create {} tickets", len(data))
+    db: AsyncSession = request.state.db
 
-    raise_not_found_if_absent(ticket, f"Ticket with ID {id} not found")
+    errors = await find_missing_references(db, data, REFERENCES)
+    valid = [item for item, error in zip(data, errors) if error is None]
 
-    ticket_read = TicketRead.model_validate(ticket)
-    LOG_APP.info(
-        f"Ticket retrieved successfully: {ticket_read.id} - {ticket_read.title}"
+    ids = []
+    if valid:
+        # Rows inserted by one statement get increasing ids, in the order of
+        # the parameters: sorting the ids is enough to match them back.
+        # (sort_by_parameter_order would make SQLite insert row by row.)
+        ids = sorted(
+            await db.scalars(
+                insert(Ticket).returning(Ticket.id),
+                [item.model_dump() for item in valid],
+            )
+        )
+        await SEARCH.index(db, Ticket, ids)
+        await db.commit()
+        await RESPONSES.invalidate(
+            *{f"project:{item.project_id}" for item in valid},
+            *{f"user:{item.creator_id}" for item in valid},
+        )
+
+    created = iter(ids)
+    results = [
+        BulkItemResult(index=index, error=error)
+        if error
+        else BulkItemResult(index=index, id=next(created))
+        for index, error in enumerate(errors)
+    ]
+    LOG_APP.info("Tickets created: {}, failed: {}", len(ids), len(data) - len(ids))
+    return ModelResponse(
+        BulkResult(succeeded=len(ids), failed=len(data) - len(ids), items=results),
+        status_code=status.HTTP_201_CREATED,
     )
-    return ticket_read
 
 
-@router.get("/", response_model=list[TicketRead])
-async def get_all(request: Request) -> list[TicketRead]:
-    LOG_APP.info("Attempting to get all tickets")
-    db: Session = request.state.db
+@router.patch("/bulk", response_model=BulkResult)
+async def update_bulk(
+    request: Request,
+    data: Annotated[
+        list[TicketBulkUpdate], Body(min_length=1, max_length=BULK_MAX_ITEMS)
+    ],
+) -> ModelResponse:
+    """Update many tickets, typically their status, in one transaction.
 
-    tickets = db.query(Ticket).all()
+    Items are grouped by the set of fields they change, each group being a
+    single executemany UPDATE. Unknown tickets and missing references are
+    reported, and skipped, individually.
+    """
+    LOG_APP.debug("Attempting to update {} tickets", len(data))
+    db: AsyncSession = request.state.db
+
+    ids = {item.id for item in data}
+    existing = set(await db.scalars(select(Ticket.id).filter(Ticket.id.in_(ids))))
+    errors = [
+        None if item.id in existing else f"Ticket with ID {item.id} not found"
+        for item in data
+    ]
+    references = {
+        field: REFERENCES[field] for field in ("status_id", "category_id", "level_id")
+    }
+    missing = await find_missing_references(db, data, references)
+    errors = [error or reference for error, reference in zip(errors, missing)]
+    valid = [item for item, error in zip(data, errors) if error is None]
+
+    rows = [item.model_dump(exclude_unset=True) | {"id": item.id} for item in valid]
+    rows = [row for row in rows if len(row) > 1]
+    if rows:
+        await db.execute(sql_update(Ticket), rows)
+        await SEARCH.index(
+            db, Ticket, [row["id"] for row in rows if SEARCHED_FIELDS & row.keys()]
+        )
+        await db.commit()
+        await RESPONSES.invalidate(*{f"ticket:{row['id']}" for row in rows})
+
+    results = [
+        BulkItemResult(index=index, id=item.id, error=error)
+        for index, (item, error) in enumerate(zip(data, errors))
+    ]
+    LOG_APP.info("Tickets updated: {}, failed: {}", len(valid), len(data) - len(valid))
+    return ModelResponse(
+        BulkResult(succeeded=len(valid), failed=len(data) - len(valid), items=results)
+    )
+
+
+# GET /tickets/cursor?size=10&after=<next_cursor>
+# Declared before "/{id}" so that "cursor" is not parsed as an ID.
+@router.get("/cursor", response_model=CursorPage[TicketRead])
+async def get_all_by_cursor(
+    request: Request, params: CursorParams = Depends()
+) -> ModelResponse:
+    LOG_APP.debug("Attempting to get tickets with cursor pagination")
+    db: AsyncSession = request.state.db
+
+    tickets, next_cursor, previous_cursor = await paginate_by_cursor(
+        db,
+        select_read(Ticket, TicketRead),
+        (Ticket.creation_date, Ticket.id),
+        params,
+    )
 
     raise_not_found_if_absent(tickets, "No tickets found")
 
-    tickets_read = [TicketRead.model_validate(ticket) for ticket in tickets]
-    LOG_APP.info(f"Retrieved {len(tickets_read)} tickets from the database.")
-    return tickets_read
+    tickets_read = await validate_all(db, TicketRead, tickets)
+    LOG_APP.debug("Retrieved {} tickets with cursor pagination.", len(tickets_read))
+
+    return ModelResponse(
+        CursorPage[TicketRead](
+            items=tickets_read,
+            size=params.size,
+            next_cursor=next_cursor,
+            previous_cursor=previous_cursor,
+        )
+    )
 
 
-@router.put("/{id}", response_model=TicketRead)
-async def update(request: Request, id: int, data: TicketUpdate) -> TicketRead:
-    LOG_APP.info(f"Attempting to update a ticket: {id}")
-    db: Session = request.state.db
-    ticket = db.query(Ticket).filter(Ticket.id == id).first()
+# GET /tickets/export -> one TicketRead per line (NDJSON), streamed in chunks
+@router.get("/export", response_class=StreamingResponse)
+async def export(request: Request) -> StreamingResponse:
+    LOG_APP.debug("Attempting to export all tickets")
+    db: AsyncSession = request.state.db
+
+    return StreamingResponse(
+        stream_ndjson(
+            db, select_read(Ticket, TicketRead).order_by(Ticket.id), TicketRead
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/{id}", response_model=TicketRead)
+async def get(
+    request: Request, id: int, projection: ProjectionParams = Depends()
+) -> TicketRead | Response:
+    LOG_APP.debug("Attempting to get a ticket: {}", id)
+    if (cached := await RESPONSES.fetch(request)) is not None:
+        LOG_APP.debug("Ticket retrieved from the cache: {}", id)
+        return cached
+
+    db: AsyncSession = request.state.db
+    query, schema = projection.select(Ticket, TicketRead, TicketReadLight)
+    ticket = await db.scalar(query.filter(Ticket.id == id))
 
     raise_not_found_if_absent(ticket, f"Ticket with ID {id} not found")
 
+    ticket_read = await validate(db, schema, ticket)
+    LOG_APP.debug("Ticket retrieved successfully: {}", id)
+    return await RESPONSES.store(request, ticket_read)
+
+
+# GET /tickets/?page=1&size=10&fields=id,title
+# GET /tickets/?project_id=1&status_id=2&sort=-creation_date
+@router.get("/", response_model=Page[TicketRead])
+async def get_all(
+    request: Request,
+    params: Params = Depends(),
+    projection: ProjectionParams = Depends(),
+    filters: TicketFilterParams = Depends(),
+) -> ModelResponse:
+    LOG_APP.debug("Attempting to get tickets with pagination")
+    db: AsyncSession = request.state.db
+    query, schema = projection.select(Ticket, TicketRead, TicketReadLight)
+
+    await LOOKUPS.warm(db)
+    with set_page(Page[schema]):  # type: ignore[valid-type]
+        tickets_read = await paginate_with_total(
+            db,
+            filters.order_by(filters.filter(query)),
+            params,
+            transformer=lambda items: [schema.model_validate(item) for item in items],
+        )
+
+    raise_not_found_if_absent(tickets_read.items, "No tickets found")
+    LOG_APP.debug("Retrieved {} tickets with pagination.", len(tickets_read.items))
+
+    return projection.response(tickets_read)
+
+
+@router.put("/{id}", response_model=TicketRead)
+async def update(request: Request, id: int, data: TicketUpdate) -> ModelResponse:
+    LOG_APP.debug("Attempting to update a ticket: {}", id)
+    db: AsyncSession = request.state.db
     update_data = data.model_dump(exclude_unset=True)
 
     if not update_data:
-        LOG_APP.info(f"No update data provided for ticket: {id}")
-        return TicketRead.model_validate(ticket)
+        ticket = await db.scalar(
+            select_read(Ticket, TicketRead).filter(Ticket.id == id)
+        )
+        raise_not_found_if_absent(ticket, f"Ticket with ID {id} not found")
+        LOG_APP.info("No update data provided for ticket: {}", id)
+        return ModelResponse(await validate(db, TicketRead, ticket))
 
-    for key, value in update_data.items():
-        setattr(ticket, key, value)
+    ticket = await update_by_id(db, Ticket, id, update_data, TicketRead)
 
-    db.commit()
-    db.refresh(ticket)
+    raise_not_found_if_absent(ticket, f"Ticket with ID {id} not found")
 
-    ticket_read = TicketRead.model_validate(ticket)
-    LOG_APP.info(f"Ticket updated successfully: {ticket_read.id} - {ticket_read.title}")
-    return ticket_read
+    if SEARCHED_FIELDS & update_data.keys():
+        await SEARCH.index(db, Ticket, [id])
+    await db.commit()
+    await RESPONSES.invalidate(f"ticket:{id}")
+    ticket_read = await validate(db, TicketRead, ticket)
+    LOG_APP.info(
+        "Ticket updated successfully: {} - {}", ticket_read.id, ticket_read.title
+    )
+    return ModelResponse(ticket_read)
 
 
 @router.delete("/{id}")
 async def delete(request: Request, id: int) -> None:
-    LOG_APP.info(f"Attempting to delete a ticket: {id}")
-    db: Session = request.state.db
-    ticket = db.query(Ticket).filter(Ticket.id == id).first()
+    LOG_APP.debug("Attempting to delete a ticket: {}", id)
+    db: AsyncSession = request.state.db
+    ticket = await db.scalar(select(Ticket).filter(Ticket.id == id))
 
     raise_not_found_if_absent(ticket, f"Ticket with ID {id} not found")
 
-    db.delete(ticket)
-    db.commit()
-    LOG_APP.info(f"Ticket with ID {id} deleted successfully")
+    await SEARCH.remove_tickets(db, select(Ticket.id).filter(Ticket.id == id))
+    await db.delete(ticket)
+    await db.commit()
+    await RESPONSES.invalidate(f"ticket:{id}")
+    LOG_APP.info("Ticket with ID {} deleted successfully", id)
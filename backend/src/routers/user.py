@@ -1,25 +1,43 @@
-from fastapi import APIRouter, Request, status, Depends
-from fastapi_pagination import Params
+from fastapi import APIRouter, Request, Response, status, Depends
+from fastapi_pagination import Params, set_page
 from fastapi_pagination.links.default import Page
 
-from fastapi_pagination.ext.sqlalchemy import paginate
 
-from src.routers.pagination import PageResponse
+from src.routers.pagination import (
+    CursorPage,
+    CursorParams,
+    PageResponse,
+    paginate_by_cursor,
+    paginate_with_total,
+)
+from src.routers.projection import ProjectionParams
 from sqlalchemy.future import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models import User
+from src.models import Comment, Project, Ticket, User
 from src.backend.config import LOG_APP
-
-from src.routers.utils import raise_not_found_if_absent
-from src.schemas._user import UserCreate, UserRead, UserUpdate
+from src.cache import LOOKUPS, PRINCIPALS, RESPONSES
+from src.passwords import hash_password_async
+from src.jobs import JOBS, PURGES
+from src.search import SEARCH
+from src.routers.utils import (
+    ModelResponse,
+    raise_not_found_if_absent,
+    select_read,
+    update_by_id,
+    validate,
+    validate_all,
+)
+from src.schemas import JobRead
+from src.schemas._user import UserCreate, UserRead, UserReadLight, UserUpdate
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.post("/", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-async def create(request: Request, data: UserCreate) -> UserRead:
-    LOG_APP.info(f"Attempting to create a user {data.username}")
-    db = request.state.db
+async def create(request: Request, data: UserCreate) -> ModelResponse:
+    LOG_APP.debug("Attempting to create a user {}", data.username)
+    db: AsyncSession = request.state.db
 
     user = User(
         first_name=data.first_name,
@@ -27,78 +45,156 @@ async def create(request: Request, data: UserCreate) -> UserRead:
         username=data.username,
         email=data.email,
         role=data.role,
-        plain_password=data.password,
     )
+    await user.set_password(data.password)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
 
-    user_read = UserRead.model_validate(user)
-    LOG_APP.info(f"Comment created successfully: {user_read.id} - {user_read.username}")
-    return user_read
+    user_read = await validate(db, UserRead, user)
+    LOG_APP.info(
+        "Comment created successfully: {} - {}", user_read.id, user_read.username
+    )
+    return ModelResponse(user_read, status_code=status.HTTP_201_CREATED)
 
 
-@router.get("/{id}", response_model=UserRead)
-async def get(request: Request, id: int) -> UserRead:
-    LOG_APP.info(f"Attempting to get a user: {id}")
-    db = request.state.db
-    user = db.query(User).filter(User.id == id).first()
-    raise_not_found_if_absent(user, f"User with ID {id} not found")
+# GET /users/cursor?size=10&after=<next_cursor>
+# Declared before "/{id}" so that "cursor" is not parsed as an ID.
+@router.get("/cursor", response_model=CursorPage[UserRead])
+async def get_all_by_cursor(
+    request: Request, params: CursorParams = Depends()
+) -> ModelResponse:
+    LOG_APP.debug("Attempting to get users with cursor pagination")
+    db: AsyncSession = request.state.db
 
-    user_read = UserRead.model_validate(user)
-    LOG_APP.info(f"User retrieved successfully: {user_read.id} - {user_read.username}")
-    return user_read
+    users, next_cursor, previous_cursor = await paginate_by_cursor(
+        db, select_read(User, UserRead), (User.id,), params
+    )
 
+    raise_not_found_if_absent(users, "No users found")
 
-@router.get("/", response_model=Page[UserRead])
-async def get_all(request: Request, params: Params = Depends()) -> Page[UserRead]:
-    LOG_APP.info("Attempting to get users with pagination")
-    db = request.state.db
+    users_read = await validate_all(db, UserRead, users)
+    LOG_APP.debug("Retrieved {} users with cursor pagination.", len(users_read))
 
-    users = await paginate(db, select(User), params)
+    return ModelResponse(
+        CursorPage[UserRead](
+            items=users_read,
+            size=params.size,
+            next_cursor=next_cursor,
+            previous_cursor=previous_cursor,
+        )
+    )
 
-    raise_not_found_if_absent(users.items, "No users found")
 
-    users_read = [UserRead.model_validate(user) for user in users.items]
-    LOG_APP.info(
-        f"Retrieved {len(users_read)} users from the database with pagination."
-    )
+@router.get("/{id}", response_model=UserRead)
+async def get(
+    request: Request, id: int, projection: ProjectionParams = Depends()
+) -> UserRead | Response:
+    LOG_APP.debug("Attempting to get a user: {}", id)
+    if (cached := await RESPONSES.fetch(request)) is not None:
+        LOG_APP.debug("User retrieved from the cache: {}", id)
+        return cached
+
+    db: AsyncSession = request.state.db
+    query, schema = projection.select(User, UserRead, UserReadLight)
+    user = await db.scalar(query.filter(User.id == id))
 
-    return Page[UserRead].create(users_read, params, total=users.total)
+    raise_not_found_if_absent(user, f"User with ID {id} not found")
 
+    user_read = await validate(db, schema, user)
+    LOG_APP.debug("User retrieved successfully: {}", id)
+    return await RESPONSES.store(request, user_read)
 
-@router.put("/{id}", response_model=UserRead)
-async def update(request: Request, id: int, data: UserUpdate) -> UserRead:
-    LOG_APP.info(f"Attempting to update a user: {id}")
-    db = request.state.db
-    user = db.query(User).filter(User.id == id).first()
 
-    raise_not_found_if_absent(user, f"User with ID {id} not found")
+# GET /users/?page=1&size=10&fields=id,username
+@router.get("/", response_model=Page[UserRead])
+async def get_all(
+    request: Request,
+    params: Params = Depends(),
+    projection: ProjectionParams = Depends(),
+) -> ModelResponse:
+    LOG_APP.debug("Attempting to get users with pagination")
+    db: AsyncSession = request.state.db
+    query, schema = projection.select(User, UserRead, UserReadLight)
+
+    await LOOKUPS.warm(db)
+    with set_page(Page[schema]):  # type: ignore[valid-type]
+        users_read = await paginate_with_total(
+            db,
+            query.order_by(User.id),
+            params,
+            transformer=lambda items: [schema.model_validate(item) for item in items],
+        )
+
+    raise_not_found_if_absent(users_read.items, "No users found")
+    LOG_APP.debug("Retrieved {} users with pagination.", len(users_read.items))
+
+    return projection.response(users_read)
+
 
+@router.put("/{id}", response_model=UserRead)
+async def update(request: Request, id: int, data: UserUpdate) -> ModelResponse:
+    LOG_APP.debug("Attempting to update a user: {}", id)
+    db: AsyncSession = request.state.db
     update_data = data.model_dump(exclude_unset=True)
     if not update_data:
-        LOG_APP.info(f"No update data provided for user: {id}")
-        return UserRead.model_validate(user)
-
-    for key, value in update_data.items():
-        setattr(user, key, value)
-
-    db.commit()
-    db.refresh(user)
+        user = await db.scalar(select_read(User, UserRead).filter(User.id == id))
+        raise_not_found_if_absent(user, f"User with ID {id} not found")
+        LOG_APP.info("No update data provided for user: {}", id)
+        return ModelResponse(await validate(db, UserRead, user))
 
-    user_read = UserRead.model_validate(user)
-    LOG_APP.info(f"User updated successfully: {user_read.id} - {user_read.username}")
-    return user_read
+    if "password" in update_data:
+        update_data["_password"] = await hash_password_async(
+            update_data.pop("password")
+        )
+    user = await update_by_id(db, User, id, update_data, UserRead)
 
+    raise_not_found_if_absent(user, f"User with ID {id} not found")
 
-@router.delete("/{id}")
-async def delete(request: Request, id: int) -> None:
-    LOG_APP.info(f"Attempting to delete a user: {id}")
-    db = request.state.db
-    user = db.query(User).filter(User.id == id).first()
+    await db.commit()
+    await RESPONSES.invalidate(f"user:{id}")
+    PRINCIPALS.invalidate(id)
+    user_read = await validate(db, UserRead, user)
+    LOG_APP.info("User updated successfully: {} - {}", user_read.id, user_read.username)
+    return ModelResponse(user_read)
+
+
+# DELETE /users/1?background=true -> 202 and the job deleting the user
+@router.delete(
+    "/{id}",
+    response_model=None,
+    responses={status.HTTP_202_ACCEPTED: {"model": JobRead}},
+)
+async def delete(
+    request: Request, id: int, background: bool = False
+) -> ModelResponse | None:
+    LOG_APP.debug("Attempting to delete a user: {}", id)
+    db: AsyncSession = request.state.db
+    user = await db.scalar(select(User).filter(User.id == id))
 
     raise_not_found_if_absent(user, f"User with ID {id} not found")
 
-    db.delete(user)
-    db.commit()
-    LOG_APP.info(f"User with ID {id} deleted successfully")
+    if background:
+        job = await JOBS.submit(db, "delete_user", id)
+        LOG_APP.info("User with ID {} queued for deletion: job {}", id, job.id)
+        return ModelResponse(
+            JobRead.model_validate(job),
+            status_code=status.HTTP_202_ACCEPTED,
+            headers={"Location": f"/jobs/{job.id}"},
+        )
+
+    projects = select(Project.id).filter(Project.creator_id == id)
+    await SEARCH.remove_tickets(
+        db,
+        select(Ticket.id).filter(
+            (Ticket.creator_id == id) | Ticket.project_id.in_(projects)
+        ),
+    )
+    comments = select(Comment.id).filter(Comment.creator_id == id)
+    await SEARCH.remove(db, Comment, comments)
+    tags = await PURGES["delete_user"].dependent_tags(db, id)
+    await db.delete(user)
+    await db.commit()
+    await RESPONSES.invalidate(f"user:{id}", *tags)
+    PRINCIPALS.invalidate(id)
+    LOG_APP.info("User with ID {} deleted successfully", id)
+    return None
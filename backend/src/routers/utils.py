@@ -1,9 +1,237 @@
+from typing import Any, AsyncIterator, Collection, Sequence, TypeVar
+
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy import Select, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.strategy_options import _AbstractLoad
+
+from src.cache import LOOKUPS
 from src.exceptions import NotFoundException
+from src.metrics import measure_serialization
 
 from src.backend.config import LOG_APP
 
+T = TypeVar("T", bound=BaseModel)
+
 
 def raise_not_found_if_absent(item: object, message: str):
     if not item:
         LOG_APP.warning(message)
         raise NotFoundException(message)
+
+
+class ModelResponse(JSONResponse):
+    """JSON response serialized straight to bytes by pydantic-core.
+
+    A route returning a model lets FastAPI validate it again against the
+    ``response_model``, dump it to Python objects, then encode these with
+    ``json.dumps``. The handlers have already validated their Read schemas
+    from the ORM objects: returning them wrapped in this response skips the
+    second validation, and the model is serialized in a single pass. The
+    ``response_model`` of the route still documents the schema.
+
+    As the default response class of the app, it also encodes the content of
+    the routes returning plain models or dicts.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with measure_serialization():
+            return to_json(content)
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Response | None:
+    """Tag `response` with `etag`, and return a 304 if the client already has it.
+
+    Parameters
+    ----------
+    request : Request
+        The request, whose ``If-None-Match`` header is compared to `etag`.
+    response : Response
+        The response the route will return, to which the header is added.
+    etag : str
+        The quoted ETag of the resource.
+    """
+    response.headers["ETag"] = etag
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return None
+
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in tags or "*" in tags:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    return None
+
+
+async def find_missing_references(
+    db: AsyncSession, items: Sequence[BaseModel], references: dict[str, type[Any]]
+) -> list[str | None]:
+    """Check the foreign keys of a batch of items with one query per table.
+
+    Parameters
+    ----------
+    db : AsyncSession
+        The session used to query the referenced tables.
+    items : Sequence[BaseModel]
+        The items to check, whose unset (None) foreign keys are ignored.
+    references : dict[str, type[Any]]
+        The model referenced by each foreign key field of the items.
+
+    Returns
+    -------
+    list[str | None]
+        For each item, the error about its first missing reference, if any.
+    """
+    existing = {}
+    for field, model in references.items():
+        ids = {getattr(item, field) for item in items} - {None}
+        existing[field] = (
+            set(await db.scalars(select(model.id).filter(model.id.in_(ids))))
+            if ids
+            else set()
+        )
+
+    errors = []
+    for item in items:
+        missing = [
+            f"{model.__name__} with ID {getattr(item, field)} not found"
+            for field, model in references.items()
+            if getattr(item, field) not in existing[field] | {None}
+        ]
+        errors.append(missing[0] if missing else None)
+    return errors
+
+
+async def validate(db: AsyncSession, schema: type[T], item: object) -> T:
+    """Validate an ORM object against a schema inside the session's greenlet.
+
+    Nested relationships of the Read schemas are loaded lazily; running the
+    validation through ``run_sync`` lets these loads be awaited instead of
+    raising ``MissingGreenlet``. The lookup tables are loaded beforehand, so
+    the statuses, levels and categories of tickets come from the cache.
+    """
+    await LOOKUPS.warm(db)
+    return await db.run_sync(lambda _: schema.model_validate(item))
+
+
+async def validate_all(
+    db: AsyncSession, schema: type[T], items: Sequence[object]
+) -> list[T]:
+    """Validate a sequence of ORM objects in a single ``run_sync`` call."""
+    await LOOKUPS.warm(db)
+    return await db.run_sync(lambda _: [schema.model_validate(item) for item in items])
+
+
+async def stream_ndjson(
+    db: AsyncSession, query: Select, schema: type[BaseModel], yield_per: int = 500
+) -> AsyncIterator[bytes]:
+    """Serialize the rows of a query as newline-delimited JSON, chunk by chunk.
+
+    Rows are fetched ``yield_per`` at a time and expunged from the session
+    once written, so memory stays bounded whatever the size of the table.
+    """
+    await LOOKUPS.warm(db)
+    result = await db.stream_scalars(query.execution_options(yield_per=yield_per))
+    async for items in result.partitions():
+        chunk = await db.run_sync(
+            lambda _: "".join(
+                f"{schema.model_validate(item).model_dump_json()}\n" for item in items
+            )
+        )
+        for item in items:
+            db.expunge(item)
+        yield chunk.encode()
+
+
+async def update_by_id(
+    db: AsyncSession,
+    model: type[Any],
+    id: int,
+    values: dict[str, Any],
+    schema: type[BaseModel] | None = None,
+) -> Any | None:
+    """Update the row `id` of `model` in a single UPDATE ... RETURNING.
+
+    Loading the object, assigning its attributes and flushing costs a SELECT
+    (and the eager loads of the Read schema) before the UPDATE; here, the
+    UPDATE alone tells whether the row exists, and returns it. The
+    relationships `schema` serializes are loaded by their own SELECT, see
+    :func:`returning_options`, the row itself is not selected again. On
+    engines without UPDATE ... RETURNING, the row count answers the first
+    question, and a SELECT by primary key the second.
+
+    Parameters
+    ----------
+    db : AsyncSession
+        The session in which the UPDATE runs; it is not committed.
+    model : type[Any]
+        The model to update.
+    id : int
+        The primary key of the row.
+    values : dict[str, Any]
+        The new value of each changed attribute.
+    schema : type[BaseModel] | None
+        The Read schema the updated object is validated against, if it
+        serializes relationships.
+
+    Returns
+    -------
+    Any | None
+        The updated object, refreshed in the session, or None if there is no
+        row `id`.
+    """
+    statement = update(model).filter(model.id == id).values(values)
+    if db.get_bind().dialect.update_returning:
+        return await db.scalar(
+            statement.returning(model)
+            .options(*returning_options(schema))
+            .execution_options(populate_existing=True)
+        )
+
+    result = await db.execute(statement)
+    if result.rowcount == 0:
+        return None
+    query = select(model) if schema is None else select_read(model, schema)
+    return await db.scalar(
+        query.filter(model.id == id).execution_options(populate_existing=True)
+    )
+
+
+def returning_options(schema: type[BaseModel] | None) -> list[_AbstractLoad]:
+    """Return the loader options of `schema` that an UPDATE ... RETURNING takes.
+
+    A joined eager load needs a SELECT to join to: the Read schemas loading a
+    relationship that way declare ``returning_options`` too, which load it by
+    a select IN instead. The ``loader_options`` of the others apply as is.
+    """
+    options = getattr(schema, "returning_options", None)
+    if options is None:
+        options = getattr(schema, "loader_options", {})
+    return list(options.values())
+
+
+def select_read(
+    model: type[Any], schema: type[BaseModel], fields: Collection[str] | None = None
+) -> Select:
+    """Select `model` with the loader options declared by its Read `schema`.
+
+    The options eagerly load every relationship the schema serializes, so
+    validating the result does not trigger one lazy load per row. When
+    `fields` is given, only these columns and relationships are loaded.
+    """
+    options = getattr(schema, "loader_options", {})
+    if fields is None:
+        return select(model).options(*options.values())
+
+    columns = [
+        getattr(model, name) for name in fields if name in inspect(model).column_attrs
+    ]
+    return select(model).options(
+        load_only(model.id, *columns),
+        *(options[name] for name in fields if name in options),
+    )
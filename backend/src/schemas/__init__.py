@@ -1,5 +1,6 @@
 from src.utils import reassign_module_names
 
+from ._bulk import BulkItemResult, BulkResult
 from ._level import LevelCreate, LevelRead, LevelUpdate
 from ._category import CategoryCreate, CategoryRead, CategoryUpdate
 from ._status import StatusCreate, StatusRead, StatusUpdate
@@ -10,8 +11,16 @@ from ._comment import (
     CommentUpdate,
 )
 from ._user import UserCreate, UserRead, UserReadLight, UserUpdate
+from ._job import JobRead
 from ._project import ProjectCreate, ProjectRead, ProjectReadLight, ProjectUpdate
-from ._ticket import TicketCreate, TicketRead, TicketReadLight, TicketUpdate
+from ._search import SearchHit
+from ._ticket import (
+    TicketBulkUpdate,
+    TicketCreate,
+    TicketRead,
+    TicketReadLight,
+    TicketUpdate,
+)
 
 LevelRead.model_rebuild()
 CategoryRead.model_rebuild()
@@ -22,6 +31,8 @@ ProjectRead.model_rebuild()
 TicketRead.model_rebuild()
 
 __all__ = [
+    "BulkItemResult",
+    "BulkResult",
     "LevelCreate",
     "LevelRead",
     "LevelUpdate",
@@ -35,10 +46,13 @@ __all__ = [
     "CommentRead",
     "CommentReadLight",
     "CommentUpdate",
+    "JobRead",
     "ProjectCreate",
     "ProjectRead",
     "ProjectReadLight",
     "ProjectUpdate",
+    "SearchHit",
+    "TicketBulkUpdate",
     "TicketCreate",
     "TicketRead",
     "TicketReadLight",
@@ -1,7 +1,13 @@
 from __future__ import annotations
 from datetime import date
+from typing import ClassVar
 
 from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.strategy_options import _AbstractLoad
+
+from src.models import Comment
+from src.schemas._ticket import TicketReadLight
 
 
 class CommentBase(BaseModel):
@@ -25,6 +31,19 @@ class CommentRead(CommentReadLight):
     ticket: TicketReadLight
 
     model_config = ConfigDict(from_attributes=True)
+    loader_options: ClassVar[dict[str, _AbstractLoad]] = {
+        "creator": joinedload(Comment.creator),
+        "ticket": joinedload(Comment.ticket).options(
+            *TicketReadLight.loader_options.values()
+        ),
+    }
+    # An UPDATE ... RETURNING has no SELECT to join the relationships to
+    returning_options: ClassVar[dict[str, _AbstractLoad]] = {
+        "creator": selectinload(Comment.creator),
+        "ticket": selectinload(Comment.ticket).options(
+            *TicketReadLight.loader_options.values()
+        ),
+    }
 
 
 class CommentUpdate(BaseModel):
@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class JobRead(BaseModel):
+    id: int
+    kind: str
+    target_id: int
+    status: Literal["pending", "running", "done", "failed"]
+    total: int
+    done: int
+    error: Optional[str] = None
+    creation_date: datetime
+    update_date: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,8 +1,13 @@
 from __future__ import annotations
 from datetime import date
-from typing import Optional
+from typing import ClassVar, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.strategy_options import _AbstractLoad
+
+from src.models import Project
+from src.schemas._ticket import TicketReadLight
 
 
 class ProjectBase(BaseModel):
@@ -27,6 +32,17 @@ class ProjectRead(ProjectReadLight):
     tickets: Optional[list[TicketReadLight]] = None
 
     model_config = ConfigDict(from_attributes=True)
+    loader_options: ClassVar[dict[str, _AbstractLoad]] = {
+        "creator": joinedload(Project.creator),
+        "tickets": selectinload(Project.tickets).options(
+            *TicketReadLight.loader_options.values()
+        ),
+    }
+    # An UPDATE ... RETURNING has no SELECT to join the relationships to
+    returning_options: ClassVar[dict[str, _AbstractLoad]] = {
+        **loader_options,
+        "creator": selectinload(Project.creator),
+    }
 
 
 class ProjectUpdate(BaseModel):
@@ -0,0 +1,11 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    kind: Literal["ticket", "comment"]
+    id: int
+    score: float
+    title: Optional[str] = None
+    snippet: str
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Optional
+from typing import Any, ClassVar, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from sqlalchemy.orm import joinedload, selectinload, undefer
+from sqlalchemy.orm.strategy_options import _AbstractLoad
+
+from src.cache import LOOKUPS
+from src.models import Ticket
 
 
 class TicketBase(BaseModel):
@@ -28,6 +33,20 @@ class TicketReadLight(TicketBase):
     update_date: Optional[date] = None
 
     model_config = ConfigDict(from_attributes=True)
+    # Statuses, levels and categories are served by the lookup cache: only
+    # their foreign keys are loaded.
+    loader_options: ClassVar[dict[str, _AbstractLoad]] = {
+        "status": undefer(Ticket.status_id),
+        "level": undefer(Ticket.level_id),
+        "category": undefer(Ticket.category_id),
+    }
+
+    @model_validator(mode="before")
+    @classmethod
+    def resolve_lookups(cls, data: Any) -> Any:
+        if isinstance(data, Ticket):
+            return LOOKUPS.resolve(data, ("status", "level", "category"))
+        return data
 
 
 class TicketRead(TicketReadLight):
@@ -36,6 +55,18 @@ class TicketRead(TicketReadLight):
     comments: Optional[list[CommentReadLight]] = None
 
     model_config = ConfigDict(from_attributes=True)
+    loader_options: ClassVar[dict[str, _AbstractLoad]] = {
+        **TicketReadLight.loader_options,
+        "creator": joinedload(Ticket.creator),
+        "project": joinedload(Ticket.project),
+        "comments": selectinload(Ticket.comments),
+    }
+    # An UPDATE ... RETURNING has no SELECT to join the relationships to
+    returning_options: ClassVar[dict[str, _AbstractLoad]] = {
+        **loader_options,
+        "creator": selectinload(Ticket.creator),
+        "project": selectinload(Ticket.project),
+    }
 
 
 class TicketUpdate(BaseModel):
@@ -44,3 +75,7 @@ class TicketUpdate(BaseModel):
     status_id: Optional[int] = None
     category_id: Optional[int] = None
     level_id: Optional[int] = None
+
+
+class TicketBulkUpdate(TicketUpdate):
+    id: int
@@ -1,7 +1,14 @@
 from __future__ import annotations
-from typing import Optional
+from typing import ClassVar, Optional
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.strategy_options import _AbstractLoad
+
+from src.models import User
+from src.schemas._comment import CommentRead
+from src.schemas._project import ProjectRead
+from src.schemas._ticket import TicketRead
 
 
 class UserBase(BaseModel):
@@ -28,6 +35,17 @@ class UserRead(UserReadLight):
     projects: Optional[list[ProjectRead]] = None
 
     model_config = ConfigDict(from_attributes=True)
+    loader_options: ClassVar[dict[str, _AbstractLoad]] = {
+        "tickets": selectinload(User.tickets).options(
+            *TicketRead.loader_options.values()
+        ),
+        "comments": selectinload(User.comments).options(
+            *CommentRead.loader_options.values()
+        ),
+        "projects": selectinload(User.projects).options(
+            *ProjectRead.loader_options.values()
+        ),
+    }
 
 
 class UserUpdate(BaseModel):
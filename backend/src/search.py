@@ -0,0 +1,267 @@
+"""Full-text search over ticket titles and descriptions and comment contents.
+
+The documents live in a search index table of their own, written by the
+ticket and comment routes in the transaction of the change (see
+:meth:`SearchBackend.index` and :meth:`SearchBackend.remove`). Each document
+is keyed by ``id * len(KINDS) + kind``, so that both kinds share the index
+and a document is found, or replaced, by primary key.
+
+Attributes:
+    KINDS (dict[Kind, Source]): The searchable models, by kind.
+    SEARCH (SearchBackend): The backend matching the dialect of the database:
+                            an FTS5 virtual table on SQLite, a tsvector
+                            column with a GIN index on PostgreSQL.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Collection, Literal
+
+from sqlalchemy import (
+    DDL,
+    ColumnElement,
+    Select,
+    column,
+    delete,
+    event,
+    func,
+    insert,
+    literal_column,
+    make_url,
+    null,
+    select,
+    table,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from src.backend.config import SQLALCHEMY_DATABASE_URL
+from src.exceptions import InvalidSearchQueryException
+from src.models import Base, Comment, Ticket
+
+
+@dataclass(frozen=True)
+class Source:
+    """A searchable model, and the columns indexed as title and body."""
+
+    code: int
+    model: type[Any]
+    title: InstrumentedAttribute | None
+    body: InstrumentedAttribute
+
+
+Kind = Literal["ticket", "comment"]
+
+KINDS: dict[Kind, Source] = {
+    "ticket": Source(0, Ticket, Ticket.title, Ticket.description),
+    "comment": Source(1, Comment, None, Comment.content),
+}
+_SOURCES = {source.model: source for source in KINDS.values()}
+
+
+def document_keys(model: type[Any], ids: Collection[int] | Select) -> Any:
+    """Return the keys, in the index, of the documents of `model` with `ids`.
+
+    `ids` may also be a select of ids, such as the comments of a ticket.
+    """
+    source = _SOURCES[model]
+    if isinstance(ids, Select):
+        return select(ids.subquery().c[0] * len(KINDS) + source.code)
+    return [id * len(KINDS) + source.code for id in ids]
+
+
+def decode_key(key: int) -> tuple[Kind, int]:
+    """Return the kind and id of the document with key `key`."""
+    id, code = divmod(key, len(KINDS))
+    return next(kind for kind, source in KINDS.items() if source.code == code), id
+
+
+class SearchBackend(ABC):
+    """Search index stored in the application database.
+
+    Subclasses declare the index, `table` (a ``rowid`` key, a ``title`` and a
+    ``body``), and the DDL creating and dropping it with the rest of the
+    schema, and translate a search into a select.
+    """
+
+    dialect: str
+    table: Any
+    create_ddl: tuple[str, ...]
+    drop_ddl: tuple[str, ...]
+
+    def register(self) -> None:
+        """Create and drop the index with the tables of the models."""
+        for statement in self.create_ddl:
+            event.listen(
+                Base.metadata,
+                "after_create",
+                DDL(statement).execute_if(dialect=self.dialect),
+            )
+        for statement in self.drop_ddl:
+            event.listen(
+                Base.metadata,
+                "after_drop",
+                DDL(statement).execute_if(dialect=self.dialect),
+            )
+
+    async def remove(
+        self, db: AsyncSession, model: type[Any], ids: Collection[int] | Select
+    ) -> None:
+        """Remove the documents of `model` with `ids` from the index.
+
+        Call it before deleting the rows when `ids` is a select of them.
+        """
+        await db.execute(
+            delete(self.table).where(self.table.c.rowid.in_(document_keys(model, ids)))
+        )
+
+    async def remove_tickets(self, db: AsyncSession, tickets: Select) -> None:
+        """Remove the tickets selected by `tickets`, and their comments.
+
+        For the routes deleting a ticket, or a project or user along with
+        their tickets, before the rows are deleted.
+        """
+        await self.remove(
+            db, Comment, select(Comment.id).filter(Comment.ticket_id.in_(tickets))
+        )
+        await self.remove(db, Ticket, tickets)
+
+    async def index(
+        self, db: AsyncSession, model: type[Any], ids: Collection[int] | Select
+    ) -> None:
+        """(Re)index the documents of `model` with `ids` from their rows.
+
+        The rows are copied by an ``INSERT ... SELECT``: pending changes must
+        have been flushed.
+        """
+        source = _SOURCES[model]
+        await self.remove(db, model, ids)
+        await db.execute(
+            insert(self.table).from_select(
+                ["rowid", "title", "body"],
+                select(
+                    model.id * len(KINDS) + source.code,
+                    source.title if source.title is not None else null(),
+                    source.body,
+                ).filter(model.id.in_(ids)),
+            )
+        )
+
+    @abstractmethod
+    def search(self, text: str, kind: Kind | None = None) -> Select:
+        """Return the select of the documents matching `text`, best first.
+
+        Its columns are ``rowid``, ``score`` (the higher the better),
+        ``title`` and ``snippet``, an extract of the body with the matched
+        terms wrapped in ``<mark>`` tags.
+
+        Raises
+        ------
+        InvalidSearchQueryException
+            If `text` contains no word to search for.
+        """
+
+    def _filter_kind(self, query: Select, kind: Kind | None) -> Select:
+        if kind is None:
+            return query
+        return query.filter(self.table.c.rowid % len(KINDS) == KINDS[kind].code)
+
+
+def search_terms(text: str) -> list[str]:
+    """Split a search in words, ignoring any punctuation or operator."""
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        raise InvalidSearchQueryException(f"No word to search for in: {text!r}")
+    return terms
+
+
+class SQLiteSearch(SearchBackend):
+    """FTS5 virtual table, ranked by bm25 with titles weighing ten times more.
+
+    The document key is the FTS5 ``rowid``, so replacing a document is a
+    lookup by primary key.
+    """
+
+    dialect = "sqlite"
+    table = table("search_index", column("rowid"), column("title"), column("body"))
+    create_ddl = (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+        "title, body, tokenize = 'porter unicode61 remove_diacritics 2')",
+    )
+    drop_ddl = ("DROP TABLE IF EXISTS search_index",)
+
+    def match(self, text: str) -> str:
+        """Translate a search into an FTS5 query: all the words, the last one
+        as a prefix, so that results show up while the user is typing."""
+        terms = [f'"{term}"' for term in search_terms(text)]
+        terms[-1] += "*"
+        return " ".join(terms)
+
+    def search(self, text: str, kind: Kind | None = None) -> Select:
+        fts: ColumnElement = literal_column("search_index")
+        score: ColumnElement = -func.bm25(fts, 10.0, 1.0)
+        query = (
+            select(
+                self.table.c.rowid,
+                score.label("score"),
+                self.table.c.title,
+                func.snippet(fts, 1, "<mark>", "</mark>", "…", 16).label("snippet"),
+            )
+            .select_from(self.table)
+            .filter(fts.op("MATCH")(self.match(text)))
+            .order_by(score.desc())
+        )
+        return self._filter_kind(query, kind)
+
+
+class PostgreSQLSearch(SearchBackend):
+    """Table with a generated, weighted tsvector column and a GIN index."""
+
+    dialect = "postgresql"
+    table = table(
+        "search_index",
+        column("rowid"),
+        column("title"),
+        column("body"),
+        column("document"),
+    )
+    create_ddl = (
+        "CREATE TABLE IF NOT EXISTS search_index ("
+        "rowid BIGINT PRIMARY KEY, title TEXT, body TEXT NOT NULL, "
+        "document TSVECTOR GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', body), 'B')) STORED)",
+        "CREATE INDEX IF NOT EXISTS ix_search_index_document "
+        "ON search_index USING gin (document)",
+    )
+    drop_ddl = ("DROP TABLE IF EXISTS search_index",)
+
+    def search(self, text: str, kind: Kind | None = None) -> Select:
+        query_text = " & ".join(f"{term}:*" for term in search_terms(text))
+        tsquery = func.to_tsquery("english", query_text)
+        score = func.ts_rank_cd(self.table.c.document, tsquery)
+        query = (
+            select(
+                self.table.c.rowid,
+                score.label("score"),
+                self.table.c.title,
+                func.ts_headline(
+                    "english",
+                    self.table.c.body,
+                    tsquery,
+                    "StartSel=<mark>, StopSel=</mark>, MaxWords=16, MinWords=8",
+                ).label("snippet"),
+            )
+            .filter(self.table.c.document.op("@@")(tsquery))
+            .order_by(score.desc())
+        )
+        return self._filter_kind(query, kind)
+
+
+_BACKENDS = {"sqlite": SQLiteSearch, "postgresql": PostgreSQLSearch}
+
+SEARCH: SearchBackend = _BACKENDS[
+    make_url(SQLALCHEMY_DATABASE_URL).get_backend_name()
+]()
+SEARCH.register()
@@ -1,22 +1,48 @@
+import asyncio
+
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from fastapi.testclient import TestClient
 
 
 from main import app
+from src.cache import LOOKUPS, PRINCIPALS, RESPONSES
 from src.models import Base
-from src.backend.config import ENGINE, SESSION_LOCAL
+from src.backend.config import ASYNC_ENGINE, ENGINE, SESSION_LOCAL
+
+
+@pytest.fixture(scope="session", autouse=True)
+def dispose_engine():
+    yield
+    asyncio.run(ASYNC_ENGINE.dispose())
 
 
 @pytest.fixture(name="db", scope="function")
 def db_session():
     Base.metadata.create_all(ENGINE)
+    LOOKUPS.clear()
+    PRINCIPALS.clear()
+    asyncio.run(RESPONSES.clear())
     session = SESSION_LOCAL()
     yield session
     session.close()
     Base.metadata.drop_all(ENGINE)
 
 
+@pytest.fixture(name="queries", scope="function")
+def query_recorder():
+    """Record the SQL statements the application sends to the database."""
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(ASYNC_ENGINE.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(ASYNC_ENGINE.sync_engine, "before_cursor_execute", record)
+
+
 @pytest.fixture(name="app", scope="module")
 def test_app():
     client = TestClient(app)
@@ -23,6 +23,14 @@ class TestCreateCategory:
         assert category is not None
         assert category.label == data["label"]
 
+    def test_201_created_single_statement(
+        self, app: TestClient, db: Session, queries: list
+    ):
+        app.post("/categories/", json={"label": "Test Category"})
+
+        assert len(queries) == 1
+        assert queries[0].startswith("INSERT INTO categories")
+
 
 @pytest.mark.dependency(depends=["create-category"])
 class TestGetCategory:
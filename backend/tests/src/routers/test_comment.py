@@ -29,6 +29,18 @@ class TestCreateComment:
         assert comment.creator.id == data["creator_id"]
         assert comment.ticket.id == data["ticket_id"]
 
+    def test_201_created_not_reloaded(
+        self, app: TestClient, db: Session, comment_data: dict, queries: list
+    ) -> None:
+        queries.clear()
+        rep = app.post("/comments/", json=comment_data)
+
+        assert queries[0].startswith("INSERT INTO comments")
+        assert "RETURNING id, creation_date" in queries[0]
+        selects = [q for q in queries if q.startswith("SELECT")]
+        assert not [q for q in selects if "FROM comments" in q]
+        assert rep.json()["creation_date"] is not None
+
 
 @pytest.mark.dependency(depends=["create-comment"])
 class TestGetComment:
@@ -60,9 +72,39 @@ class TestGetAllComments:
         rep_create_1 = app.post("/comments/", json=comment_data).json()
         rep_create_2 = app.post("/comments/", json=comment_data_1).json()
 
-        rep_get = app.get("/comments/")
+        rep_get = app.get("/comments/?page=1&size=10")
         assert rep_get.status_code == status.HTTP_200_OK
-        assert rep_get.json() == [rep_create_1, rep_create_2]
+
+        rep_data = rep_get.json()
+        assert rep_data["total"] == 2
+        assert rep_data["items"] == [rep_create_1, rep_create_2]
+
+    def test_query_count_constant(
+        self, app: TestClient, db: Session, comment_data, queries: list
+    ):
+        app.post("/comments/", json=comment_data)
+
+        queries.clear()
+        app.get("/comments/?page=1&size=50")
+        expected = len(queries)
+
+        ticket = app.get(f"/tickets/{comment_data['ticket_id']}").json()
+        ticket_data = {
+            "title": "Ticket 2",
+            "description": "Description of Ticket 2",
+            "creator_id": comment_data["creator_id"],
+            "project_id": ticket["project"]["id"],
+            "status_id": ticket["status"]["id"],
+            "category_id": ticket["category"]["id"],
+            "level_id": ticket["level"]["id"],
+        }
+        for _ in range(5):
+            ticket = app.post("/tickets/", json=ticket_data).json()
+            app.post("/comments/", json=comment_data | {"ticket_id": ticket["id"]})
+
+        queries.clear()
+        app.get("/comments/?page=1&size=50")
+        assert len(queries) == expected
 
     def test_404_not_found(self, app: TestClient, db: Session):
         msg = "No comments found"
@@ -73,6 +115,31 @@ class TestGetAllComments:
         assert str(excinfo.value).split(": ")[1] == msg
 
 
+@pytest.mark.dependency(depends=["create-comment"])
+class TestGetCommentsByCursor:
+    def test_200_ok(self, app: TestClient, db: Session, comment_data):
+        reps_create = [
+            app.post("/comments/", json=comment_data).json() for _ in range(3)
+        ]
+
+        first_page = app.get("/comments/cursor?size=2").json()
+        assert first_page["items"] == reps_create[:2]
+
+        cursor = first_page["next_cursor"]
+        rep_next = app.get(f"/comments/cursor?size=2&after={cursor}")
+        assert rep_next.status_code == status.HTTP_200_OK
+        assert rep_next.json()["items"] == reps_create[2:]
+        assert rep_next.json()["next_cursor"] is None
+
+    def test_404_not_found(self, app: TestClient, db: Session):
+        msg = "No comments found"
+        with pytest.raises(NotFoundException, match=msg) as excinfo:
+            rep = app.get("/comments/cursor")
+            assert rep.status_code == status.HTTP_404_NOT_FOUND
+
+        assert str(excinfo.value).split(": ")[1] == msg
+
+
 @pytest.mark.dependency(depends=["create-comment"])
 class TestUpdateComment:
     def test_200_ok_non_empty_data(self, app: TestClient, db: Session, comment_data):
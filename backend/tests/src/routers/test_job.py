@@ -0,0 +1,231 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import status
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+from fastapi.testclient import TestClient
+
+from main import app
+from src.exceptions import NotFoundException
+from src.backend.config import ASYNC_SESSION_LOCAL
+from src.jobs import JOBS, JobRunner
+from src.models import Comment, Job, Project, Ticket, User
+from src.search import SEARCH
+
+
+@pytest.fixture(name="client", scope="function")
+def running_app(db: Session):
+    """A client whose event loop, and the jobs it runs, outlive each request."""
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(name="small_batches")
+def small_batches(monkeypatch):
+    monkeypatch.setattr(JOBS, "batch_size", 2)
+
+
+def count(db: Session, model: type) -> int:
+    return db.scalar(select(func.count()).select_from(model))
+
+
+def add_tickets(client: TestClient, ticket_data: dict, tickets: int) -> None:
+    for _ in range(tickets):
+        ticket = client.post("/tickets/", json=ticket_data).json()
+        comment = {
+            "content": "Comment",
+            "creator_id": ticket_data["creator_id"],
+            "ticket_id": ticket["id"],
+        }
+        client.post("/comments/", json=comment)
+
+
+class TestDeleteInBackground:
+    def test_202_accepted_project(
+        self, client: TestClient, db: Session, ticket_data: dict, small_batches
+    ):
+        add_tickets(client, ticket_data, 3)
+        project_id = ticket_data["project_id"]
+
+        rep = client.delete(f"/projects/{project_id}?background=true")
+
+        assert rep.status_code == status.HTTP_202_ACCEPTED
+        assert rep.headers["Location"] == f"/jobs/{rep.json()['id']}"
+        assert rep.json()["kind"] == "delete_project"
+        assert rep.json()["target_id"] == project_id
+        assert rep.json()["status"] == "pending"
+
+        client.portal.call(JOBS.wait)
+        job = client.get(rep.headers["Location"]).json()
+        assert job["status"] == "done"
+        assert job["done"] == job["total"] == 3 + 3 + 1
+        assert count(db, Project) == count(db, Ticket) == count(db, Comment) == 0
+        assert count(db, User) == 1
+        assert db.scalar(text(f"SELECT count(*) FROM {SEARCH.table.name}")) == 0
+
+    def test_202_accepted_user(
+        self, client: TestClient, db: Session, ticket_data: dict, small_batches
+    ):
+        add_tickets(client, ticket_data, 3)
+
+        rep = client.delete(f"/users/{ticket_data['creator_id']}?background=true")
+        client.portal.call(JOBS.wait)
+
+        job = client.get(rep.headers["Location"]).json()
+        assert job["status"] == "done"
+        assert job["done"] == job["total"] == 3 + 3 + 1 + 1
+        for model in (User, Project, Ticket, Comment):
+            assert count(db, model) == 0
+
+    def test_cached_responses_invalidated(
+        self, client: TestClient, db: Session, ticket_data: dict, user_data: dict
+    ):
+        add_tickets(client, ticket_data, 1)
+        user_data = {**user_data, "username": "janedoe", "email": "jane@example.com"}
+        other = client.post("/users/", json=user_data).json()
+        ticket_id = client.get("/tickets/").json()["items"][0]["id"]
+        comment = {
+            "content": "Me too",
+            "creator_id": other["id"],
+            "ticket_id": ticket_id,
+        }
+        client.post("/comments/", json=comment)
+        assert len(client.get(f"/users/{other['id']}").json()["comments"]) == 1
+
+        client.delete(f"/projects/{ticket_data['project_id']}?background=true")
+        client.portal.call(JOBS.wait)
+
+        rep = client.get(f"/users/{other['id']}")
+        assert rep.headers["X-Cache"] == "MISS"
+        assert rep.json()["comments"] == []
+
+    def test_404_not_found(self, client: TestClient, db: Session):
+        with pytest.raises(NotFoundException, match="Project with ID 1 not found"):
+            client.delete("/projects/1?background=true")
+        assert count(db, Job) == 0
+
+
+class TestJobs:
+    def test_resumed_on_startup(self, app: TestClient, db: Session, ticket_data: dict):
+        add_tickets(app, ticket_data, 2)
+        # Interrupted after counting its rows, by a restart
+        job = Job(
+            kind="delete_project",
+            target_id=ticket_data["project_id"],
+            status="running",
+            total=5,
+        )
+        db.add(job)
+        db.commit()
+
+        with TestClient(app.app) as client:
+            client.portal.call(JOBS.wait)
+            rep = client.get(f"/jobs/{job.id}").json()
+
+        assert rep["status"] == "done"
+        assert rep["done"] == 5
+        assert count(db, Ticket) == 0
+
+    def test_claimed_once(self, client: TestClient, db: Session, ticket_data: dict):
+        add_tickets(client, ticket_data, 2)
+        job = Job(kind="delete_project", target_id=ticket_data["project_id"])
+        db.add(job)
+        db.commit()
+        workers = [JobRunner(), JobRunner()]
+
+        async def resume():
+            await asyncio.gather(*(worker._claim() for worker in workers))
+            started = [list(worker._tasks) for worker in workers]
+            await asyncio.gather(*(worker.wait() for worker in workers))
+            return started
+
+        assert sorted(client.portal.call(resume)) == [[], [job.id]]
+        rep = client.get(f"/jobs/{job.id}").json()
+        assert rep["status"] == "done"
+        assert rep["done"] == rep["total"] == 5
+
+    @pytest.mark.parametrize("expired", [False, True])
+    def test_resumed_when_lease_expired(
+        self,
+        client: TestClient,
+        db: Session,
+        ticket_data: dict,
+        expired: bool,
+    ):
+        add_tickets(client, ticket_data, 1)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        lease_until = now + timedelta(seconds=-1 if expired else 60)
+        job = Job(
+            kind="delete_project",
+            target_id=ticket_data["project_id"],
+            owner="dead" if expired else "alive",
+            lease_until=lease_until,
+        )
+        db.add(job)
+        db.commit()
+        worker = JobRunner()
+
+        async def resume():
+            await worker._claim()
+            started = list(worker._tasks)
+            await worker.wait()
+            return started
+
+        assert client.portal.call(resume) == ([job.id] if expired else [])
+        assert (count(db, Project) == 0) is expired
+
+    def test_lease_lost(self, client: TestClient, db: Session, ticket_data: dict):
+        add_tickets(client, ticket_data, 1)
+        job = Job(
+            kind="delete_project",
+            target_id=ticket_data["project_id"],
+            owner="other",
+            lease_until=datetime.now(timezone.utc).replace(tzinfo=None)
+            + timedelta(seconds=60),
+        )
+        db.add(job)
+        db.commit()
+
+        client.portal.call(JOBS.run, job.id)
+
+        db.refresh(job)
+        assert (job.status, job.owner) == ("pending", "other")
+        assert count(db, Ticket) == 1
+
+    def test_released_on_stop(self, client: TestClient, db: Session, ticket_data: dict):
+        worker = JobRunner()
+
+        async def submit():
+            async with ASYNC_SESSION_LOCAL() as session:
+                job = await worker.submit(
+                    session, "delete_project", ticket_data["project_id"]
+                )
+            await worker.stop()
+            return job.id
+
+        job = db.get(Job, client.portal.call(submit))
+        assert (job.status, job.owner, job.lease_until) == ("pending", None, None)
+        assert count(db, Project) == 1
+
+    def test_failed(
+        self, client: TestClient, db: Session, ticket_data: dict, monkeypatch
+    ):
+        add_tickets(client, ticket_data, 1)
+
+        async def fail(*args):
+            raise RuntimeError("Disk full")
+
+        monkeypatch.setattr(SEARCH, "remove", fail)
+        rep = client.delete(f"/projects/{ticket_data['project_id']}?background=true")
+        client.portal.call(JOBS.wait)
+
+        job = client.get(rep.headers["Location"]).json()
+        assert job["status"] == "failed"
+        assert job["error"] == "Disk full"
+        assert count(db, Project) == 1
+
+    def test_404_not_found(self, client: TestClient, db: Session):
+        with pytest.raises(NotFoundException, match="Job with ID 1 not found"):
+            client.get("/jobs/1")
@@ -23,6 +23,14 @@ class TestCreateLevel:
         assert level is not None
         assert level.label == data["label"]
 
+    def test_201_created_single_statement(
+        self, app: TestClient, db: Session, queries: list
+    ):
+        app.post("/levels/", json={"label": "Test Level"})
+
+        assert len(queries) == 1
+        assert queries[0].startswith("INSERT INTO levels")
+
 
 @pytest.mark.dependency(depends=["create-level"])
 class TestGetLevel:
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from fastapi import status
 from sqlalchemy.orm import Session
@@ -25,6 +27,19 @@ class TestCreateProject:
         assert project.label == data["label"]
         assert project.description == data["description"]
 
+    def test_201_created_not_reloaded(
+        self, app: TestClient, db: Session, project_data: dict, queries: list
+    ):
+        queries.clear()
+        rep = app.post("/projects/", json=project_data)
+
+        # The creation date comes back with the id; only the creator is loaded
+        assert queries[0].startswith("INSERT INTO projects")
+        assert "RETURNING id, creation_date" in queries[0]
+        assert not [q for q in queries[1:] if "FROM projects" in q]
+        assert len(queries) == 2
+        assert rep.json()["creation_date"] is not None
+
 
 @pytest.mark.dependency(depends=["create-project"])
 class TestGetProject:
@@ -55,9 +70,36 @@ class TestGetProjects:
         rep_create_1 = app.post("/projects/", json=project_data).json()
         rep_create_2 = app.post("/projects/", json=project_data_1).json()
 
-        rep_get = app.get("/projects/")
+        rep_get = app.get("/projects/?page=1&size=10")
         assert rep_get.status_code == status.HTTP_200_OK
-        assert rep_get.json() == [rep_create_1, rep_create_2]
+
+        rep_data = rep_get.json()
+        assert rep_data["total"] == 2
+        assert rep_data["page"] == 1
+        assert rep_data["size"] == 10
+        assert rep_data["items"] == [rep_create_1, rep_create_2]
+
+    def test_query_count_constant(
+        self, app: TestClient, db: Session, ticket_data: dict, queries: list
+    ):
+        project_data = {
+            "label": "Project Beta",
+            "description": "Description of Project Beta",
+            "creator_id": ticket_data["creator_id"],
+        }
+        app.post("/tickets/", json=ticket_data)
+
+        queries.clear()
+        app.get("/projects/?page=1&size=50")
+        expected = len(queries)
+
+        for _ in range(5):
+            project = app.post("/projects/", json=project_data).json()
+            app.post("/tickets/", json=ticket_data | {"project_id": project["id"]})
+
+        queries.clear()
+        app.get("/projects/?page=1&size=50")
+        assert len(queries) == expected
 
     def test_404_not_found(self, app: TestClient, db: Session):
         msg = "No projects found"
@@ -68,6 +110,44 @@ class TestGetProjects:
         assert str(excinfo.value).split(": ")[1] == msg
 
 
+@pytest.mark.dependency(depends=["create-project"])
+class TestGetProjectsByCursor:
+    def test_200_ok(self, app: TestClient, db: Session, project_data: dict):
+        reps_create = [
+            app.post("/projects/", json=project_data).json() for _ in range(3)
+        ]
+
+        first_page = app.get("/projects/cursor?size=2").json()
+        assert first_page["items"] == reps_create[:2]
+
+        cursor = first_page["next_cursor"]
+        rep_next = app.get(f"/projects/cursor?size=2&after={cursor}")
+        assert rep_next.status_code == status.HTTP_200_OK
+        assert rep_next.json()["items"] == reps_create[2:]
+        assert rep_next.json()["next_cursor"] is None
+
+    def test_404_not_found(self, app: TestClient, db: Session):
+        msg = "No projects found"
+        with pytest.raises(NotFoundException, match=msg) as excinfo:
+            rep = app.get("/projects/cursor")
+            assert rep.status_code == status.HTTP_404_NOT_FOUND
+
+        assert str(excinfo.value).split(": ")[1] == msg
+
+
+@pytest.mark.dependency(depends=["create-project"])
+class TestExportProjects:
+    def test_200_ok(self, app: TestClient, db: Session, project_data: dict):
+        reps_create = [
+            app.post("/projects/", json=project_data).json() for _ in range(3)
+        ]
+
+        rep = app.get("/projects/export")
+        assert rep.status_code == status.HTTP_200_OK
+        assert rep.headers["content-type"] == "application/x-ndjson"
+        assert [json.loads(line) for line in rep.iter_lines()] == reps_create
+
+
 @pytest.mark.dependency(depends=["create-project"])
 class TestUpdateProject:
     def test_200_ok_non_empty_data(
@@ -82,6 +162,23 @@ class TestUpdateProject:
         assert rep_put.json()["label"] == new_data["label"]
         assert rep_put.json()["description"] == new_data["description"]
 
+    def test_200_ok_single_update(
+        self, app: TestClient, db: Session, ticket_data: dict, queries: list
+    ):
+        rep_ticket = app.post("/tickets/", json=ticket_data).json()
+
+        queries.clear()
+        rep_put = app.put("/projects/1", json={"label": "Project Gamma"})
+
+        assert rep_put.json()["label"] == "Project Gamma"
+        assert [ticket["id"] for ticket in rep_put.json()["tickets"]] == [
+            rep_ticket["id"]
+        ]
+        assert queries[0].startswith("UPDATE projects SET")
+        assert "RETURNING" in queries[0]
+        assert not [q for q in queries[1:] if "FROM projects" in q]
+        assert len(queries) == 3
+
     def test_200_ok_empty_data(self, app: TestClient, db: Session, project_data: dict):
         rep_post = app.post("/projects/", json=project_data).json()
         rep_get = app.put(f"/projects/{rep_post['id']}", json={})
@@ -108,6 +205,21 @@ class TestDeleteProject:
 
         assert rep_delete.status_code == status.HTTP_200_OK
 
+    def test_200_ok_cached_responses_invalidated(
+        self, app: TestClient, db: Session, comment_data: dict, user_data: dict
+    ):
+        user_data = {**user_data, "username": "janedoe", "email": "jane@example.com"}
+        other = app.post("/users/", json=user_data).json()["id"]
+        app.post("/comments/", json={**comment_data, "creator_id": other})
+        assert len(app.get(f"/users/{other}").json()["comments"]) == 1
+
+        ticket = app.get(f"/tickets/{comment_data['ticket_id']}").json()
+        app.delete(f"/projects/{ticket['project']['id']}")
+
+        rep = app.get(f"/users/{other}")
+        assert rep.headers["X-Cache"] == "MISS"
+        assert rep.json()["comments"] == []
+
     def test_404_not_found(self, app: TestClient, db: Session):
         project_id = 1
         msg = f"Project with ID {project_id} not found"
@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+import pytest
+from fastapi import Depends, FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.middlewares import DBSessionMiddleware
+from src.routers import register
+from src.routers.register import create_access_token, get_current_user
+from src.schemas import UserReadLight
+
+
+@pytest.fixture(name="client")
+def authenticated_app(monkeypatch) -> TestClient:
+    """An app with a single route, returning the authenticated user."""
+    monkeypatch.setattr(register, "SECRET_KEY", "secret")
+    me = FastAPI()
+    me.add_middleware(DBSessionMiddleware)
+
+    @me.get("/me", response_model=UserReadLight)
+    async def read_me(user: UserReadLight = Depends(get_current_user)):
+        return user
+
+    return TestClient(me)
+
+
+@pytest.fixture(name="headers")
+def bearer(app: TestClient, user_data: dict, client: TestClient) -> dict:
+    app.post("/users/", json=user_data)
+    token = create_access_token({"sub": user_data["username"]})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def select_users(queries: list) -> list:
+    return [q for q in queries if q.startswith("SELECT") and "FROM users" in q]
+
+
+class TestGetCurrentUser:
+    def test_200_ok_cached(self, client: TestClient, headers: dict, queries: list):
+        first = client.get("/me", headers=headers)
+        second = client.get("/me", headers=headers)
+
+        assert first.status_code == second.status_code == status.HTTP_200_OK
+        assert first.json() == second.json()
+        assert first.json()["username"] == "johndoe"
+        assert len(select_users(queries)) == 1
+
+    def test_200_ok_invalidated_on_update(
+        self, app: TestClient, client: TestClient, headers: dict
+    ):
+        client.get("/me", headers=headers)
+        app.put("/users/1", json={"first_name": "Jane"})
+
+        rep = client.get("/me", headers=headers)
+        assert rep.json()["first_name"] == "Jane"
+
+    def test_401_unauthorized_after_delete(
+        self, app: TestClient, client: TestClient, headers: dict
+    ):
+        client.get("/me", headers=headers)
+        app.delete("/users/1")
+
+        rep = client.get("/me", headers=headers)
+        assert rep.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_401_unauthorized_expired(
+        self, client: TestClient, headers: dict, user_data: dict
+    ):
+        token = create_access_token(
+            {"sub": user_data["username"]}, expires_delta=timedelta(seconds=-1)
+        )
+
+        rep = client.get("/me", headers={"Authorization": f"Bearer {token}"})
+        assert rep.status_code == status.HTTP_401_UNAUTHORIZED
+        assert rep.headers["WWW-Authenticate"] == "Bearer"
+
+    def test_401_unauthorized_invalid(self, client: TestClient, db: Session):
+        rep = client.get("/me", headers={"Authorization": "Bearer not-a-jwt"})
+        assert rep.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,117 @@
+import pytest
+from fastapi import status
+from sqlalchemy.orm import Session
+from fastapi.testclient import TestClient
+
+from src.exceptions import NotFoundException
+from src.search import SQLiteSearch, decode_key
+
+
+def search(app: TestClient, q: str, **params) -> list[tuple[str, int]]:
+    rep = app.get("/search/", params={"q": q, **params})
+    assert rep.status_code == status.HTTP_200_OK
+    return [(hit["kind"], hit["id"]) for hit in rep.json()["items"]]
+
+
+class TestSearch:
+    def test_200_ok(self, app: TestClient, db: Session, comment_data: dict):
+        ticket = app.get(f"/tickets/{comment_data['ticket_id']}").json()
+        app.post("/comments/", json=comment_data)
+        comment = app.post(
+            "/comments/", json=comment_data | {"content": "Ticket 1 fixed in 2.0"}
+        ).json()
+
+        rep = app.get("/search/", params={"q": "ticket"})
+
+        assert rep.status_code == status.HTTP_200_OK
+        rep_data = rep.json()
+        assert rep_data["total"] == 3
+        # The title weighs more than the body
+        assert rep_data["items"][0] == {
+            "kind": "ticket",
+            "id": ticket["id"],
+            "score": rep_data["items"][0]["score"],
+            "title": "Ticket 1",
+            "snippet": "Description of <mark>Ticket</mark> 1",
+        }
+        assert {(hit["kind"], hit["id"]) for hit in rep_data["items"][1:]} == {
+            ("comment", 1),
+            ("comment", comment["id"]),
+        }
+
+    def test_200_ok_kind_and_prefix(
+        self, app: TestClient, db: Session, comment_data: dict
+    ):
+        app.post("/comments/", json=comment_data)
+
+        assert search(app, "comm") == [("comment", 1)]
+        assert search(app, "descr", kind="ticket") == [("ticket", 1)]
+        with pytest.raises(NotFoundException):
+            app.get("/search/", params={"q": "descr", "kind": "comment"})
+
+    def test_200_ok_pagination(self, app: TestClient, db: Session, ticket_data):
+        for i in range(3):
+            app.post("/tickets/", json=ticket_data | {"title": f"Crash {i}"})
+
+        rep = app.get("/search/", params={"q": "crash", "size": 2, "page": 2})
+
+        assert rep.json()["total"] == 3
+        assert len(rep.json()["items"]) == 1
+
+    def test_index_follows_updates(
+        self, app: TestClient, db: Session, comment_data: dict
+    ):
+        comment = app.post("/comments/", json=comment_data).json()
+        ticket_id = comment_data["ticket_id"]
+
+        app.put(f"/tickets/{ticket_id}", json={"title": "Login error"})
+        app.put(f"/comments/{comment['id']}", json={"content": "Login fixed"})
+        assert search(app, "login") == [("ticket", ticket_id), ("comment", 1)]
+
+        app.delete(f"/comments/{comment['id']}")
+        assert search(app, "login") == [("ticket", ticket_id)]
+
+    def test_index_follows_deletes(
+        self, app: TestClient, db: Session, comment_data: dict
+    ):
+        app.post("/comments/", json=comment_data)
+        ticket = app.get(f"/tickets/{comment_data['ticket_id']}").json()
+
+        app.delete(f"/projects/{ticket['project']['id']}")
+
+        with pytest.raises(NotFoundException):
+            app.get("/search/", params={"q": "ticket"})
+
+    def test_index_follows_bulk(self, app: TestClient, db: Session, ticket_data):
+        rep = app.post(
+            "/tickets/bulk", json=[ticket_data | {"title": "Bulk"}] * 2
+        ).json()
+        ids = [item["id"] for item in rep["items"]]
+        assert search(app, "bulk") == [("ticket", id) for id in ids]
+
+        app.patch("/tickets/bulk", json=[{"id": ids[0], "title": "Renamed"}])
+        assert search(app, "bulk") == [("ticket", ids[1])]
+        assert search(app, "renamed") == [("ticket", ids[0])]
+
+    def test_400_no_word(self, app: TestClient, db: Session):
+        rep = app.get("/search/", params={"q": '"*-'})
+
+        assert rep.status_code == status.HTTP_400_BAD_REQUEST
+        assert rep.json()["detail"] == "No word to search for in: '\"*-'"
+
+    def test_404_not_found(self, app: TestClient, db: Session, ticket_data):
+        app.post("/tickets/", json=ticket_data)
+        msg = "No results for: nothing"
+        with pytest.raises(NotFoundException, match=msg):
+            app.get("/search/", params={"q": "nothing"})
+
+
+def test_match_quotes_every_word():
+    assert SQLiteSearch().match('login "error" OR -crash') == (
+        '"login" "error" "OR" "crash"*'
+    )
+
+
+def test_decode_key():
+    assert decode_key(6) == ("ticket", 3)
+    assert decode_key(7) == ("comment", 3)
@@ -23,6 +23,14 @@ class TestCreateStatus:
         assert status_ is not None
         assert status_.label == data["label"]
 
+    def test_201_created_single_statement(
+        self, app: TestClient, db: Session, queries: list
+    ):
+        app.post("/statuses/", json={"label": "Test Status"})
+
+        assert len(queries) == 1
+        assert queries[0].startswith("INSERT INTO statuses")
+
 
 @pytest.mark.dependency(depends=["create-status"])
 class TestGetStatus:
@@ -34,6 +42,19 @@ class TestGetStatus:
         assert rep_get.status_code == status.HTTP_200_OK
         assert rep_get.json() == rep_create
 
+    def test_304_not_modified(self, app: TestClient, db: Session, queries: list):
+        rep_create = app.post("/statuses/", json={"label": "Test Status"}).json()
+        etag = app.get(f"/statuses/{rep_create['id']}").headers["ETag"]
+
+        queries.clear()
+        rep_get = app.get(
+            f"/statuses/{rep_create['id']}", headers={"If-None-Match": etag}
+        )
+
+        assert rep_get.status_code == status.HTTP_304_NOT_MODIFIED
+        assert rep_get.headers["ETag"] == etag
+        assert queries == []
+
     def test_404_not_found(self, app: TestClient, db: Session):
         status_id = 1
         msg = f"Status with ID {status_id} not found"
@@ -56,6 +77,16 @@ class TestGetStatuses:
         assert rep_get.status_code == status.HTTP_200_OK
         assert rep_get.json() == [rep_create_1, rep_create_2]
 
+    def test_200_ok_invalidated(self, app: TestClient, db: Session):
+        rep_create = app.post("/statuses/", json={"label": "Test Status"}).json()
+        etag = app.get("/statuses/").headers["ETag"]
+        app.put(f"/statuses/{rep_create['id']}", json={"label": "New label"})
+
+        rep_get = app.get("/statuses/", headers={"If-None-Match": etag})
+        assert rep_get.status_code == status.HTTP_200_OK
+        assert rep_get.headers["ETag"] != etag
+        assert rep_get.json() == [rep_create | {"label": "New label"}]
+
     def test_404_not_found(self, app: TestClient, db: Session):
         msg = "No statuses found"
         with pytest.raises(NotFoundException, match=msg) as excinfo:
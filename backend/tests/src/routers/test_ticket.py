@@ -1,8 +1,12 @@
+import json
+
+import fastapi.routing
 import pytest
 from fastapi import status
 from sqlalchemy.orm import Session
 from fastapi.testclient import TestClient
 
+from src.backend.config import ASYNC_ENGINE
 from src.models._ticket import Ticket
 from src.exceptions import NotFoundException
 
@@ -35,6 +39,81 @@ class TestCreateTicket:
         assert ticket.category.id == data["category_id"]
         assert ticket.level.id == data["level_id"]
 
+    def test_201_created_not_reloaded(
+        self, app: TestClient, db: Session, ticket_data: dict, queries: list
+    ) -> None:
+        queries.clear()
+        rep = app.post("/tickets/", json=ticket_data)
+
+        assert queries[0].startswith("INSERT INTO tickets")
+        assert "RETURNING id, creation_date" in queries[0]
+        # The new ticket has no comments to load
+        selects = [q for q in queries if q.startswith("SELECT")]
+        assert not [q for q in selects if "FROM tickets" in q or "comments" in q]
+        assert rep.json()["comments"] == []
+
+
+@pytest.mark.dependency(depends=["create-ticket"])
+class TestCreateTicketsBulk:
+    def test_201_created(
+        self, app: TestClient, db: Session, ticket_data: dict, queries: list
+    ) -> None:
+        data = [ticket_data | {"title": f"Ticket {i}"} for i in range(100)]
+        data[10] = ticket_data | {"status_id": 999}
+
+        queries.clear()
+        rep = app.post("/tickets/bulk", json=data)
+
+        assert rep.status_code == status.HTTP_201_CREATED
+        rep_data = rep.json()
+        assert rep_data["succeeded"] == 99
+        assert rep_data["failed"] == 1
+        assert rep_data["items"][10] == {
+            "index": 10,
+            "id": None,
+            "error": "Status with ID 999 not found",
+        }
+        assert [item["id"] for item in rep_data["items"] if item["id"]] == list(
+            range(1, 100)
+        )
+        assert len([q for q in queries if q.startswith("INSERT INTO tickets")]) == 1
+
+        ticket = db.query(Ticket).filter(Ticket.id == 12).first()
+        assert ticket.title == "Ticket 12"
+        assert ticket.creation_date is not None
+
+    def test_422_empty(self, app: TestClient, db: Session) -> None:
+        rep = app.post("/tickets/bulk", json=[])
+        assert rep.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.dependency(depends=["create-ticket"])
+class TestUpdateTicketsBulk:
+    def test_200_ok(self, app: TestClient, db: Session, ticket_data: dict) -> None:
+        app.post("/tickets/bulk", json=[ticket_data] * 3)
+        closed = app.post("/statuses/", json={"label": "Closed"}).json()
+
+        data = [
+            {"id": 1, "status_id": closed["id"]},
+            {"id": 2, "status_id": closed["id"], "title": "Closed ticket"},
+            {"id": 3, "level_id": 999},
+            {"id": 4, "status_id": closed["id"]},
+        ]
+        rep = app.patch("/tickets/bulk", json=data)
+
+        assert rep.status_code == status.HTTP_200_OK
+        rep_data = rep.json()
+        assert rep_data["succeeded"] == 2
+        assert rep_data["failed"] == 2
+        assert rep_data["items"][2]["error"] == "Level with ID 999 not found"
+        assert rep_data["items"][3]["error"] == "Ticket with ID 4 not found"
+
+        rep_get = app.get("/tickets/2").json()
+        assert rep_get["status"] == closed
+        assert rep_get["title"] == "Closed ticket"
+        assert rep_get["update_date"] is not None
+        assert app.get("/tickets/3").json()["level"]["id"] == ticket_data["level_id"]
+
 
 @pytest.mark.dependency(depends=["create-ticket"])
 class TestGetTicket:
@@ -44,6 +123,75 @@ class TestGetTicket:
         assert rep_get.status_code == status.HTTP_200_OK
         assert rep_get.json() == rep_create
 
+    def test_200_ok_cached_response(
+        self, app: TestClient, db: Session, ticket_data: dict, queries: list
+    ) -> None:
+        rep_create = app.post("/tickets/", json=ticket_data).json()
+        assert app.get(f"/tickets/{rep_create['id']}").headers["X-Cache"] == "MISS"
+
+        queries.clear()
+        rep_get = app.get(f"/tickets/{rep_create['id']}")
+        assert rep_get.headers["X-Cache"] == "HIT"
+        assert rep_get.json() == rep_create
+        assert queries == []
+
+    def test_200_ok_cached_lookups(
+        self, app: TestClient, db: Session, ticket_data: dict, queries: list
+    ) -> None:
+        rep_create = app.post("/tickets/", json=ticket_data).json()
+
+        queries.clear()
+        app.get(f"/tickets/{rep_create['id']}?fields=id,status,level,category")
+        assert len(queries) == 1
+        assert "statuses" not in queries[0]
+
+    def test_200_ok_fields(
+        self, app: TestClient, db: Session, ticket_data: dict, queries: list
+    ) -> None:
+        rep_create = app.post("/tickets/", json=ticket_data).json()
+
+        queries.clear()
+        rep_get = app.get(f"/tickets/{rep_create['id']}?fields=id,title,status")
+        assert rep_get.status_code == status.HTTP_200_OK
+        assert rep_get.json() == {
+            "id": rep_create["id"],
+            "title": rep_create["title"],
+            "status": rep_create["status"],
+        }
+        assert "tickets.description" not in queries[0]
+
+    def test_200_ok_not_expanded(
+        self, app: TestClient, db: Session, ticket_data: dict
+    ) -> None:
+        rep_create = app.post("/tickets/", json=ticket_data).json()
+        rep_get = app.get(f"/tickets/{rep_create['id']}?expand=false")
+
+        assert rep_get.status_code == status.HTTP_200_OK
+        assert rep_get.json() == {
+            key: value
+            for key, value in rep_create.items()
+            if key not in ("creator", "project", "comments")
+        }
+
+    def test_400_unknown_field(
+        self, app: TestClient, db: Session, ticket_data: dict
+    ) -> None:
+        rep_create = app.post("/tickets/", json=ticket_data).json()
+        rep_get = app.get(f"/tickets/{rep_create['id']}?expand=false&fields=creator")
+
+        assert rep_get.status_code == status.HTTP_400_BAD_REQUEST
+        assert rep_get.json()["detail"] == "Unknown fields: creator"
+
+    @pytest.mark.parametrize("fields", ["", ",", " , "])
+    def test_400_no_fields(
+        self, app: TestClient, db: Session, ticket_data: dict, fields: str
+    ) -> None:
+        rep_create = app.post("/tickets/", json=ticket_data).json()
+        rep_get = app.get(f"/tickets/{rep_create['id']}?fields={fields}")
+
+        assert rep_get.status_code == status.HTTP_400_BAD_REQUEST
+        assert rep_get.json()["detail"] == "No fields requested"
+
     def test_404_not_found(self, app: TestClient, db: Session):
         ticket_id = 1
         msg = f"Ticket with ID {ticket_id} not found"
@@ -69,9 +217,117 @@ class TestGetTickets:
         rep_create_1 = app.post("/tickets/", json=ticket_data).json()
         rep_create_2 = app.post("/tickets/", json=ticket_data_1).json()
 
-        rep_get = app.get("/tickets/")
+        rep_get = app.get("/tickets/?page=1&size=10")
+        assert rep_get.status_code == status.HTTP_200_OK
+
+        rep_data = rep_get.json()
+        assert rep_data["total"] == 2
+        assert rep_data["page"] == 1
+        assert rep_data["size"] == 10
+        assert rep_data["items"] == [rep_create_1, rep_create_2]
+
+    def test_200_ok_filters(
+        self, app: TestClient, db: Session, ticket_data: dict, queries: list
+    ) -> None:
+        closed = app.post("/statuses/", json={"label": "Closed"}).json()
+        data = [ticket_data | {"title": f"Ticket {i}"} for i in range(4)]
+        data[1]["status_id"] = data[3]["status_id"] = closed["id"]
+        app.post("/tickets/bulk", json=data)
+
+        queries.clear()
+        rep_get = app.get(
+            f"/tickets/?project_id={ticket_data['project_id']}"
+            f"&status_id={closed['id']}&created_from=2000-01-01"
+        )
+        assert rep_get.status_code == status.HTTP_200_OK
+
+        rep_data = rep_get.json()
+        assert rep_data["total"] == 2
+        assert [item["title"] for item in rep_data["items"]] == ["Ticket 1", "Ticket 3"]
+        where = "WHERE tickets.project_id = ? AND tickets.status_id = ?"
+        assert any(where in query for query in queries)
+
+    def test_200_ok_sort(self, app: TestClient, db: Session, ticket_data: dict) -> None:
+        titles = ["B", "C", "A"]
+        app.post("/tickets/bulk", json=[ticket_data | {"title": t} for t in titles])
+
+        rep_get = app.get("/tickets/?sort=title")
+        assert [item["title"] for item in rep_get.json()["items"]] == ["A", "B", "C"]
+
+        rep_get = app.get("/tickets/?sort=-creation_date")
+        assert [item["id"] for item in rep_get.json()["items"]] == [3, 2, 1]
+
+    @pytest.mark.parametrize("sort", ["", ","])
+    def test_200_ok_sort_empty(
+        self, app: TestClient, db: Session, ticket_data: dict, sort: str
+    ) -> None:
+        titles = ["B", "C", "A"]
+        app.post("/tickets/bulk", json=[ticket_data | {"title": t} for t in titles])
+
+        rep_get = app.get(f"/tickets/?sort={sort}")
+        assert rep_get.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in rep_get.json()["items"]] == [1, 2, 3]
+
+    def test_400_unknown_sort_field(
+        self, app: TestClient, db: Session, ticket_data: dict
+    ) -> None:
+        app.post("/tickets/", json=ticket_data)
+        rep_get = app.get("/tickets/?sort=-description")
+
+        assert rep_get.status_code == status.HTTP_400_BAD_REQUEST
+        assert rep_get.json()["detail"] == "Unknown sort fields: -description"
+
+    def test_404_no_match(
+        self, app: TestClient, db: Session, ticket_data: dict
+    ) -> None:
+        app.post("/tickets/", json=ticket_data)
+        with pytest.raises(NotFoundException, match="No tickets found"):
+            app.get("/tickets/?created_to=2000-01-01")
+
+    def test_200_ok_validated_once(
+        self, app: TestClient, db: Session, ticket_data: dict, monkeypatch
+    ) -> None:
+        rep_create = app.post("/tickets/", json=ticket_data).json()
+
+        # The page is returned as a ModelResponse, without FastAPI validating
+        # and serializing it again against the response model
+        calls = []
+        serialize_response = fastapi.routing.serialize_response
+
+        async def spy(*args, **kwargs):
+            calls.append(kwargs)
+            return await serialize_response(*args, **kwargs)
+
+        monkeypatch.setattr(fastapi.routing, "serialize_response", spy)
+        rep_get = app.get("/tickets/?page=1&size=10")
+
         assert rep_get.status_code == status.HTTP_200_OK
-        assert rep_get.json() == [rep_create_1, rep_create_2]
+        assert rep_get.headers["content-type"] == "application/json"
+        assert rep_get.json()["items"] == [rep_create]
+        assert calls == []
+
+    def test_query_count_constant(
+        self, app: TestClient, db: Session, ticket_data: dict, queries: list
+    ) -> None:
+        ticket = app.post("/tickets/", json=ticket_data).json()
+        comment_data = {
+            "content": "Comment",
+            "creator_id": ticket_data["creator_id"],
+            "ticket_id": ticket["id"],
+        }
+        app.post("/comments/", json=comment_data)
+
+        queries.clear()
+        app.get("/tickets/?page=1&size=50")
+        expected = len(queries)
+
+        for _ in range(5):
+            ticket = app.post("/tickets/", json=ticket_data).json()
+            app.post("/comments/", json=comment_data | {"ticket_id": ticket["id"]})
+
+        queries.clear()
+        app.get("/tickets/?page=1&size=50")
+        assert len(queries) == expected
 
     def test_404_not_found(self, app: TestClient, db: Session) -> None:
         msg = "No tickets found"
@@ -82,6 +338,60 @@ class TestGetTickets:
         assert str(excinfo.value).split(": ")[1] == msg
 
 
+@pytest.mark.dependency(depends=["create-ticket"])
+class TestGetTicketsByCursor:
+    def test_200_ok(self, app: TestClient, db: Session, ticket_data: dict) -> None:
+        reps_create = [app.post("/tickets/", json=ticket_data).json() for _ in range(3)]
+
+        rep_first = app.get("/tickets/cursor?size=2")
+        assert rep_first.status_code == status.HTTP_200_OK
+
+        first_page = rep_first.json()
+        assert first_page["items"] == reps_create[:2]
+        assert first_page["previous_cursor"] is None
+
+        cursor = first_page["next_cursor"]
+        last_page = app.get(f"/tickets/cursor?size=2&after={cursor}").json()
+        assert last_page["items"] == reps_create[2:]
+        assert last_page["next_cursor"] is None
+
+        cursor = last_page["previous_cursor"]
+        previous_page = app.get(f"/tickets/cursor?size=2&before={cursor}").json()
+        assert previous_page["items"] == reps_create[:2]
+        assert previous_page["previous_cursor"] is None
+
+    def test_400_invalid_cursor(self, app: TestClient, db: Session) -> None:
+        rep = app.get("/tickets/cursor?after=abc")
+
+        assert rep.status_code == status.HTTP_400_BAD_REQUEST
+        assert rep.json()["detail"] == "Invalid pagination cursor: abc"
+
+    def test_404_not_found(self, app: TestClient, db: Session) -> None:
+        msg = "No tickets found"
+        with pytest.raises(NotFoundException, match=msg) as excinfo:
+            rep = app.get("/tickets/cursor")
+            assert rep.status_code == status.HTTP_404_NOT_FOUND
+
+        assert str(excinfo.value).split(": ")[1] == msg
+
+
+@pytest.mark.dependency(depends=["create-ticket"])
+class TestExportTickets:
+    def test_200_ok(self, app: TestClient, db: Session, ticket_data: dict) -> None:
+        reps_create = [app.post("/tickets/", json=ticket_data).json() for _ in range(3)]
+
+        rep = app.get("/tickets/export")
+        assert rep.status_code == status.HTTP_200_OK
+        assert rep.headers["content-type"] == "application/x-ndjson"
+        assert [json.loads(line) for line in rep.iter_lines()] == reps_create
+
+    def test_200_ok_empty(self, app: TestClient, db: Session) -> None:
+        rep = app.get("/tickets/export")
+
+        assert rep.status_code == status.HTTP_200_OK
+        assert rep.text == ""
+
+
 @pytest.mark.dependency(depends=["create-ticket"])
 class TestUpdateTicket:
     def test_200_ok_non_empty_data(
@@ -96,6 +406,55 @@ class TestUpdateTicket:
         assert rep_put.json()["title"] == new_data["title"]
         assert rep_put.json()["description"] == new_data["description"]
 
+    def test_200_ok_invalidates_cache(
+        self, app: TestClient, db: Session, ticket_data: dict
+    ) -> None:
+        rep_post = app.post("/tickets/", json=ticket_data).json()
+        app.get(f"/tickets/{rep_post['id']}")
+        app.get(f"/projects/{ticket_data['project_id']}")
+
+        app.put(f"/tickets/{rep_post['id']}", json={"title": "Updated Ticket"})
+        app.put(f"/statuses/{ticket_data['status_id']}", json={"label": "Closed"})
+
+        rep_get = app.get(f"/tickets/{rep_post['id']}")
+        assert rep_get.headers["X-Cache"] == "MISS"
+        assert rep_get.json()["title"] == "Updated Ticket"
+        assert rep_get.json()["status"]["label"] == "Closed"
+
+        rep_get = app.get(f"/projects/{ticket_data['project_id']}")
+        assert rep_get.headers["X-Cache"] == "MISS"
+        assert rep_get.json()["tickets"][0]["title"] == "Updated Ticket"
+
+    def test_200_ok_single_update(
+        self, app: TestClient, db: Session, ticket_data: dict, queries: list
+    ) -> None:
+        rep_post = app.post("/tickets/", json=ticket_data).json()
+
+        queries.clear()
+        app.put(f"/tickets/{rep_post['id']}", json={"status_id": 1})
+
+        assert queries[0].startswith("UPDATE tickets SET")
+        assert "RETURNING" in queries[0]
+        # The ticket comes from the RETURNING, only its relationships are read
+        tables = sorted(query.split("\nFROM ")[1].split()[0] for query in queries[1:])
+        assert tables == ["comments", "projects", "users"]
+
+    def test_200_ok_without_returning(
+        self, app: TestClient, db: Session, ticket_data: dict, monkeypatch
+    ) -> None:
+        monkeypatch.setattr(ASYNC_ENGINE.dialect, "update_returning", False)
+        rep_post = app.post("/tickets/", json=ticket_data).json()
+
+        rep_put = app.put(f"/tickets/{rep_post['id']}", json={"title": "Updated"})
+        assert rep_put.json() == rep_post | {
+            "title": "Updated",
+            "update_date": rep_put.json()["update_date"],
+        }
+        assert rep_put.json()["update_date"] is not None
+
+        with pytest.raises(NotFoundException):
+            app.put(f"/tickets/{rep_post['id'] + 1}", json={"title": "Updated"})
+
     def test_200_ok_empty_data(
         self, app: TestClient, db: Session, ticket_data: dict
     ) -> None:
@@ -1,9 +1,10 @@
 import pytest
 from fastapi import status
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from fastapi.testclient import TestClient
 
-from src.models import User
+from src.models import Comment, Project, Ticket, User
 from src.exceptions import NotFoundException
 
 
@@ -33,6 +34,15 @@ class TestCreateUser:
         assert user._password != data["password"]
         assert user.verify_password(data["password"])
 
+    def test_201_created_not_reloaded(
+        self, app: TestClient, db: Session, user_data: dict, queries: list
+    ):
+        app.post("/users/", json=user_data)
+
+        # The lookup tables, loaded once, then the cache
+        assert [q for q in queries if "users" in q] == [queries[0]]
+        assert queries[0].startswith("INSERT INTO users")
+
 
 @pytest.mark.dependency(depends=["create-user"])
 class TestGetUser:
@@ -42,6 +52,34 @@ class TestGetUser:
         assert rep_get.status_code == status.HTTP_200_OK
         assert rep_get.json() == rep_create
 
+    def test_query_count_constant(
+        self, app: TestClient, db: Session, comment_data: dict, queries: list
+    ):
+        user_id = comment_data["creator_id"]
+        app.post("/comments/", json=comment_data)
+
+        queries.clear()
+        app.get(f"/users/{user_id}")
+        expected = len(queries)
+
+        ticket = app.get(f"/tickets/{comment_data['ticket_id']}").json()
+        ticket_data = {
+            "title": "Ticket 2",
+            "description": "Description of Ticket 2",
+            "creator_id": user_id,
+            "project_id": ticket["project"]["id"],
+            "status_id": ticket["status"]["id"],
+            "category_id": ticket["category"]["id"],
+            "level_id": ticket["level"]["id"],
+        }
+        for _ in range(5):
+            ticket = app.post("/tickets/", json=ticket_data).json()
+            app.post("/comments/", json=comment_data | {"ticket_id": ticket["id"]})
+
+        queries.clear()
+        app.get(f"/users/{user_id}")
+        assert len(queries) == expected
+
     def test_404_not_found(self, app: TestClient, db: Session):
         user_id = 1
         msg = f"User with ID {user_id} not found"
@@ -76,6 +114,18 @@ class TestGetAllUsers:
         assert len(response_data["items"]) == 2
         assert response_data["items"] == [rep_create_1, rep_create_2]
 
+    def test_200_ok_fields(
+        self, app: TestClient, db: Session, user_data: dict, queries: list
+    ):
+        rep_create = app.post("/users/", json=user_data).json()
+
+        queries.clear()
+        response = app.get("/users/?page=1&size=10&fields=username")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["items"] == [{"username": rep_create["username"]}]
+        assert len(queries) == 2
+        assert "users.password" not in queries[1]
+
     def test_404_not_found(self, app: TestClient, db: Session):
         msg = "No users found"
         with pytest.raises(NotFoundException, match=msg) as excinfo:
@@ -85,6 +135,36 @@ class TestGetAllUsers:
         assert str(excinfo.value).split(": ")[1] == msg
 
 
+@pytest.mark.dependency(depends=["create-user"])
+class TestGetUsersByCursor:
+    def test_200_ok(self, app: TestClient, db: Session, user_data: dict):
+        reps_create = [
+            app.post(
+                "/users/",
+                json=user_data
+                | {"username": f"user{i}", "email": f"user{i}@example.com"},
+            ).json()
+            for i in range(3)
+        ]
+
+        first_page = app.get("/users/cursor?size=2").json()
+        assert first_page["items"] == reps_create[:2]
+
+        cursor = first_page["next_cursor"]
+        rep_next = app.get(f"/users/cursor?size=2&after={cursor}")
+        assert rep_next.status_code == status.HTTP_200_OK
+        assert rep_next.json()["items"] == reps_create[2:]
+        assert rep_next.json()["next_cursor"] is None
+
+    def test_404_not_found(self, app: TestClient, db: Session):
+        msg = "No users found"
+        with pytest.raises(NotFoundException, match=msg) as excinfo:
+            rep = app.get("/users/cursor")
+            assert rep.status_code == status.HTTP_404_NOT_FOUND
+
+        assert str(excinfo.value).split(": ")[1] == msg
+
+
 @pytest.mark.dependency(depends=["create-user"])
 class TestUpdateUser:
     def test_200_ok(self, app: TestClient, db: Session, user_data: dict):
@@ -96,6 +176,33 @@ class TestUpdateUser:
         assert rep_put.json()["first_name"] == new_data["first_name"]
         assert rep_put.json()["last_name"] == new_data["last_name"]
 
+    def test_200_ok_invalidates_cache(
+        self, app: TestClient, db: Session, project_data: dict
+    ):
+        rep_post = app.post("/projects/", json=project_data).json()
+        user_id = project_data["creator_id"]
+        app.get(f"/users/{user_id}")
+        app.get(f"/projects/{rep_post['id']}")
+
+        app.put(f"/users/{user_id}", json={"first_name": "Jane"})
+
+        rep_get = app.get(f"/users/{user_id}")
+        assert rep_get.headers["X-Cache"] == "MISS"
+        assert rep_get.json()["first_name"] == "Jane"
+        assert rep_get.json()["projects"][0]["id"] == rep_post["id"]
+
+        rep_get = app.get(f"/projects/{rep_post['id']}")
+        assert rep_get.headers["X-Cache"] == "MISS"
+        assert rep_get.json()["creator"]["first_name"] == "Jane"
+
+    def test_200_ok_password(self, app: TestClient, db: Session, user_data: dict):
+        rep_post = app.post("/users/", json=user_data).json()
+        app.put(f"/users/{rep_post['id']}", json={"password": "NewSecurePass1"})
+
+        user = db.get(User, rep_post["id"])
+        assert user.verify_password("NewSecurePass1")
+        assert not user.verify_password(user_data["password"])
+
     def test_200_ok_empty_data(self, app: TestClient, db: Session, user_data: dict):
         rep_post = app.post("/users/", json=user_data).json()
         rep_get = app.put(f"/users/{rep_post['id']}", json={})
@@ -122,6 +229,49 @@ class TestDeleteUser:
 
         assert rep_delete.status_code == status.HTTP_200_OK
 
+    def test_200_ok_cascades_in_database(
+        self, app: TestClient, db: Session, comment_data: dict, queries: list
+    ):
+        user_id = comment_data["creator_id"]
+        for _ in range(3):
+            app.post("/comments/", json=comment_data)
+
+        queries.clear()
+        app.delete(f"/users/{user_id}")
+
+        # The owned rows are deleted by ON DELETE CASCADE, not loaded first:
+        # only the ids of the tickets are read, to invalidate their responses
+        columns = [q.split("\nFROM")[0] for q in queries if q.startswith("SELECT")]
+        assert not [c for c in columns if "tickets." in c and "tickets.id " not in c]
+        assert [q for q in queries if q.startswith("DELETE")][-1].startswith(
+            "DELETE FROM users"
+        )
+        for model in (Project, Ticket, Comment):
+            assert db.scalar(select(func.count()).select_from(model)) == 0
+
+    def test_200_ok_cached_responses_invalidated(
+        self, app: TestClient, db: Session, ticket_data: dict, user_data: dict
+    ):
+        user_data = {**user_data, "username": "janedoe", "email": "jane@example.com"}
+        other = app.post("/users/", json=user_data).json()["id"]
+        ticket = app.post("/tickets/", json=ticket_data).json()["id"]
+        # Another user's ticket and comment, cascaded with the project
+        other_ticket = app.post(
+            "/tickets/", json={**ticket_data, "creator_id": other}
+        ).json()["id"]
+        comment = {"content": "Me too", "creator_id": other, "ticket_id": ticket}
+        app.post("/comments/", json=comment)
+        assert app.get(f"/tickets/{other_ticket}").status_code == status.HTTP_200_OK
+        assert len(app.get(f"/users/{other}").json()["comments"]) == 1
+
+        app.delete(f"/users/{ticket_data['creator_id']}")
+
+        with pytest.raises(NotFoundException):
+            app.get(f"/tickets/{other_ticket}")
+        rep = app.get(f"/users/{other}")
+        assert rep.headers["X-Cache"] == "MISS"
+        assert rep.json()["comments"] == rep.json()["tickets"] == []
+
     def test_404_not_found(self, app: TestClient, db: Session):
         user_id = 1
         msg = f"User with ID {user_id} not found"
@@ -0,0 +1,155 @@
+import asyncio
+import time
+from datetime import date
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from sqlalchemy.orm import Session
+
+from src.cache import (
+    LookupCache,
+    MemoryBackend,
+    PrincipalCache,
+    RedisBackend,
+    ResponseBackend,
+    resource_tags,
+)
+from src.models import Level, Status
+from src.schemas import CategoryRead, LevelRead, StatusRead, TicketReadLight
+from src.backend.config import ASYNC_SESSION_LOCAL
+
+
+async def get(cache: LookupCache, model: type):
+    async with ASYNC_SESSION_LOCAL() as db:
+        return await cache.get(db, model)
+
+
+class TestLookupCache:
+    def test_ttl(self, db: Session, queries: list):
+        db.add(Status(label="Open"))
+        db.commit()
+        cache = LookupCache([Status], ttl=60, maxsize=2)
+
+        table = asyncio.run(get(cache, Status))
+        assert asyncio.run(get(cache, Status)) is table
+        assert len(queries) == 1
+
+        cache.invalidate(Status)
+        assert asyncio.run(get(cache, Status)) is not table
+        assert len(queries) == 2
+
+    def test_invalidate_keeps_rows(self, db: Session):
+        db.add(Status(label="Open"))
+        db.commit()
+        cache = LookupCache([Status], ttl=60, maxsize=2)
+        asyncio.run(get(cache, Status))
+
+        cache.invalidate(Status)
+        assert cache.peek(Status, 1).label == "Open"
+
+    def test_lru_eviction(self, db: Session):
+        cache = LookupCache([Status, Level], ttl=60, maxsize=1)
+        asyncio.run(get(cache, Status))
+        asyncio.run(get(cache, Level))
+
+        assert cache.peek(Status, 1) is None
+        assert list(cache._tables) == [Level]
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request) -> ResponseBackend:
+    if request.param == "memory":
+        return MemoryBackend(maxsize=2)
+    return RedisBackend(FakeAsyncRedis())
+
+
+class TestResponseBackend:
+    def test_get_set(self, backend: ResponseBackend):
+        async def run():
+            await backend.set("/tickets/1?", b"{}", {"ticket:1"}, ttl=60)
+            return await backend.get("/tickets/1?"), await backend.get("/tickets/2?")
+
+        assert asyncio.run(run()) == (b"{}", None)
+
+    def test_invalidate(self, backend: ResponseBackend):
+        async def run():
+            await backend.set("/tickets/1?", b"1", {"ticket:1", "user:1"}, ttl=60)
+            await backend.set("/tickets/2?", b"2", {"ticket:2", "user:2"}, ttl=60)
+            await backend.invalidate(["user:1"])
+            return await backend.get("/tickets/1?"), await backend.get("/tickets/2?")
+
+        assert asyncio.run(run()) == (None, b"2")
+
+    def test_clear(self, backend: ResponseBackend):
+        async def run():
+            await backend.set("/tickets/1?", b"1", {"ticket:1"}, ttl=60)
+            await backend.clear()
+            return await backend.get("/tickets/1?")
+
+        assert asyncio.run(run()) is None
+
+
+class TestResourceTags:
+    def test_nested(self):
+        ticket = TicketReadLight(
+            id=1,
+            title="Ticket",
+            description="Description",
+            creation_date=date.today(),
+            status=StatusRead(id=2, label="Open"),
+            level=LevelRead(id=3, label="High"),
+            category=CategoryRead(id=4, label="Bug"),
+        )
+
+        assert resource_tags(ticket) == {
+            "ticket:1",
+            "status:2",
+            "level:3",
+            "category:4",
+        }
+
+
+class TestMemoryBackend:
+    def test_lru_eviction(self):
+        backend = MemoryBackend(maxsize=1)
+
+        async def run():
+            await backend.set("/tickets/1?", b"1", {"ticket:1"}, ttl=60)
+            await backend.set("/tickets/2?", b"2", {"ticket:2"}, ttl=60)
+            return await backend.get("/tickets/1?"), await backend.get("/tickets/2?")
+
+        assert asyncio.run(run()) == (None, b"2")
+        assert backend._tags == {"ticket:2": {"/tickets/2?"}}
+
+
+class TestPrincipalCache:
+    def test_expiry(self):
+        cache = PrincipalCache(ttl=60, maxsize=2)
+        cache.set("live", 1, "alice", time.time() + 60)
+        cache.set("expired", 1, "alice", time.time() - 1)
+
+        assert cache.get("live") == "alice"
+        assert cache.get("expired") is None
+        assert cache._tokens == {1: {"live"}}
+
+    def test_ttl(self):
+        cache = PrincipalCache(ttl=0, maxsize=1)
+        cache.set("a", 1, "alice", time.time() + 60)
+
+        assert cache.get("a") is None
+
+    def test_invalidate(self):
+        cache = PrincipalCache(ttl=60, maxsize=3)
+        for token, user_id in (("a1", 1), ("a2", 1), ("b1", 2)):
+            cache.set(token, user_id, user_id, time.time() + 60)
+
+        cache.invalidate(1)
+        assert (cache.get("a1"), cache.get("a2"), cache.get("b1")) == (None, None, 2)
+
+    def test_lru_eviction(self):
+        cache = PrincipalCache(ttl=60, maxsize=1)
+        cache.set("a", 1, "alice", time.time() + 60)
+        cache.set("b", 2, "bob", time.time() + 60)
+
+        assert cache.get("a") is None
+        assert cache._tokens == {2: {"b"}}
@@ -0,0 +1,33 @@
+from src.metrics import Histogram, Metrics
+
+
+def test_histogram():
+    histogram = Histogram("latency", "Latency.", ("route",), (0.1, 1.0))
+    for amount in (0.05, 0.5, 5.0):
+        histogram.observe(("/a",), amount)
+
+    assert histogram.render() == [
+        "# HELP latency Latency.",
+        "# TYPE latency histogram",
+        'latency_bucket{route="/a",le="0.1"} 1',
+        'latency_bucket{route="/a",le="1.0"} 2',
+        'latency_bucket{route="/a",le="+Inf"} 3',
+        'latency_sum{route="/a"} 5.55',
+        'latency_count{route="/a"} 3',
+    ]
+
+
+def test_slowest_statements():
+    metrics = Metrics(slowest=2)
+    metrics.observe_statement("SELECT 1", 0.1)
+    metrics.observe_statement('SELECT  "a"\nFROM t', 0.3)
+    metrics.observe_statement("SELECT 1", 0.2)
+    metrics.observe_statement("SELECT 2", 0.01)
+
+    lines = metrics.render().splitlines()
+    name = "tik_db_statement_duration_seconds"
+    assert [line for line in lines if line.startswith(f"{name}_max")] == [
+        f'{name}_max{{statement="SELECT \\"a\\" FROM t"}} 0.3',
+        f'{name}_max{{statement="SELECT 1"}} 0.2',
+    ]
+    assert f'{name}_count{{statement="SELECT 1"}} 2' in lines
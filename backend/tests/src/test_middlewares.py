@@ -0,0 +1,198 @@
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI, status
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from fastapi.testclient import TestClient
+
+from src.backend import config
+from src.backend.config import ASYNC_SESSION_LOCAL, create_db_engine, to_async_url
+from src.exceptions import NotFoundException
+from src.metrics import METRICS
+from src.middlewares import PRIMARY_COOKIE, DBSessionMiddleware
+from src.models import Base, Status, User
+from src.routers import register
+from src.routers.register import create_access_token, get_current_user
+from src.schemas import UserReadLight
+
+
+class TestDBSessionMiddleware:
+    def test_no_session_without_db_access(self, app: TestClient, mocker):
+        factory = mocker.patch(
+            "src.middlewares.ASYNC_SESSION_LOCAL", wraps=ASYNC_SESSION_LOCAL
+        )
+        rep = app.get("/")
+
+        assert rep.status_code == status.HTTP_200_OK
+        factory.assert_not_called()
+
+    def test_one_session_per_request(self, app: TestClient, db: Session, mocker):
+        factory = mocker.patch(
+            "src.middlewares.ASYNC_SESSION_LOCAL", wraps=ASYNC_SESSION_LOCAL
+        )
+        rep = app.post("/statuses/", json={"label": "Open"})
+
+        assert rep.status_code == status.HTTP_201_CREATED
+        factory.assert_called_once()
+
+
+@pytest.fixture
+def replica(tmp_path, db: Session, monkeypatch):
+    """A replica in a second SQLite file, which nothing replicates to."""
+    url = f"sqlite:///{tmp_path}/replica.db"
+    engine = create_db_engine(url)
+    Base.metadata.create_all(engine)
+    replica_engine = create_db_engine(to_async_url(url))
+    monkeypatch.setattr(config, "ASYNC_REPLICA_ENGINE", replica_engine)
+    yield engine
+    asyncio.run(replica_engine.dispose())
+    engine.dispose()
+
+
+class TestReadReplica:
+    user = {
+        "first_name": "John",
+        "last_name": "Doe",
+        "username": "johndoe",
+        "email": "johndoe@example.com",
+        "role": "user",
+        "password": "SecurePass123",
+    }
+
+    def test_reads_go_to_the_replica(self, app: TestClient, replica):
+        client = TestClient(app.app)
+        rep = client.post("/users/", json=self.user)
+        assert rep.status_code == status.HTTP_201_CREATED
+
+        # The write went to the primary only
+        client.cookies.clear()
+        with pytest.raises(NotFoundException):
+            client.get("/users/")
+
+        with replica.begin() as conn:
+            conn.execute(
+                insert(User.__table__),
+                [self.user | {"first_name": "Replica", "password": b"hash"}],
+            )
+        assert client.get("/users/").json()["items"][0]["first_name"] == "Replica"
+
+    def test_read_your_writes(self, app: TestClient, replica):
+        client = TestClient(app.app)
+        rep = client.post("/users/", json=self.user)
+
+        assert PRIMARY_COOKIE in rep.cookies
+        assert "Max-Age=5" in rep.headers["set-cookie"]
+        rep = client.get("/users/")
+        assert rep.status_code == status.HTTP_200_OK
+        assert rep.json()["items"][0]["first_name"] == "John"
+        # Reads do not extend the stickiness
+        assert "set-cookie" not in rep.headers
+
+    def test_writes_go_to_the_primary(self, app: TestClient, replica):
+        client = TestClient(app.app)
+        client.post("/users/", json=self.user)
+        client.cookies.clear()
+
+        rep = client.put("/users/1", json={"first_name": "Jane"})
+
+        assert rep.status_code == status.HTTP_200_OK
+        assert rep.json()["first_name"] == "Jane"
+
+    def test_disposed_on_shutdown(self, app: TestClient, db: Session, mocker):
+        engine = mocker.patch("main.ASYNC_REPLICA_ENGINE")
+        engine.dispose = mocker.AsyncMock()
+
+        with TestClient(app.app):
+            engine.dispose.assert_not_awaited()
+        engine.dispose.assert_awaited_once()
+
+    def test_cached_responses_are_fresh(self, app: TestClient, replica):
+        client = TestClient(app.app)
+        client.post("/users/", json=self.user)
+        # The replica lags behind: it only has the user as created
+        with replica.begin() as conn:
+            conn.execute(insert(User.__table__), [self.user | {"password": b"hash"}])
+        client.put("/users/1", json={"first_name": "Jane"})
+        client.cookies.clear()
+
+        rep = client.get("/users/1")
+        assert rep.headers["X-Cache"] == "MISS"
+        assert rep.json()["first_name"] == "Jane"
+        rep = client.get("/users/1")
+        assert rep.headers["X-Cache"] == "HIT"
+        assert rep.json()["first_name"] == "Jane"
+
+    def test_cached_principals_are_fresh(self, app: TestClient, replica, monkeypatch):
+        monkeypatch.setattr(register, "SECRET_KEY", "secret")
+        me = FastAPI()
+        me.add_middleware(DBSessionMiddleware)
+
+        @me.get("/me", response_model=UserReadLight)
+        async def read_me(user: UserReadLight = Depends(get_current_user)):
+            return user
+
+        TestClient(app.app).post("/users/", json=self.user)
+        # The replica lags behind: the user is still an admin there
+        with replica.begin() as conn:
+            conn.execute(
+                insert(User.__table__),
+                [self.user | {"role": "admin", "password": b"hash"}],
+            )
+        token = create_access_token({"sub": self.user["username"]})
+
+        rep = TestClient(me).get("/me", headers={"Authorization": f"Bearer {token}"})
+        assert rep.json()["role"] == "user"
+
+    def test_cached_lookups_are_fresh(self, app: TestClient, replica):
+        client = TestClient(app.app)
+        client.post("/statuses/", json={"label": "Open"})
+        with replica.begin() as conn:
+            conn.execute(insert(Status.__table__), [{"label": "Stale"}])
+        client.cookies.clear()
+
+        rep = client.get("/statuses/1")
+        assert rep.json()["label"] == "Open"
+
+
+class TestMetricsMiddleware:
+    def test_server_timing(self, app: TestClient, db: Session, queries: list):
+        app.post("/statuses/", json={"label": "Open"})
+
+        queries.clear()
+        rep = app.get("/statuses/?page=1")
+
+        db_timing, serialize, total = rep.headers["server-timing"].split(", ")
+        assert db_timing.startswith("db;dur=")
+        assert db_timing.endswith(f';desc="{len(queries)} queries"')
+        assert serialize.startswith("serialize;dur=")
+        assert total.startswith("total;dur=")
+
+    def test_metrics(self, app: TestClient, db: Session):
+        METRICS.clear()
+        app.post("/statuses/", json={"label": "Open"})
+        app.get("/statuses/1")
+        app.get("/statuses/1")
+
+        rep = app.get("/metrics")
+        assert rep.headers["content-type"].startswith("text/plain; version=0.0.4")
+        lines = rep.text.splitlines()
+        labels = 'method="GET",route="/statuses/{id}",status="200"'
+        assert f"tik_request_duration_seconds_count{{{labels}}} 2" in lines
+        assert (
+            'tik_request_queries_bucket{method="POST",route="/statuses/",le="+Inf"} 1'
+            in lines
+        )
+        assert any(
+            line.startswith('tik_db_statement_duration_seconds_max{statement="SELECT')
+            for line in lines
+        )
+
+    def test_metrics_unmatched_route(self, app: TestClient):
+        METRICS.clear()
+        app.get("/unknown")
+
+        labels = 'method="GET",route="unmatched",status="404"'
+        assert f"tik_request_duration_seconds_count{{{labels}}} 1" in (
+            app.get("/metrics").text.splitlines()
+        )
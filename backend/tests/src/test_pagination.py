@@ -0,0 +1,121 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from src.models import Ticket
+from src.routers.pagination import TOTALS, TotalCounter, page_range
+
+
+@pytest.mark.parametrize(
+    "page, num_pages, expected",
+    [
+        (1, 0, []),
+        (1, 1, [1]),
+        (1, 4, [1, 2, 3, 4]),
+        (1, 100, [1, 2, 3, 100]),
+        (50, 100, [1, 48, 49, 50, 51, 52, 100]),
+        (100, 100, [1, 98, 99, 100]),
+    ],
+)
+def test_page_range(page: int, num_pages: int, expected: list[int]):
+    assert page_range(page, num_pages) == expected
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError, match="Unknown totals strategy 'fast'"):
+        TotalCounter("fast", ttl=1, maxsize=1)
+
+
+@pytest.mark.parametrize("as_text", [True, False])
+def test_estimated_postgresql(as_text: bool):
+    plan = [{"Plan": {"Node Type": "Seq Scan", "Plan Rows": 42}}]
+    statements = []
+
+    async def scalar(statement):
+        statements.append(str(statement))
+        return json.dumps(plan) if as_text else plan
+
+    db = SimpleNamespace(bind=SimpleNamespace(dialect=postgresql.dialect()))
+    db.scalar = scalar
+    counter = TotalCounter("estimated", ttl=1, maxsize=1)
+
+    total = asyncio.run(counter.count(db, select(Ticket).filter(Ticket.id > 1)))
+    assert total == 42
+    assert statements[0].startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert "tickets.id > 1" in statements[0]
+
+
+def counts(queries: list) -> int:
+    return len([query for query in queries if query.startswith("SELECT count(*)")])
+
+
+@pytest.fixture
+def totals(request):
+    strategy = request.param
+    previous = TOTALS.strategy
+    TOTALS.strategy = strategy
+    TOTALS.clear()
+    yield strategy
+    TOTALS.strategy = previous
+    TOTALS.clear()
+
+
+@pytest.fixture
+def comments(app: TestClient, db: Session, comment_data: dict) -> dict:
+    for i in range(3):
+        app.post("/comments/", json=comment_data | {"content": f"Comment {i}"})
+    return comment_data
+
+
+class TestTotals:
+    @pytest.mark.parametrize("totals", ["exact"], indirect=True)
+    def test_exact(self, app: TestClient, comments: dict, queries: list, totals):
+        queries.clear()
+        for page in (1, 2, 3):
+            rep = app.get(f"/comments/?page={page}&size=1")
+            assert rep.json()["total"] == 3
+        assert counts(queries) == 3
+
+    @pytest.mark.parametrize("totals", ["cached"], indirect=True)
+    def test_cached(self, app: TestClient, comments: dict, queries: list, totals):
+        queries.clear()
+        for page in (1, 2, 3):
+            rep = app.get(f"/comments/?page={page}&size=1")
+            assert rep.json()["total"] == 3
+            assert rep.json()["pages"] == 3
+        assert counts(queries) == 1
+
+        # Until it expires, the total ignores the new rows
+        app.post("/comments/", json=comments)
+        assert app.get("/comments/?page=1&size=1").json()["total"] == 3
+        TOTALS.clear()
+        assert app.get("/comments/?page=1&size=1").json()["total"] == 4
+
+    @pytest.mark.parametrize("totals", ["estimated"], indirect=True)
+    def test_estimated(self, app: TestClient, comments: dict, queries: list, totals):
+        app.delete("/comments/2")
+
+        queries.clear()
+        rep = app.get("/comments/?page=1&size=1")
+
+        # max(id), the deleted comment included
+        assert rep.json()["total"] == 3
+        assert counts(queries) == 0
+        assert "SELECT max(comments.id)" in queries[0]
+
+    @pytest.mark.parametrize("totals", ["estimated"], indirect=True)
+    def test_estimated_filtered(
+        self, app: TestClient, comments: dict, queries: list, totals
+    ):
+        queries.clear()
+        rep = app.get("/tickets/?project_id=1")
+
+        # No estimate of a filtered list on SQLite: the count is cached
+        assert rep.json()["total"] == 1
+        assert counts(queries) == 1
@@ -0,0 +1,44 @@
+import asyncio
+import threading
+
+import bcrypt
+
+from src import passwords
+from src.backend.config import BCRYPT_ROUNDS
+from src.models import User
+
+
+class TestHashPassword:
+    def test_cost_factor(self):
+        hashed = passwords.hash_password("SecurePass123")
+
+        assert hashed.startswith(f"$2b${BCRYPT_ROUNDS:02d}$".encode())
+        assert passwords.check_password("SecurePass123", hashed)
+
+    def test_runs_in_executor(self, mocker):
+        threads = []
+
+        def hash_password(plain_password: str) -> bytes:
+            threads.append(threading.current_thread().name)
+            return bcrypt.hashpw(plain_password.encode(), bcrypt.gensalt(4))
+
+        mocker.patch("src.passwords.hash_password", hash_password)
+        asyncio.run(passwords.hash_password_async("SecurePass123"))
+
+        assert threads[0].startswith("bcrypt")
+
+
+class TestUserPassword:
+    def test_set_and_verify(self):
+        user = User(
+            first_name="John",
+            last_name="Doe",
+            username="johndoe",
+            email="johndoe@example.com",
+            role="user",
+        )
+        asyncio.run(user.set_password("SecurePass123"))
+
+        assert asyncio.run(user.verify_password_async("SecurePass123"))
+        assert not asyncio.run(user.verify_password_async("WrongPass123"))
+        assert user.verify_password("SecurePass123")
@@ -0,0 +1,94 @@
+import re
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from fastapi.testclient import TestClient
+
+from src.backend.config import ASYNC_ENGINE, ENGINE
+
+ENDPOINTS = [
+    "/tickets/",
+    "/tickets/?project_id=1&status_id=1",
+    "/tickets/?creator_id=1&sort=-creation_date",
+    "/tickets/?level_id=1&category_id=1",
+    "/tickets/?created_from=2000-01-01&sort=-creation_date",
+    "/tickets/cursor",
+    "/tickets/1",
+    "/projects/",
+    "/projects/cursor",
+    "/projects/1",
+    "/comments/",
+    "/comments/cursor",
+    "/users/",
+    "/users/cursor",
+    "/users/1",
+]
+# Counting an unfiltered list reads every row, through the smallest index:
+# PAGINATION_TOTALS=estimated reads the max(id) of the table instead.
+COUNTED_IN_FULL = {"/tickets/", "/projects/", "/comments/", "/users/"}
+
+
+@pytest.fixture(name="executed")
+def statement_recorder():
+    """Record the statements the application executes, with their parameters."""
+    statements: list[tuple[str, tuple]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(ASYNC_ENGINE.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(ASYNC_ENGINE.sync_engine, "before_cursor_execute", record)
+
+
+def full_scans(statement: str, parameters: tuple) -> list[str]:
+    """Return the steps of the SQLite query plan not searching an index.
+
+    Every step must search an index or a primary key, except the outer loop
+    of a page, bounded by its LIMIT: it may walk an index in order, or the
+    table's rowid when the statement orders by the primary key. Sorting in a
+    temporary B-tree is accepted when every table is searched.
+    """
+    with ENGINE.connect() as conn:
+        plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        steps = [row[-1] for row in plan]
+    searched = not any(step.startswith("SCAN") for step in steps)
+    paged = re.search(r"\bLIMIT\b", statement) is not None
+
+    def accepted(index: int, step: str) -> bool:
+        if step.startswith("SEARCH"):
+            # An automatic index is built from a scan of the whole table
+            return "AUTOMATIC" not in step
+        if step == "USE TEMP B-TREE FOR ORDER BY":
+            return searched
+        if not paged or index > 0:
+            return False
+        if re.fullmatch(r"SCAN \w+ USING INDEX \w+", step):
+            return True
+        match = re.fullmatch(r"SCAN (\w+)", step)
+        return bool(match and re.search(rf"ORDER BY {match[1]}\.id\b", statement))
+
+    return [step for index, step in enumerate(steps) if not accepted(index, step)]
+
+
+class TestQueryPlans:
+    @pytest.mark.parametrize("url", ENDPOINTS)
+    def test_uses_indexes(
+        self,
+        app: TestClient,
+        db: Session,
+        comment_data: dict,
+        executed: list,
+        url: str,
+    ):
+        app.post("/comments/", json=comment_data)
+
+        executed.clear()
+        rep = app.get(url)
+        assert rep.status_code == 200
+
+        for statement, parameters in executed:
+            if url in COUNTED_IN_FULL and statement.startswith("SELECT count(*)"):
+                continue
+            assert full_scans(statement, parameters) == [], statement
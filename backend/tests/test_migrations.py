@@ -0,0 +1,128 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, text
+
+from src.models import Base
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[1] / "alembic"
+
+
+def indexes(engine) -> set[str]:
+    inspector = inspect(engine)
+    return {
+        index["name"]
+        for table in ("tickets", "comments", "projects")
+        for index in inspector.get_indexes(table)
+    }
+
+
+class TestIndexesMigration:
+    def test_upgrade_downgrade(self, tmp_path: Path):
+        url = f"sqlite:///{tmp_path}/migrations.db"
+        config = Config()
+        config.set_main_option("script_location", str(ALEMBIC_DIR))
+        config.set_main_option("sqlalchemy.url", url)
+        engine = create_engine(url)
+        Base.metadata.create_all(engine)
+        expected = {
+            index.name
+            for table in ("tickets", "comments", "projects")
+            for index in Base.metadata.tables[table].indexes
+        }
+
+        command.stamp(config, "293110691a06")
+        command.upgrade(config, "head")
+        assert indexes(engine) == expected
+
+        command.downgrade(config, "293110691a06")
+        assert indexes(engine) == set()
+
+        command.upgrade(config, "head")
+        assert indexes(engine) == expected
+
+
+class TestSearchIndexMigration:
+    def test_upgrade_backfills(self, tmp_path: Path):
+        url = f"sqlite:///{tmp_path}/migrations.db"
+        config = Config()
+        config.set_main_option("script_location", str(ALEMBIC_DIR))
+        config.set_main_option("sqlalchemy.url", url)
+        engine = create_engine(url)
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE search_index"))
+            conn.execute(
+                text(
+                    "INSERT INTO tickets (id, title, description, creator_id, "
+                    "project_id, status_id, category_id, level_id, creation_date) "
+                    "VALUES (3, 'Login error', 'Crash', 1, 1, 1, 1, 1, '2026-01-01')"
+                )
+            )
+
+        command.stamp(config, "5c2e8f4a7b91")
+        command.upgrade(config, "head")
+        with engine.connect() as conn:
+            rows = conn.execute(
+                text("SELECT rowid FROM search_index WHERE search_index MATCH 'login'")
+            )
+            assert rows.scalars().all() == [6]
+
+        command.downgrade(config, "5c2e8f4a7b91")
+        assert "search_index" not in inspect(engine).get_table_names()
+
+
+def ondelete(engine) -> dict[str, str | None]:
+    return {
+        foreign_key["constrained_columns"][0]: foreign_key["options"].get("ondelete")
+        for foreign_key in inspect(engine).get_foreign_keys("tickets")
+    }
+
+
+class TestCascadeDeletesMigration:
+    def test_upgrade_downgrade(self, tmp_path: Path):
+        url = f"sqlite:///{tmp_path}/migrations.db"
+        config = Config()
+        config.set_main_option("script_location", str(ALEMBIC_DIR))
+        config.set_main_option("sqlalchemy.url", url)
+        engine = create_engine(url)
+        Base.metadata.create_all(engine)
+        expected = indexes(engine)
+
+        command.stamp(config, "head")
+        command.downgrade(config, "8d1f3b6c2e40")
+        assert ondelete(engine)["creator_id"] is None
+        assert ondelete(engine)["project_id"] is None
+
+        command.upgrade(config, "head")
+        assert ondelete(engine)["creator_id"] == "CASCADE"
+        assert ondelete(engine)["project_id"] == "CASCADE"
+        assert ondelete(engine)["status_id"] is None
+        assert indexes(engine) == expected
+
+        with engine.begin() as conn:
+            conn.execute(text("PRAGMA foreign_keys = ON"))
+            conn.execute(
+                text(
+                    "INSERT INTO users (id, first_name, last_name, username, "
+                    "email, role, password) VALUES (1, 'J', 'D', 'j', 'j@d', 'u', 'p')"
+                )
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO projects (id, label, description, creator_id, "
+                    "creation_date) VALUES (1, 'P', 'P', 1, '2026-01-01')"
+                )
+            )
+            for table in ("statuses", "categories", "levels"):
+                conn.execute(text(f"INSERT INTO {table} (id, label) VALUES (1, 'L')"))
+            conn.execute(
+                text(
+                    "INSERT INTO tickets (id, title, description, creator_id, "
+                    "project_id, status_id, category_id, level_id, creation_date) "
+                    "VALUES (1, 'T', 'T', 1, 1, 1, 1, 1, '2026-01-01')"
+                )
+            )
+            conn.execute(text("DELETE FROM projects WHERE id = 1"))
+            assert conn.execute(text("SELECT count(*) FROM tickets")).scalar() == 0